@@ -0,0 +1,46 @@
+import argparse
+import os
+import tempfile
+import timeit
+
+from tkimgloader import config_io
+
+from tests.benchmarks.layouts import generate_config
+
+
+def run_benchmark(widget_count, repeat):
+    config = generate_config(widget_count)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        json_path = os.path.join(temp_dir, 'config.json')
+        binary_path = os.path.join(temp_dir, 'config.bin')
+
+        results = {
+            'json_save': min(timeit.repeat(lambda: config_io.dump_json(json_path, config), number=1, repeat=repeat)),
+            'binary_save': min(timeit.repeat(lambda: config_io.dump_binary(binary_path, config),
+                                             number=1, repeat=repeat)),
+            'json_load': min(timeit.repeat(lambda: config_io.load_config(json_path), number=1, repeat=repeat)),
+            'binary_load': min(timeit.repeat(lambda: config_io.load_config(binary_path), number=1, repeat=repeat)),
+            'json_size': os.path.getsize(json_path),
+            'binary_size': os.path.getsize(binary_path),
+        }
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare JSON and binary config load/save')
+    parser.add_argument('--widgets', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(F'{"widgets":>8} {"format":>7} {"save ms":>9} {"load ms":>9} {"size KB":>9}')
+    for widget_count in args.widgets:
+        results = run_benchmark(widget_count, args.repeat)
+        for file_format in ('json', 'binary'):
+            print(F'{widget_count:>8} {file_format:>7} {results[file_format + "_save"] * 1000:>9.2f} '
+                  F'{results[file_format + "_load"] * 1000:>9.2f} {results[file_format + "_size"] / 1024:>9.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from tkimgloader.imgloader import ConfigDrawer
+from tkimgloader.widgets import WidgetType
+
+from tests.benchmarks.layouts import write_layout
+from tests.benchmarks.recording_canvas import RecordingCanvas, RecordingPhotoImage, recording_tk
+
+LOOKUP_ROUNDS = 10
+
+
+@contextlib.contextmanager
+def change_dir(path):
+    saved_path = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(saved_path)
+
+
+def load_drawer(config_path, *, draw):
+    canvas = RecordingCanvas() if draw else 'fake_canvas'
+    drawer = ConfigDrawer(canvas)
+    drawer.load_config_file(config_path, draw=draw, use_cache=False)
+    return drawer
+
+
+def scenario_load_no_draw(config_path):
+    return None, lambda: load_drawer(config_path, draw=False)
+
+
+def scenario_load_draw(config_path):
+    return None, lambda: load_drawer(config_path, draw=True)
+
+
+def scenario_save(config_path):
+    drawer = load_drawer(config_path, draw=False)
+    output_path = config_path + '.saved'
+    return drawer, lambda: drawer.save_config_to_file(output_path, force=True)
+
+
+def scenario_unsaved_changes(config_path):
+    drawer = load_drawer(config_path, draw=False)
+    widget_count = len(drawer.widgets)
+    return drawer, lambda: [drawer.unsaved_changes for _ in range(widget_count)]
+
+
+def scenario_get_widget_with_label(config_path):
+    drawer = load_drawer(config_path, draw=False)
+    labels = [widget.label for widget in drawer.widgets.values() if widget.label] * LOOKUP_ROUNDS
+    return drawer, lambda: [drawer.get_widget_with_label(label) for label in labels]
+
+
+def scenario_move_all(config_path):
+    drawer = load_drawer(config_path, draw=True)
+
+    def move_all():
+        for widget in drawer.widgets.values():
+            widget.move_by(move_x=1, move_y=1)
+    return drawer, move_all
+
+
+def scenario_move_all_batched(config_path):
+    drawer = load_drawer(config_path, draw=True)
+
+    def move_all():
+        with drawer.batch():
+            for widget in drawer.widgets.values():
+                widget.move_by(move_x=1, move_y=1)
+        drawer.flush_updates()
+    return drawer, move_all
+
+
+def scenario_cycle_buttons(config_path):
+    drawer = load_drawer(config_path, draw=True)
+    buttons = drawer.get_widgets_of_type(WidgetType.BUTTON)
+
+    def cycle():
+        for button in buttons:
+            for _ in range(len(button.image_path_dic)):
+                button.next_image()
+    return drawer, cycle
+
+
+SCENARIOS = {
+    'load_no_draw': scenario_load_no_draw,
+    'load_draw': scenario_load_draw,
+    'save': scenario_save,
+    'unsaved_changes': scenario_unsaved_changes,
+    'get_widget_with_label': scenario_get_widget_with_label,
+    'move_all': scenario_move_all,
+    'move_all_batched': scenario_move_all_batched,
+    'cycle_buttons': scenario_cycle_buttons,
+}
+
+
+def run_scenario(scenario, config_path, repeat):
+    best = None
+    for _ in range(repeat):
+        with recording_tk():
+            drawer, func = scenario(config_path)
+            canvas = getattr(drawer, 'canvas', None)
+            calls_before = dict(canvas.calls) if isinstance(canvas, RecordingCanvas) else {}
+            photos_before = RecordingPhotoImage.created
+
+            start = time.perf_counter()
+            result = func()
+            seconds = time.perf_counter() - start
+
+            # Loads create their drawer inside the timed call
+            if drawer is None:
+                canvas = getattr(result, 'canvas', None)
+            calls = dict(canvas.calls) if isinstance(canvas, RecordingCanvas) else {}
+            calls = {name: count - calls_before.get(name, 0) for name, count in calls.items()
+                     if count != calls_before.get(name, 0)}
+
+            if best is None or seconds < best['seconds']:
+                best = {'seconds': seconds, 'canvas_calls': calls,
+                        'photo_images': RecordingPhotoImage.created - photos_before}
+    return best
+
+
+def run_benchmarks(widget_counts, *, repeat, scenarios=None):
+    scenarios = scenarios or list(SCENARIOS)
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with change_dir(temp_dir):
+            for widget_count in widget_counts:
+                config_path = write_layout(temp_dir, widget_count)
+                results[str(widget_count)] = {name: run_scenario(SCENARIOS[name], config_path, repeat)
+                                              for name in scenarios}
+    return results
+
+
+def calc_meta():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'commit': commit, 'python': platform.python_version(), 'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+
+def print_results(results, baseline=None):
+    header = F'{"widgets":>8} {"scenario":<22} {"ms":>10} {"canvas calls":>13}'
+    if baseline:
+        header += F' {"base ms":>10} {"change":>8}'
+    print(header)
+
+    for widget_count, scenarios in results.items():
+        for name, result in scenarios.items():
+            line = (F'{widget_count:>8} {name:<22} {result["seconds"] * 1000:>10.2f} '
+                    F'{sum(result["canvas_calls"].values()):>13}')
+            base = (baseline or {}).get(widget_count, {}).get(name)
+            if base:
+                line += F' {base["seconds"] * 1000:>10.2f} {result["seconds"] / base["seconds"] - 1:>+8.0%}'
+            print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time ConfigDrawer scenarios on synthetic layouts')
+    parser.add_argument('--widgets', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--scenarios', nargs='+', choices=sorted(SCENARIOS))
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--compare', help='JSON results of an earlier run to compare against')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.widgets, repeat=args.repeat, scenarios=args.scenarios)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file_ptr:
+            baseline = json.load(file_ptr)['results']
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as file_ptr:
+            json.dump({'meta': calc_meta(), 'results': results}, file_ptr, indent=4)
+        print(F'Results written to "{args.output}"', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
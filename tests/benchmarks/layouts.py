@@ -0,0 +1,50 @@
+import os
+
+from PIL import Image
+
+from tkimgloader import config_io
+
+BACKGROUND_PATH = 'images/background.png'
+
+
+def generate_config(widget_count, *, image_count=50):
+    image_paths = [F'images/state_{index:03}.png' for index in range(image_count)]
+
+    config = {'background': BACKGROUND_PATH, 'Text': [], 'Button': [], 'Input Box': []}
+    for index in range(widget_count):
+        pos_x, pos_y = (index * 37) % 1920, (index * 53) % 1080
+        kind = index % 3
+        if kind == 0:
+            config['Text'].append({'label': F'text_{index}', 'text': F'Text {index}', 'x': pos_x, 'y': pos_y})
+        elif kind == 1:
+            images = {state: image_paths[(index + state) % image_count] for state in range(1, 4)}
+            config['Button'].append({'label': F'button_{index}', 'x': pos_x, 'y': pos_y,
+                                     'orig_image_on_release': bool(index % 2), 'current_image': 1,
+                                     'images': images})
+        else:
+            config['Input Box'].append({'label': None, 'x': pos_x, 'y': pos_y})
+
+    return config
+
+
+def write_images(base_dir, config, *, image_size=(48, 32), background_size=(1920, 1080)):
+    # Every state a different colour so nothing can be shared by accident
+    paths = {image_path for button_dic in config.get('Button', []) for image_path in button_dic['images'].values()}
+    for index, image_path in enumerate(sorted(paths)):
+        full_path = os.path.join(base_dir, image_path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        Image.new('RGBA', image_size, (index * 5 % 256, index * 11 % 256, index * 17 % 256, 255)).save(full_path)
+
+    if config.get('background'):
+        full_path = os.path.join(base_dir, config['background'])
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        Image.new('RGB', background_size, (200, 200, 200)).save(full_path)
+
+
+def write_layout(base_dir, widget_count, *, image_count=50, binary=False):
+    config = generate_config(widget_count, image_count=image_count)
+    write_images(base_dir, config)
+
+    config_path = os.path.join(base_dir, F'layout_{widget_count}.{"bin" if binary else "json"}')
+    config_io.dump_config(config_path, config, binary=binary)
+    return config_path
@@ -0,0 +1,164 @@
+import collections
+import contextlib
+import itertools
+from unittest import mock
+
+from PIL import Image, ImageTk
+
+from tkimgloader import image_cache, widgets
+
+
+class RecordingCanvas():
+    # Stands in for tk.Canvas, every method counts as one Tk round trip
+    def __init__(self, *, width=1920, height=1080):
+        self.width = width
+        self.height = height
+        self.calls = collections.Counter()
+        self.idle_jobs = []
+        self._job_ids = {}
+        self._next_job_id = 0
+        self._ids = itertools.count(1)
+
+    def _record(self, name):
+        self.calls[name] += 1
+        return next(self._ids)
+
+    def create_text(self, *args, **kwargs):
+        return self._record('create_text')
+
+    def create_image(self, *args, **kwargs):
+        return self._record('create_image')
+
+    def create_window(self, *args, **kwargs):
+        return self._record('create_window')
+
+    def coords(self, *args):
+        self._record('coords')
+
+    def itemconfig(self, *args, **kwargs):
+        self._record('itemconfig')
+
+    itemconfigure = itemconfig
+
+    def tag_bind(self, *args):
+        self._record('tag_bind')
+
+    def tag_raise(self, *args):
+        self._record('tag_raise')
+
+    def tag_lower(self, *args):
+        self._record('tag_lower')
+
+    def delete(self, *args):
+        self._record('delete')
+
+    def bbox(self, *args):
+        self._record('bbox')
+
+    def config(self, **kwargs):
+        self._record('config')
+
+    configure = config
+
+    def bind(self, *args, **kwargs):
+        self._record('bind')
+
+    def register(self, func):
+        self._record('register')
+        return F'validate_{id(func)}'
+
+    def cget(self, option):
+        return str(getattr(self, option))
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    def canvasx(self, screen_x):  # pylint: disable=no-self-use
+        return float(screen_x)
+
+    def canvasy(self, screen_y):  # pylint: disable=no-self-use
+        return float(screen_y)
+
+    def after_idle(self, func):
+        self._next_job_id += 1
+        job_id = F'after#{self._next_job_id}'
+        self._job_ids[job_id] = func
+        self.idle_jobs.append(func)
+        return job_id
+
+    def after_cancel(self, job_id):
+        func = self._job_ids.pop(job_id, None)
+        for index, job in enumerate(self.idle_jobs):
+            if job is func:
+                del self.idle_jobs[index]
+                return
+
+    def run_idle_jobs(self):
+        while self.idle_jobs:
+            jobs, self.idle_jobs = self.idle_jobs, []
+            for job in jobs:
+                job()
+
+
+class RecordingEntry():
+    def __init__(self, canvas, **kwargs):
+        self.canvas = canvas
+        self.width = kwargs.get('width')
+        canvas.calls['entry_create'] += 1
+
+    def bind(self, *args):
+        self.canvas.calls['entry_bind'] += 1
+
+    def place(self, **kwargs):
+        self.canvas.calls['entry_place'] += 1
+
+    def configure(self, **kwargs):
+        self.canvas.calls['entry_configure'] += 1
+
+    def lift(self):
+        self.canvas.calls['entry_lift'] += 1
+
+    def destroy(self):
+        self.canvas.calls['entry_destroy'] += 1
+
+    def get(self):  # pylint: disable=no-self-use
+        return ''
+
+    def winfo_reqwidth(self):
+        return (self.width or 15) * 7 + 4
+
+    def winfo_reqheight(self):  # pylint: disable=no-self-use
+        return 20
+
+
+class RecordingPhotoImage():
+    # Decodes like the real one would, but keeps the pixels out of Tk
+    created = 0
+
+    def __init__(self, image=None, *, file=None):
+        RecordingPhotoImage.created += 1
+        if file is not None:
+            with Image.open(file) as source:
+                source.load()
+                self._size = source.size
+        else:
+            self._size = image.size
+
+    def width(self):
+        return self._size[0]
+
+    def height(self):
+        return self._size[1]
+
+
+@contextlib.contextmanager
+def recording_tk():
+    # Fresh shared image cache so every run decodes from scratch
+    with mock.patch.object(ImageTk, 'PhotoImage', RecordingPhotoImage), \
+            mock.patch.object(widgets.tk, 'Entry', RecordingEntry), \
+            mock.patch.object(image_cache, '_SHARED_CACHE', image_cache.ImageCache()):
+        RecordingPhotoImage.created = 0
+        yield
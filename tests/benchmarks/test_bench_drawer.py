@@ -0,0 +1,30 @@
+import json
+
+from tests.benchmarks import bench_drawer
+
+
+def test_run_benchmarks_all_scenarios():
+    results = bench_drawer.run_benchmarks([20], repeat=1)
+
+    assert set(results['20']) == set(bench_drawer.SCENARIOS)
+    for result in results['20'].values():
+        assert result['seconds'] >= 0
+
+    load_draw = results['20']['load_draw']
+    assert load_draw['canvas_calls']['create_image'] > 0
+    assert load_draw['photo_images'] > 0
+    assert results['20']['load_no_draw']['canvas_calls'] == {}
+
+
+def test_main_writes_and_compares(tmp_path, capsys):
+    output_path = str(tmp_path / 'results.json')
+    bench_drawer.main(['--widgets', '10', '--repeat', '1', '--scenarios', 'save', '--output', output_path])
+
+    with open(output_path) as file_ptr:
+        data = json.load(file_ptr)
+    assert list(data['results']['10']) == ['save']
+    assert 'python' in data['meta']
+
+    capsys.readouterr()
+    bench_drawer.main(['--widgets', '10', '--repeat', '1', '--scenarios', 'save', '--compare', output_path])
+    assert 'base ms' in capsys.readouterr().out
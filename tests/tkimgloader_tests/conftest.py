@@ -0,0 +1,26 @@
+import pytest
+from PIL import ImageTk
+
+from tkimgloader import image_cache, widgets
+
+from tests.tkimgloader_tests.fakes import FakeEntry, FakePhotoImage
+
+
+@pytest.fixture
+def fake_photo(monkeypatch):
+    monkeypatch.setattr(ImageTk, 'PhotoImage', FakePhotoImage)
+
+
+@pytest.fixture
+def fake_cache(monkeypatch, fake_photo):  # pylint: disable=redefined-outer-name,unused-argument
+    cache = image_cache.ImageCache()
+    monkeypatch.setattr(image_cache, '_SHARED_CACHE', cache)
+    # Paths don't need to exist, the fake photo is made straight from the path
+    monkeypatch.setattr(image_cache, 'decode_image', lambda path: path)
+    return cache
+
+
+@pytest.fixture
+def fake_entry(monkeypatch):
+    monkeypatch.setattr(widgets.tk, 'Entry', FakeEntry)
+
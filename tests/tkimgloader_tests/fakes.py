@@ -0,0 +1,169 @@
+import tkinter as tk
+
+FAKE_PHOTO_SIZE = (10, 10)
+
+
+class FakePhotoImage():
+    def __init__(self, image=None, *, file=None):
+        self.image = image
+        self.file = file
+        # Whatever the photo was made from, a file path or a decoded image
+        self.source = file if file is not None else image
+        self.size = getattr(image, 'size', FAKE_PHOTO_SIZE)
+
+    def width(self):
+        return self.size[0]
+
+    def height(self):
+        return self.size[1]
+
+
+class FakeEntry():
+    def __init__(self, canvas, *, width=None, **kwargs):
+        self.canvas = canvas
+        self.width = width
+        self.destroyed = False
+
+    def bind(self, *args):
+        pass
+
+    def place(self, **kwargs):
+        pass
+
+    def configure(self, **kwargs):
+        self.width = kwargs.get('width', self.width)
+
+    def lift(self):
+        pass
+
+    def destroy(self):
+        self.destroyed = True
+
+    def get(self):  # pylint: disable=no-self-use
+        return ''
+
+    def winfo_reqwidth(self):
+        if self.destroyed:
+            raise tk.TclError('bad window path name')
+        return (self.width or 15) * 7 + 4
+
+    def winfo_reqheight(self):
+        if self.destroyed:
+            raise tk.TclError('bad window path name')
+        return 20
+
+
+class FakeCanvas():
+    def __init__(self, *, width=100, height=100):
+        self.width = width
+        self.height = height
+        self.scroll_x = 0
+        self.scroll_y = 0
+        self.items = {}
+        self.shown_images = []
+        self.raised = []
+        self.moves = []
+        self.item_tags = {}
+        self.idle_jobs = []
+        self.timer_jobs = []
+        self._job_ids = {}
+        self._next_id = 1
+        self._next_job_id = 1
+
+    def _add_item(self, pos_x, pos_y):
+        canvas_id = self._next_id
+        self._next_id += 1
+        self.items[canvas_id] = (pos_x, pos_y)
+        return canvas_id
+
+    def bind(self, *args, **kwargs):
+        pass
+
+    def register(self, func):  # pylint: disable=unused-argument
+        return 'validate_id'
+
+    def config(self, **kwargs):
+        pass
+
+    def winfo_width(self):
+        return self.width
+
+    def winfo_height(self):
+        return self.height
+
+    def canvasx(self, screen_x):
+        return float(self.scroll_x + screen_x)
+
+    def canvasy(self, screen_y):
+        return float(self.scroll_y + screen_y)
+
+    def create_text(self, pos_x, pos_y, **kwargs):
+        return self._add_item(pos_x, pos_y)
+
+    def create_image(self, pos_x, pos_y, *, image, **kwargs):
+        self.shown_images.append(getattr(image, 'source', image))
+        return self._add_item(pos_x, pos_y)
+
+    def itemconfig(self, canvas_id, *, image):
+        self.shown_images.append(getattr(image, 'source', image))
+
+    def coords(self, canvas_id, pos_x, pos_y):
+        self.items[canvas_id] = (pos_x, pos_y)
+
+    def addtag_withtag(self, tag, canvas_id):
+        self.item_tags.setdefault(canvas_id, set()).add(tag)
+
+    def dtag(self, tag_or_id, tag):
+        for canvas_id, tags in self.item_tags.items():
+            if tag_or_id in tags or tag_or_id == canvas_id:
+                tags.discard(tag)
+
+    def move(self, tag_or_id, move_x, move_y):
+        self.moves.append((tag_or_id, move_x, move_y))
+        for canvas_id, (pos_x, pos_y) in list(self.items.items()):
+            if canvas_id == tag_or_id or tag_or_id in self.item_tags.get(canvas_id, ()):
+                self.items[canvas_id] = (pos_x + move_x, pos_y + move_y)
+
+    def bbox(self, canvas_id):  # pylint: disable=unused-argument
+        return None
+
+    def tag_bind(self, *args):
+        pass
+
+    def tag_raise(self, canvas_id):
+        self.raised.append(canvas_id)
+
+    def tag_lower(self, canvas_id):
+        pass
+
+    def delete(self, canvas_id):
+        del self.items[canvas_id]
+
+    def _add_job(self, jobs, func):
+        job_id = F'after#{self._next_job_id}'
+        self._next_job_id += 1
+        self._job_ids[job_id] = func
+        jobs.append(func)
+        return job_id
+
+    def after_idle(self, func):
+        return self._add_job(self.idle_jobs, func)
+
+    def after(self, delay_ms, func):  # pylint: disable=unused-argument
+        return self._add_job(self.timer_jobs, func)
+
+    def after_cancel(self, job_id):
+        # Only the cancelled job goes, like Tk, anything else scheduled still runs
+        func = self._job_ids.pop(job_id, None)
+        for jobs in (self.idle_jobs, self.timer_jobs):
+            for index, job in enumerate(jobs):
+                if job is func:
+                    del jobs[index]
+                    return
+
+    def run_idle_jobs(self):
+        jobs = self.idle_jobs
+        self.idle_jobs = []
+        for job in jobs:
+            job()
+
@@ -0,0 +1,76 @@
+import os
+
+from PIL import Image
+
+from tkimgloader.atlas import collect_button_images, load_atlas_images, pack_config_atlas
+from tkimgloader.disk_cache import DiskImageCache
+
+COLOURS = ['red', 'green', 'blue', 'yellow', 'white']
+
+
+def write_images(dir_path, sizes):
+    path_list = []
+    for index, size in enumerate(sizes):
+        path = F'img{index}.png'
+        Image.new('RGBA', size, COLOURS[index % len(COLOURS)]).save(os.path.join(str(dir_path), path))
+        path_list.append(path)
+    return path_list
+
+
+def make_config(path_list):
+    return {'background': 'background.png', 'Button': [
+        {'label': None, 'x': 1, 'y': 1, 'orig_image_on_release': True, 'current_image': 1,
+         'images': dict(enumerate(path_list[index:index + 2], start=1))}
+        for index in range(0, len(path_list), 2)]}
+
+
+def test_collect_button_images():
+    config = make_config(['a.png', 'b.png', 'c.png'])
+    config['Button'].append(config['Button'][0])
+    assert collect_button_images(config) == ['a.png', 'b.png', 'c.png']
+
+
+def test_pack_and_load_atlas(tmp_path):
+    source_dir = tmp_path / 'source'
+    source_dir.mkdir()
+    sizes = [(40, 40), (40, 30), (40, 35), (10, 20), (8, 8)]
+    path_list = write_images(source_dir, sizes)
+
+    index_path = pack_config_atlas(make_config(path_list), str(tmp_path / 'out'), base_dir=str(source_dir),
+                                   max_size=64)
+
+    atlas_files = [name for name in os.listdir(str(tmp_path / 'out')) if name.endswith('.png')]
+    assert 1 < len(atlas_files) < len(path_list)
+
+    images = load_atlas_images(index_path)
+    assert sorted(images) == sorted(path_list)
+    for path in path_list:
+        with Image.open(os.path.join(str(source_dir), path)) as original:
+            assert images[path].size == original.size
+            assert images[path].tobytes() == original.convert('RGBA').tobytes()
+
+
+def test_load_atlas_through_disk_cache(tmp_path):
+    source_dir = tmp_path / 'source'
+    source_dir.mkdir()
+    path_list = write_images(source_dir, [(20, 20), (10, 15)])
+    index_path = pack_config_atlas(make_config(path_list), str(tmp_path / 'out'), base_dir=str(source_dir))
+
+    cache = DiskImageCache(str(tmp_path / 'cache'))
+    expected = load_atlas_images(index_path)
+    load_atlas_images(index_path, disk_cache=cache)
+    images = load_atlas_images(index_path, disk_cache=cache)
+    assert cache.stats == {'hits': 1, 'misses': 1, 'bytes': cache.total_bytes, 'max_bytes': cache.max_bytes}
+    assert {path: image.tobytes() for path, image in images.items()} == \
+        {path: image.tobytes() for path, image in expected.items()}
+
+
+def test_pack_oversized_image(tmp_path):
+    path_list = write_images(tmp_path, [(100, 30), (10, 10)])
+
+    index_path = pack_config_atlas(make_config(path_list), str(tmp_path / 'out'), base_dir=str(tmp_path),
+                                   max_size=64)
+
+    images = load_atlas_images(index_path)
+    assert images['img0.png'].size == (100, 30)
+    assert images['img1.png'].size == (10, 10)
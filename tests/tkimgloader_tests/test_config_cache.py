@@ -0,0 +1,106 @@
+import os
+
+import pytest
+
+from tkimgloader import config_cache, config_io
+from tkimgloader.config_cache import ConfigCache, validate_config
+
+SAMPLE_CONFIG = {
+    'background': 'background.png',
+    'Text': [{'label': None, 'text': 'Text', 'x': 100, 'y': 200}],
+    'Button': [{'label': 'button', 'x': 3, 'y': 4, 'orig_image_on_release': True,
+                'current_image': 1, 'images': {'1': 'path1'}}],
+}
+
+
+def write_config(dir_path, name, config=None):
+    file_path = os.path.join(str(dir_path), name)
+    config_io.dump_json(file_path, config or SAMPLE_CONFIG)
+    return file_path
+
+
+def test_repeat_load_no_parsing(tmp_path, monkeypatch):
+    file_path = write_config(tmp_path, 'config.json')
+    cache = ConfigCache()
+
+    config1 = cache.load(file_path)
+
+    def fail_load(file_path):
+        raise AssertionError('Config parsed again')
+    monkeypatch.setattr(config_cache, 'load_config', fail_load)
+
+    config2 = cache.load(file_path)
+    assert config1 is config2
+    assert cache.stats['hits'] == 1
+    assert cache.stats['misses'] == 1
+
+
+def test_cached_config_is_immutable(tmp_path):
+    config = ConfigCache().load(write_config(tmp_path, 'config.json'))
+
+    assert config['Text'][0]['text'] == 'Text'
+    with pytest.raises(TypeError):
+        config['background'] = 'other'
+    with pytest.raises(TypeError):
+        config['Text'][0]['x'] = 5
+    with pytest.raises(AttributeError):
+        config['Text'].append({})
+
+
+def test_changed_file_reloaded(tmp_path):
+    file_path = write_config(tmp_path, 'config.json')
+    cache = ConfigCache()
+
+    cache.load(file_path)
+    write_config(tmp_path, 'config.json', {'background': 'a_different_background.png'})
+
+    assert cache.load(file_path)['background'] == 'a_different_background.png'
+    assert cache.stats['misses'] == 2
+    assert len(cache) == 1
+
+
+def test_invalidate(tmp_path):
+    file_path1 = write_config(tmp_path, 'config1.json')
+    file_path2 = write_config(tmp_path, 'config2.json')
+    cache = ConfigCache()
+    cache.load(file_path1)
+    cache.load(file_path2)
+
+    cache.invalidate(file_path1)
+    assert len(cache) == 1
+    cache.load(file_path1)
+    assert cache.stats['misses'] == 3
+
+    cache.invalidate()
+    assert not cache
+    assert cache.stats['bytes'] == 0
+
+
+def test_entry_and_byte_limits(tmp_path):
+    file_paths = [write_config(tmp_path, F'config{index}.json') for index in range(3)]
+    file_size = os.path.getsize(file_paths[0])
+
+    cache = ConfigCache(max_entries=2)
+    for file_path in file_paths:
+        cache.load(file_path)
+    assert len(cache) == 2
+
+    cache = ConfigCache(max_bytes=file_size)
+    for file_path in file_paths:
+        cache.load(file_path)
+    assert len(cache) == 1
+    assert cache.stats['bytes'] == file_size
+
+
+@pytest.mark.parametrize('config', [
+    [],
+    {'background': 5},
+    {'Text': {}},
+    {'Text': [{'label': None, 'x': 1, 'y': 1}]},
+    {'Button': [{'label': None, 'x': 1, 'y': 1, 'orig_image_on_release': True, 'current_image': 1, 'images': {}}]},
+    {'Button': [{'label': None, 'x': 1, 'y': 1, 'orig_image_on_release': True, 'current_image': 2,
+                 'images': {'1': 'path'}}]},
+])
+def test_validate_config_invalid(config):
+    with pytest.raises(ValueError):
+        validate_config(config)
@@ -0,0 +1,239 @@
+import os
+import threading
+
+import pytest
+
+from tkimgloader import config_io
+from tkimgloader.imgloader import ConfigDrawer
+
+from tests.tkimgloader_tests.fakes import FakeCanvas
+
+SAMPLE_CONFIG = {
+    'background': 'background.png',
+    'Text': [
+        {'label': None, 'text': 'Unicode äöü', 'x': 100, 'y': -200},
+        {'label': 'text2', 'text': 'Text', 'x': 0, 'y': 2 ** 31 - 1},
+    ],
+    'Button': [
+        {'label': 'button', 'x': 3, 'y': 4, 'orig_image_on_release': True,
+         'current_image': 2, 'images': {1: 'path1', 2: 'path2'}},
+        {'label': None, 'x': 5, 'y': 6, 'orig_image_on_release': False,
+         'current_image': 1, 'images': {1: 'path2'}},
+    ],
+    'Input Box': [
+        {'label': 'box', 'x': 5, 'y': 6},
+        {'label': None, 'x': 7, 'y': 8, 'width': 20},
+    ],
+}
+
+
+def test_binary_round_trip():
+    data = config_io.encode_binary_config(SAMPLE_CONFIG)
+
+    assert data.startswith(config_io.BINARY_MAGIC)
+    assert config_io.decode_binary_config(data) == SAMPLE_CONFIG
+
+
+def test_binary_round_trip_empty():
+    config = {'background': None}
+    assert config_io.decode_binary_config(config_io.encode_binary_config(config)) == config
+
+
+def test_binary_interns_strings():
+    config = {'background': None, 'Button': [
+        {'label': None, 'x': 1, 'y': 1, 'orig_image_on_release': True,
+         'current_image': 1, 'images': {1: 'a/long/shared/image/path.png'}}
+        for _ in range(100)]}
+
+    data = config_io.encode_binary_config(config)
+    assert data.count(b'a/long/shared/image/path.png') == 1
+
+
+@pytest.mark.parametrize('value', [1.5, '1', True])
+def test_binary_rejects_non_int_coordinates(value):
+    config = {'background': None, 'Text': [{'label': None, 'text': 'Text', 'x': value, 'y': 1}]}
+
+    with pytest.raises(ValueError):
+        config_io.encode_binary_config(config)
+
+
+def test_decode_rejects_other_data():
+    with pytest.raises(ValueError):
+        config_io.decode_binary_config(b'{"background": null}')
+
+
+def test_load_config_detects_format(tmp_path):
+    json_path = str(tmp_path / 'config.json')
+    binary_path = str(tmp_path / 'config.bin')
+    config_io.dump_json(json_path, SAMPLE_CONFIG)
+    config_io.dump_binary(binary_path, SAMPLE_CONFIG)
+
+    assert not config_io.is_binary_config(json_path)
+    assert config_io.is_binary_config(binary_path)
+    assert not config_io.is_binary_config(str(tmp_path / 'missing'))
+
+    assert config_io.load_config(binary_path) == SAMPLE_CONFIG
+    assert config_io.load_config(json_path) == config_io.load_json(json_path)
+
+
+def test_convert_config_file_both_ways(tmp_path):
+    json_path = str(tmp_path / 'config.json')
+    binary_path = str(tmp_path / 'config.bin')
+    json_again_path = str(tmp_path / 'config_again.json')
+    config_io.dump_json(json_path, SAMPLE_CONFIG)
+
+    config_io.convert_config_file(json_path, binary_path)
+    assert config_io.is_binary_config(binary_path)
+    assert config_io.load_binary(binary_path) == SAMPLE_CONFIG
+
+    config_io.convert_config_file(binary_path, json_again_path)
+    assert not config_io.is_binary_config(json_again_path)
+    assert config_io.load_json(json_again_path) == config_io.load_json(json_path)
+
+
+def test_drawer_keeps_binary_format(tmp_path):
+    config_path = str(tmp_path / 'config.cfg')
+
+    drawer1 = ConfigDrawer('fake_canvas')
+    drawer1.load_background('path', draw=False)
+    drawer1.add_text(label='myText', text='sample_text', pos_x=100, pos_y=200, draw=False)
+    drawer1.save_config_to_file(config_path, binary=True)
+    assert config_io.is_binary_config(config_path)
+
+    drawer2 = ConfigDrawer('fake_canvas')
+    drawer2.load_config_file(config_path, draw=False)
+    assert drawer1 == drawer2
+
+    # Saving over a binary file keeps it binary
+    drawer2.add_text(text='more_text', pos_x=100, pos_y=200, draw=False)
+    drawer2.save_config_to_file(config_path)
+    assert config_io.is_binary_config(config_path)
+    assert os.path.getsize(config_path) > 0
+
+
+def test_atomic_write_failure_keeps_old_file(tmp_path, monkeypatch):
+    config_path = str(tmp_path / 'config.json')
+    config_io.dump_json(config_path, SAMPLE_CONFIG)
+
+    def failing_fsync(file_descriptor):
+        raise OSError('Disk full')
+    monkeypatch.setattr(os, 'fsync', failing_fsync)
+
+    with pytest.raises(OSError):
+        config_io.dump_json(config_path, {'background': 'other'})
+
+    assert config_io.load_json(config_path)['background'] == SAMPLE_CONFIG['background']
+    assert os.listdir(str(tmp_path)) == ['config.json']
+
+
+def test_save_skipped_without_changes(tmp_path):
+    config_path = str(tmp_path / 'config.json')
+    drawer = ConfigDrawer('fake_canvas')
+    drawer.add_text(text='sample_text', pos_x=100, pos_y=200, draw=False)
+
+    assert drawer.save_config_to_file(config_path)
+    assert not drawer.save_config_to_file(config_path)
+    assert drawer.save_config_to_file(config_path, force=True)
+    assert drawer.save_config_to_file(config_path, binary=True)
+    assert config_io.is_binary_config(config_path)
+
+    drawer.add_text(text='more_text', pos_x=100, pos_y=200, draw=False)
+    assert drawer.save_config_to_file(config_path)
+
+
+def test_background_save(tmp_path):
+    config_path = str(tmp_path / 'config.json')
+    results = []
+
+    def save_complete(*, config_path, error):
+        results.append((config_path, error, threading.current_thread()))
+
+    drawer = ConfigDrawer(FakeCanvas())
+    drawer.add_text(text='sample_text', pos_x=100, pos_y=200, draw=False)
+    drawer.save_config_to_file(config_path, background=True, complete_callback=save_complete)
+
+    assert drawer.wait_for_background_saves(timeout=5)
+    assert results == [(config_path, None, threading.main_thread())]
+    assert not drawer.unsaved_changes
+    assert config_io.load_json(config_path)['Text'][0]['text'] == 'sample_text'
+
+
+def test_background_save_completes_on_tk_thread(tmp_path):
+    config_path = str(tmp_path / 'config.json')
+    results = []
+    changes = []
+
+    canvas = FakeCanvas()
+    drawer = ConfigDrawer(canvas)
+    drawer.add_change_listener(lambda *, drawer, change: changes.append(threading.current_thread()))
+    drawer.add_text(text='sample_text', pos_x=100, pos_y=200, draw=False)
+    changes.clear()
+
+    drawer.save_config_to_file(config_path, background=True,
+                               complete_callback=lambda **kwargs: results.append(threading.current_thread()))
+    assert config_io.get_background_writer().wait(timeout=5)
+
+    # Written, but nothing is reported until the Tk thread polls
+    assert not results
+    assert drawer.unsaved_changes
+    assert drawer.config_path is None
+    assert len(canvas.timer_jobs) == 1
+
+    canvas.timer_jobs.pop()()
+    assert results == [threading.main_thread()]
+    assert set(changes) == {threading.main_thread()}
+    assert not drawer.unsaved_changes
+    assert drawer.config_path == config_path
+    assert drawer.saved_img_config == drawer.calc_config_dict()
+    assert not canvas.timer_jobs
+
+
+def test_failed_background_save_keeps_state(tmp_path, monkeypatch):
+    def mock_dump_config(file_path, config, *, binary):
+        raise OSError('disk full')
+    monkeypatch.setattr(config_io, 'dump_config', mock_dump_config)
+
+    results = []
+    drawer = ConfigDrawer(FakeCanvas())
+    drawer.add_text(text='sample_text', pos_x=100, pos_y=200, draw=False)
+    saved_img_config = drawer.saved_img_config
+
+    config_path = str(tmp_path / 'config.json')
+    drawer.save_config_to_file(config_path, background=True, complete_callback=lambda **kwargs: results.append(kwargs))
+    assert drawer.wait_for_background_saves(timeout=5)
+
+    assert results[0]['config_path'] == config_path
+    assert isinstance(results[0]['error'], OSError)
+    assert drawer.unsaved_changes
+    assert drawer.config_path is None
+    assert drawer.saved_img_config == saved_img_config
+
+
+def test_background_writer_coalesces(tmp_path, monkeypatch):
+    written = []
+    first_write_started = threading.Event()
+    release_first_write = threading.Event()
+
+    def mock_dump_config(file_path, config, *, binary):
+        first_write_started.set()
+        release_first_write.wait(timeout=5)
+        written.append((file_path, config))
+    monkeypatch.setattr(config_io, 'dump_config', mock_dump_config)
+
+    results = []
+
+    def callback(*, file_path, error):
+        results.append((file_path, error))
+
+    writer = config_io.BackgroundConfigWriter()
+    writer.submit('path1', 'config0', binary=False, callback=callback)
+    assert first_write_started.wait(timeout=5)
+
+    # Queued while the first write is still going, only the latest gets written
+    for index in range(1, 4):
+        writer.submit('path1', F'config{index}', binary=False, callback=callback)
+    release_first_write.set()
+
+    assert writer.wait(timeout=5)
+    assert written == [('path1', 'config0'), ('path1', 'config3')]
+    assert results == [('path1', None)] * 4
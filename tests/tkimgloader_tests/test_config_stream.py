@@ -0,0 +1,63 @@
+import json
+import os
+
+import pytest
+
+from tkimgloader.config_stream import iter_config_items
+
+SAMPLE_CONFIG = {
+    'background': 'back ground.png',
+    'Text': [
+        {'label': None, 'text': 'Text with , and ] and } inside', 'x': 100, 'y': -12345},
+        {'label': 'text2', 'text': 'Unicode äöü', 'x': 1.5, 'y': 0},
+    ],
+    'Empty': [],
+    'Button': [
+        {'label': 'button', 'x': 3, 'y': 4, 'orig_image_on_release': True,
+         'current_image': 1, 'images': {'1': 'path1', '2': 'path2'}},
+    ],
+    'Input Box': [{'label': None, 'x': 5, 'y': 123456789}],
+}
+
+
+def write_config(dir_path, config, **kwargs):
+    file_path = os.path.join(str(dir_path), 'config.json')
+    with open(file_path, 'w') as file_ptr:
+        json.dump(config, file_ptr, **kwargs)
+    return file_path
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 7, 64 * 1024])
+@pytest.mark.parametrize('indent', [None, 4])
+def test_iter_config_items(tmp_path, chunk_size, indent):
+    file_path = write_config(tmp_path, SAMPLE_CONFIG, indent=indent)
+
+    items = list(iter_config_items(file_path, chunk_size=chunk_size))
+
+    assert items == [
+        ('background', SAMPLE_CONFIG['background']),
+        ('Text', SAMPLE_CONFIG['Text'][0]),
+        ('Text', SAMPLE_CONFIG['Text'][1]),
+        ('Button', SAMPLE_CONFIG['Button'][0]),
+        ('Input Box', SAMPLE_CONFIG['Input Box'][0]),
+    ]
+
+
+def test_iter_config_items_empty(tmp_path):
+    file_path = write_config(tmp_path, {})
+    assert not list(iter_config_items(file_path))
+
+
+@pytest.mark.parametrize('content', [
+    '{"Text": [{"x": 1}',
+    '{"Text": [{"x": 1} {"x": 2}]}',
+    '{"background": "path" "Text": []}',
+    '["background"]',
+])
+def test_iter_config_items_invalid(tmp_path, content):
+    file_path = os.path.join(str(tmp_path), 'config.json')
+    with open(file_path, 'w') as file_ptr:
+        file_ptr.write(content)
+
+    with pytest.raises(ValueError):
+        list(iter_config_items(file_path, chunk_size=4))
@@ -0,0 +1,126 @@
+import os
+
+import pytest
+from PIL import Image
+
+from tkimgloader import disk_cache
+from tkimgloader.disk_cache import ENTRY_SUFFIX, DiskImageCache
+from tkimgloader.image_cache import ImageCache, decode_images
+
+
+def write_image(dir_path, name, *, mode='RGBA', size=(4, 3), colour='red'):
+    file_path = os.path.join(str(dir_path), name)
+    Image.new(mode, size, colour).save(file_path)
+    return file_path
+
+
+def cache_entries(cache_dir):
+    return [name for name in os.listdir(str(cache_dir)) if name.endswith(ENTRY_SUFFIX)]
+
+
+@pytest.mark.parametrize('mode', ['RGBA', 'RGB', 'L', 'P'])
+def test_load_from_disk_cache(tmp_path, mode):
+    path = write_image(tmp_path, 'img.png', mode=mode)
+    cache = DiskImageCache(str(tmp_path / 'cache'))
+
+    image1 = cache.load(path)
+    assert cache.stats['misses'] == 1
+
+    # A new cache on the same directory is served from the stored pixels
+    cache = DiskImageCache(str(tmp_path / 'cache'))
+    image2 = cache.load(path)
+    assert cache.stats['hits'] == 1
+    assert image2.size == (4, 3)
+    assert image2.mode == image1.mode
+    assert image2.tobytes() == image1.tobytes()
+
+
+def test_changed_source_invalidates(tmp_path):
+    path = write_image(tmp_path, 'img.png', colour='red')
+    cache = DiskImageCache(str(tmp_path / 'cache'))
+    cache.load(path)
+
+    write_image(tmp_path, 'img.png', colour='blue')
+    image = cache.load(path)
+
+    assert cache.stats['misses'] == 2
+    assert image.getpixel((0, 0)) == (0, 0, 255, 255)
+
+
+def test_size_limit_evicts_oldest(tmp_path):
+    path_list = [write_image(tmp_path, F'img{index}.png', colour=colour)
+                 for index, colour in enumerate(['red', 'green', 'blue'])]
+    cache = DiskImageCache(str(tmp_path / 'cache'))
+    cache.load(path_list[0])
+    entry_size = cache.stats['bytes']
+
+    cache.max_bytes = 2 * entry_size
+    for path in path_list:
+        cache.load(path)
+
+    assert len(cache_entries(tmp_path / 'cache')) == 2
+    assert cache.stats['bytes'] == 2 * entry_size
+
+
+def test_corrupt_entry_ignored(tmp_path):
+    path = write_image(tmp_path, 'img.png')
+    cache = DiskImageCache(str(tmp_path / 'cache'))
+    cache.load(path)
+
+    entry_path = os.path.join(str(tmp_path / 'cache'), cache_entries(tmp_path / 'cache')[0])
+    with open(entry_path, 'wb') as file_ptr:
+        file_ptr.write(b'garbage')
+
+    assert cache.load(path).size == (4, 3)
+    assert cache.stats['misses'] == 2
+
+
+def test_image_cache_uses_disk_cache(tmp_path, fake_photo):
+    path = write_image(tmp_path, 'img.png')
+    image_cache = ImageCache(disk_cache=DiskImageCache(str(tmp_path / 'cache')))
+
+    photo = image_cache.acquire(path)
+    assert photo.file is None
+    assert photo.image.size == (4, 3)
+    assert len(cache_entries(tmp_path / 'cache')) == 1
+
+
+def test_entry_removed_after_read_is_a_miss(tmp_path, monkeypatch):
+    path = write_image(tmp_path, 'img.png')
+    cache = DiskImageCache(str(tmp_path / 'cache'))
+    cache.load(path)
+
+    def evicted(entry_path):
+        raise FileNotFoundError(entry_path)
+
+    monkeypatch.setattr(disk_cache.os, 'utime', evicted)
+    assert cache.load(path).size == (4, 3)
+    assert cache.stats['hits'] == 0
+    assert cache.stats['misses'] == 2
+
+
+def test_content_hashes_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(disk_cache, 'MAX_HASHES', 2)
+    path_list = [write_image(tmp_path, F'img{index}.png') for index in range(3)]
+    cache = DiskImageCache(str(tmp_path / 'cache'))
+
+    for path in path_list + path_list[-1:]:
+        cache.load(path)
+    assert [identity[0] for identity in cache._hashes] == [os.path.abspath(path) for path in path_list[1:]]
+
+
+@pytest.mark.parametrize('use_processes', [False, True])
+def test_decode_images_uses_disk_cache(tmp_path, use_processes):
+    path_list = [write_image(tmp_path, F'img{index}.png', colour=colour)
+                 for index, colour in enumerate(['red', 'green', 'blue'])]
+    cache = DiskImageCache(str(tmp_path / 'cache'))
+
+    decoded = decode_images(path_list, workers=2, use_processes=use_processes, disk_cache=cache)
+    assert sorted(decoded) == sorted(path_list)
+    assert len(cache_entries(tmp_path / 'cache')) == 3
+
+    decoded = decode_images(path_list, workers=2, disk_cache=cache)
+    assert cache.stats['hits'] == 3
+    for path in path_list:
+        with Image.open(path) as original:
+            assert decoded[path].tobytes() == original.tobytes()
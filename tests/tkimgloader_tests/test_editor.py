@@ -2,6 +2,8 @@ import os
 
 from tkinter import filedialog
 
+import pytest
+
 import tkimgloader.scripts.editor as editor
 
 SAMPLE_DIR = R'C:\Projects\This Project'
@@ -48,3 +50,71 @@ def test_rel_path(monkeypatch):
 
     edit = editor.ImgEditor('fake_root', SAMPLE_DIR)
     assert edit._get_rel_path(SAMPLE_FILE) == REL_FILE_PATH
+
+
+def test_parse_args_viewport():
+    assert not editor.parse_args([]).viewport
+    assert editor.parse_args(['--viewport']).viewport
+
+
+def test_parse_args_tiled_background_needs_viewport():
+    assert editor.parse_args(['--viewport', '--tiled-background']).tiled_background
+    with pytest.raises(SystemExit):
+        editor.parse_args(['--tiled-background'])
+
+
+def test_parse_args_profile(monkeypatch):
+    monkeypatch.delenv('TKIMGLOADER_PROFILE', raising=False)
+    assert editor.parse_args([]).profile is None
+    assert editor.parse_args(['--profile']).profile == 'auto'
+    assert editor.parse_args(['--profile', 'cprofile']).profile == 'cprofile'
+
+    monkeypatch.setenv('TKIMGLOADER_PROFILE', '1')
+    assert editor.parse_args([]).profile == 'auto'
+
+
+def test_toggle_profiling(monkeypatch, tmp_path):
+    editor_init_mock_returns(monkeypatch)
+    messages = []
+    monkeypatch.setattr(editor.messagebox, 'showinfo', lambda title, message: messages.append(message))
+
+    profiler = editor.SessionProfiler(str(tmp_path), backend='cprofile')
+    edit = editor.ImgEditor('fake_root', SAMPLE_DIR, profiler=profiler)
+
+    edit.toggle_profiling()
+    assert profiler.running
+    assert not messages
+
+    edit.toggle_profiling()
+    assert not profiler.running
+    assert messages == [F'Profile written to "{profiler.report_paths[0]}"']
+
+
+class FakeRoot():
+    def __init__(self):
+        self.idle_jobs = []
+        self.titles = []
+
+    def after_idle(self, func):
+        self.idle_jobs.append(func)
+        return 'job_id'
+
+    def title(self, text):
+        self.titles.append(text)
+
+
+def test_title_refreshed_once_per_change_burst(monkeypatch):
+    editor_init_mock_returns(monkeypatch)
+    root = FakeRoot()
+    edit = editor.ImgEditor(root, SAMPLE_DIR)
+    assert not root.idle_jobs
+
+    edit.img_loader.load_background('background.png', draw=False)
+    edit.img_loader.config_path = 'config.json'
+    assert len(root.idle_jobs) == 1
+
+    root.idle_jobs.pop()()
+    assert root.titles == ['*Resolution: 0 x 0, Config: "config.json"']
+
+    edit.img_loader.config_path = 'other.json'
+    assert len(root.idle_jobs) == 1
@@ -0,0 +1,107 @@
+from tkimgloader.imgloader import ConfigDrawer
+
+from tests.tkimgloader_tests.fakes import FakeCanvas
+
+
+def test_undo_redo_moves_merged():
+    drawer = ConfigDrawer('fake_canvas')
+    widget = drawer.add_text(text='text', pos_x=0, pos_y=0, draw=False)
+    history_len = len(drawer.history)
+
+    for _ in range(5):
+        widget.move_by(move_x=10, move_y=1)
+    assert len(drawer.history) == history_len + 1
+
+    assert drawer.undo()
+    assert (widget.pos_x, widget.pos_y) == (0, 0)
+    assert drawer.redo()
+    assert (widget.pos_x, widget.pos_y) == (50, 5)
+    assert not drawer.redo()
+
+
+def test_undo_add_remove():
+    drawer = ConfigDrawer('fake_canvas')
+    widget1 = drawer.add_text(label='text1', text='text', pos_x=0, pos_y=0, draw=False)
+    widget2 = drawer.add_input_box(label='box1', pos_x=10, pos_y=10, width=5, draw=False)
+    drawer.remove_widget(widget1, draw=False)
+    assert list(drawer.widgets.values()) == [widget2]
+
+    drawer.undo()
+    assert drawer.get_widget_with_label('text1') is widget1
+    assert drawer.get_widgets_at(1, 1) == [widget1]
+
+    drawer.undo()
+    drawer.undo()
+    assert not drawer.widgets
+    assert not drawer.history.can_undo
+
+    drawer.redo()
+    drawer.redo()
+    assert list(drawer.widgets.values()) == [widget1, widget2]
+
+
+def test_undo_remove_input_box_in_viewport(fake_entry):  # pylint: disable=unused-argument
+    drawer = ConfigDrawer(FakeCanvas(), viewport=True)
+    box = drawer.add_input_box(label='box1', pos_x=10, pos_y=10, width=5)
+    assert box in drawer.realised_widgets
+    entry = box.canvas_widget
+
+    drawer.remove_widget(box)
+    assert entry.destroyed
+    assert (box.canvas, box.canvas_widget) == (None, None)
+
+    drawer.undo()
+    assert drawer.get_widget_with_label('box1') is box
+    assert box.canvas_widget is not entry and not box.canvas_widget.destroyed
+    assert drawer.get_widgets_at(12, 12) == [box]
+
+
+def test_undo_attribute_changes():
+    drawer = ConfigDrawer('fake_canvas')
+    box = drawer.add_input_box(pos_x=0, pos_y=0, width=5, draw=False)
+    button = drawer.add_image_button(pos_x=0, pos_y=0, orig_on_release=False, images=['path1', 'path2'],
+                                     draw=False)
+
+    box.label = 'box1'
+    box.width = 12
+    with drawer.batch():
+        button.add_new_images(['path3'])
+    assert button.current_image == 2
+
+    drawer.undo()
+    assert list(button.image_path_dic.values()) == ['path1', 'path2']
+    assert button.current_image == 1
+    drawer.undo()
+    assert box.width == 5
+    drawer.undo()
+    assert box.label is None
+    assert drawer.get_widget_with_label('box1') is None
+
+    drawer.redo()
+    drawer.redo()
+    drawer.redo()
+    assert (box.label, box.width) == ('box1', 12)
+    assert list(button.image_path_dic.values()) == ['path1', 'path3', 'path2']
+    assert button.current_image == 2
+
+
+def test_new_change_clears_redo_and_history_is_bounded():
+    drawer = ConfigDrawer('fake_canvas', history_size=3)
+    widgets = [drawer.add_text(text=F'text{index}', pos_x=0, pos_y=0, draw=False) for index in range(5)]
+    assert len(drawer.history) == 3
+
+    drawer.undo()
+    assert drawer.history.can_redo
+    widgets[0].move_by(move_x=1, move_y=0)
+    assert not drawer.history.can_redo
+
+
+def test_loading_config_clears_history(tmp_path):
+    config_path = str(tmp_path / 'config.json')
+    drawer1 = ConfigDrawer('fake_canvas')
+    drawer1.add_text(text='text', pos_x=0, pos_y=0, draw=False)
+    drawer1.save_config_to_file(config_path)
+
+    drawer2 = ConfigDrawer('fake_canvas')
+    drawer2.load_config_file(config_path, draw=False)
+    assert not drawer2.history.can_undo
@@ -0,0 +1,146 @@
+import os
+
+import pytest
+from PIL import Image
+
+from tkimgloader import image_cache
+from tkimgloader.image_cache import ImageCache, decode_images, get_image_size
+
+
+def write_image(dir_path, name, size=(10, 10), colour='red'):
+    file_path = os.path.join(str(dir_path), name)
+    Image.new('RGB', size, colour).save(file_path)
+    return file_path
+
+
+def test_acquire_shares_handle(fake_photo, tmp_path):
+    path = write_image(tmp_path, 'img1.png')
+    cache = ImageCache()
+
+    photo1 = cache.acquire(path)
+    photo2 = cache.acquire(path)
+
+    assert photo1 is photo2
+    assert cache.stats['misses'] == 1
+    assert cache.stats['hits'] == 1
+    assert cache.stats['entries'] == 1
+    assert cache.stats['bytes'] == 400
+
+
+def test_referenced_entries_not_evicted(fake_photo, tmp_path):
+    cache = ImageCache(max_bytes=400)
+
+    photo1 = cache.acquire(write_image(tmp_path, 'img1.png'))
+    cache.acquire(write_image(tmp_path, 'img2.png'))
+
+    assert len(cache) == 2
+    assert cache.stats['evictions'] == 0
+
+    cache.release(photo1)
+    assert len(cache) == 1
+    assert cache.stats['evictions'] == 1
+
+
+def test_lru_eviction_order(fake_photo, tmp_path):
+    path1 = write_image(tmp_path, 'img1.png')
+    path2 = write_image(tmp_path, 'img2.png')
+    path3 = write_image(tmp_path, 'img3.png')
+    cache = ImageCache(max_bytes=800)
+
+    cache.release(cache.acquire(path1))
+    cache.release(cache.acquire(path2))
+    cache.release(cache.acquire(path1))
+
+    # path2 is the least recently used one
+    cache.release(cache.acquire(path3))
+    assert path1 in cache
+    assert path2 not in cache
+    assert path3 in cache
+
+
+def test_lower_budget_evicts(fake_photo, tmp_path):
+    cache = ImageCache()
+    cache.release(cache.acquire(write_image(tmp_path, 'img1.png')))
+    cache.release(cache.acquire(write_image(tmp_path, 'img2.png')))
+    assert len(cache) == 2
+
+    cache.max_bytes = 0
+    assert not cache
+    assert cache.stats['bytes'] == 0
+
+
+def test_changed_file_reloaded(fake_photo, tmp_path):
+    path = write_image(tmp_path, 'img1.png')
+    cache = ImageCache()
+
+    photo1 = cache.acquire(path)
+    write_image(tmp_path, 'img1.png', colour='blue')
+    photo2 = cache.acquire(path)
+
+    assert photo1 is not photo2
+    assert cache.stats['misses'] == 2
+
+    # The stale entry is dropped once nobody uses it
+    cache.release(photo1)
+    assert len(cache) == 1
+
+
+def test_clear_keeps_referenced(fake_photo, tmp_path):
+    cache = ImageCache()
+    cache.acquire(write_image(tmp_path, 'img1.png'))
+    cache.release(cache.acquire(write_image(tmp_path, 'img2.png')))
+
+    cache.clear()
+    assert len(cache) == 1
+
+
+def test_image_sizes_bounded(monkeypatch, tmp_path):
+    monkeypatch.setattr(image_cache, 'MAX_IMAGE_SIZES', 2)
+    monkeypatch.setattr(image_cache, '_IMAGE_SIZES', image_cache.collections.OrderedDict())
+
+    paths = [write_image(tmp_path, F'img{index}.png', size=(index + 1, 1)) for index in range(3)]
+    assert [get_image_size(path) for path in paths] == [(1, 1), (2, 1), (3, 1)]
+    assert len(image_cache._IMAGE_SIZES) == 2  # pylint: disable=protected-access
+
+    ImageCache().clear()
+    assert not image_cache._IMAGE_SIZES  # pylint: disable=protected-access
+
+
+@pytest.mark.parametrize('use_processes', [False, True])
+def test_decode_images(tmp_path, use_processes):
+    path1 = write_image(tmp_path, 'img1.png', size=(4, 3))
+    path2 = write_image(tmp_path, 'img2.png', size=(2, 5))
+    missing_path = os.path.join(str(tmp_path), 'missing.png')
+
+    decoded = decode_images([path1, path2, missing_path], workers=2, use_processes=use_processes)
+
+    assert sorted(decoded) == sorted([path1, path2])
+    assert decoded[path1].size == (4, 3)
+    assert decoded[path2].size == (2, 5)
+
+
+def test_add_decoded_then_acquire_hits(fake_photo, tmp_path):
+    path = write_image(tmp_path, 'img1.png')
+    cache = ImageCache()
+
+    cache.add_decoded(path, 'decoded image')
+    assert path in cache
+
+    photo = cache.acquire(path)
+    assert photo.image == 'decoded image'
+    assert cache.stats['hits'] == 1
+    assert cache.stats['misses'] == 0
+
+
+def test_add_decoded_held_until_released(fake_photo, tmp_path):
+    path = write_image(tmp_path, 'img1.png')
+    cache = ImageCache(max_bytes=1)
+
+    photo = cache.add_decoded(path, 'decoded image')
+    assert path in cache
+    assert cache.add_decoded(path, 'decoded again') is photo
+
+    cache.release(photo)
+    assert path in cache
+    cache.release(photo)
+    assert path not in cache
@@ -4,7 +4,13 @@ import copy
 import pytest
 
 import tkimgloader.imgloader as imgloader
+import tkimgloader.image_cache as image_cache
+import tkimgloader.widgets as widgets_module
+from tkimgloader.config_io import dump_json, load_json
 from tkimgloader.imgloader import ConfigDrawer
+from tkimgloader.widgets import WidgetType
+
+from tests.tkimgloader_tests.fakes import FakeCanvas
 
 
 def test_add_widget():
@@ -96,12 +102,17 @@ def test_load_config_no_unsaved_changed():
         ]
     }
 
+    drawer = ConfigDrawer('fake_canvas')
+    drawer._load_config(config, config_path='path', draw=False)
+    assert not drawer.unsaved_changes
+
+    # The widgets already there are not in the loaded file
     drawer = ConfigDrawer('fake_canvas')
     drawer.add_text(text='sample_text', pos_x=100, pos_y=200, draw=False)
     assert drawer.unsaved_changes
 
     drawer._load_config(config, config_path='path', draw=False)
-    assert not drawer.unsaved_changes
+    assert drawer.unsaved_changes
 
 
 def test_save_config_no_unsaved_changes(monkeypatch):
@@ -257,3 +268,472 @@ def test_save_load_config_identical(monkeypatch):
 
     # Check both configs the same
     assert drawer1 == drawer2
+
+
+def test_widget_changes_mark_unsaved(monkeypatch):
+    def mock_json_save(mock, mock2):
+        None
+    monkeypatch.setattr(imgloader, 'dump_json', mock_json_save)
+
+    drawer = ConfigDrawer('fake_canvas')
+    text = drawer.add_text(text='sample_text', pos_x=100, pos_y=200, draw=False)
+    button = drawer.add_image_button(pos_x=100, pos_y=200, orig_on_release=True, images=['path1'], draw=False)
+    box = drawer.add_input_box(pos_x=100, pos_y=200, width=10, draw=False)
+
+    changes = [
+        lambda: text.move_by(move_x=1, move_y=0),
+        lambda: setattr(text, 'label', 'myLabel'),
+        lambda: button.add_new_images(['path2']),
+        lambda: button.remove_current_image(),
+        lambda: setattr(box, 'width', 20),
+        lambda: drawer.remove_widget(box, draw=False),
+        lambda: drawer.load_background('path', draw=False),
+    ]
+
+    for change in changes:
+        drawer.save_config_to_file('fake_path')
+        assert not drawer.unsaved_changes
+
+        change()
+        assert drawer.unsaved_changes
+
+
+def test_no_op_changes_keep_saved():
+    drawer = ConfigDrawer('fake_canvas')
+    text = drawer.add_text(label='myLabel', text='sample_text', pos_x=100, pos_y=200, draw=False)
+    drawer.load_background('path', draw=False)
+    drawer._mark_saved()
+
+    text.move_to(pos_x=100, pos_y=200)
+    text.label = 'myLabel'
+    drawer.load_background('path', draw=False)
+    assert not drawer.unsaved_changes
+
+
+def test_removed_widget_no_longer_tracked():
+    drawer = ConfigDrawer('fake_canvas')
+    text = drawer.add_text(text='sample_text', pos_x=100, pos_y=200, draw=False)
+    drawer.remove_widget(text, draw=False)
+    drawer._mark_saved()
+
+    text.move_by(move_x=5, move_y=5)
+    assert not drawer.unsaved_changes
+
+
+def test_label_index_follows_label_changes():
+    drawer = ConfigDrawer('fake_canvas')
+
+    widget = drawer.add_text(text='myText', pos_x=200, pos_y=300, draw=False)
+    assert drawer.get_widget_with_label('myLabel') is None
+
+    widget.label = 'myLabel'
+    assert drawer.get_widget_with_label('myLabel') is widget
+
+    widget.label = 'newLabel'
+    assert drawer.get_widget_with_label('myLabel') is None
+    assert drawer.get_widget_with_label('newLabel') is widget
+
+    widget.label = None
+    assert drawer.get_widget_with_label('newLabel') is None
+
+
+def test_label_change_rejects_duplicate():
+    drawer = ConfigDrawer('fake_canvas')
+
+    widget1 = drawer.add_text(label='label1', text='myText', pos_x=200, pos_y=300, draw=False)
+    widget2 = drawer.add_text(label='label2', text='myText', pos_x=200, pos_y=300, draw=False)
+
+    with pytest.raises(ValueError):
+        widget2.label = 'label1'
+
+    assert widget2.label == 'label2'
+    assert drawer.get_widget_with_label('label1') is widget1
+    assert drawer.get_widget_with_label('label2') is widget2
+
+
+def test_label_index_after_remove():
+    drawer = ConfigDrawer('fake_canvas')
+
+    widget = drawer.add_text(label='myLabel', text='myText', pos_x=200, pos_y=300, draw=False)
+    drawer.remove_widget(widget, draw=False)
+    assert drawer.get_widget_with_label('myLabel') is None
+
+    new_widget = drawer.add_text(label='myLabel', text='myText', pos_x=200, pos_y=300, draw=False)
+    assert drawer.get_widget_with_label('myLabel') is new_widget
+
+
+def test_get_widgets_with_labels():
+    drawer = ConfigDrawer('fake_canvas')
+
+    text = drawer.add_text(label='text', text='myText', pos_x=200, pos_y=300, draw=False)
+    box = drawer.add_input_box(label='box', pos_x=200, pos_y=300, draw=False)
+
+    assert drawer.get_widgets_with_labels(['box', 'missing', 'text']) == [box, None, text]
+
+
+def test_get_widgets_of_type():
+    drawer = ConfigDrawer('fake_canvas')
+
+    text1 = drawer.add_text(text='myText', pos_x=200, pos_y=300, draw=False)
+    text2 = drawer.add_text(text='myText', pos_x=200, pos_y=300, draw=False)
+    box = drawer.add_input_box(pos_x=200, pos_y=300, draw=False)
+
+    assert drawer.get_widgets_of_type(WidgetType.TEXT) == [text1, text2]
+    assert drawer.get_widgets_of_type(WidgetType.INPUT_BOX) == [box]
+    assert drawer.get_widgets_of_type(WidgetType.BUTTON) == []
+
+    drawer.remove_widget(text1, draw=False)
+    assert drawer.get_widgets_of_type(WidgetType.TEXT) == [text2]
+
+
+def test_add_widgets():
+    drawer = ConfigDrawer('fake_canvas')
+
+    widgets = [
+        drawer.create_widget(WidgetType.TEXT, {'label': 'text', 'text': 'myText', 'x': 1, 'y': 2}),
+        drawer.create_widget(WidgetType.BUTTON, {'label': 'button', 'x': 3, 'y': 4, 'orig_image_on_release': False,
+                                                 'current_image': 2, 'images': {1: 'path1', 2: 'path2'}}),
+        drawer.create_widget(WidgetType.INPUT_BOX, {'label': None, 'x': 5, 'y': 6}),
+    ]
+    assert drawer.add_widgets(widgets, draw=False) == widgets
+
+    assert list(drawer.widgets.values()) == widgets
+    assert drawer.get_widget_with_label('button') is widgets[1]
+    assert drawer.unsaved_changes
+    assert drawer.calc_config_dict() == {
+        'background': None,
+        'Text': [{'label': 'text', 'text': 'myText', 'x': 1, 'y': 2}],
+        'Button': [{'label': 'button', 'x': 3, 'y': 4, 'orig_image_on_release': False,
+                    'current_image': 2, 'images': {1: 'path1', 2: 'path2'}}],
+        'Input Box': [{'label': None, 'x': 5, 'y': 6}],
+    }
+
+
+@pytest.mark.parametrize('labels', [
+    ['existing', 'new'],
+    ['new', 'new'],
+])
+def test_add_widgets_duplicate_labels_adds_nothing(labels):
+    drawer = ConfigDrawer('fake_canvas')
+    drawer.add_text(label='existing', text='myText', pos_x=200, pos_y=300, draw=False)
+
+    widgets = [drawer.create_widget(WidgetType.TEXT, {'label': label, 'text': 'myText', 'x': 1, 'y': 2})
+               for label in labels]
+    with pytest.raises(ValueError):
+        drawer.add_widgets(widgets, draw=False)
+
+    assert len(drawer.widgets) == 1
+    assert drawer.get_widget_with_label('new') is None
+
+
+def test_iter_load_config_file_matches_load(tmp_path):
+    drawer1 = ConfigDrawer('fake_canvas')
+    drawer1.load_background('path', draw=False)
+    for index in range(5):
+        drawer1.add_text(label=F'text{index}', text='sample_text', pos_x=index, pos_y=200, draw=False)
+    drawer1.add_image_button(pos_x=100, pos_y=200, orig_on_release=True, images=['path1', 'path2'], draw=False)
+    drawer1.add_input_box(label='box', pos_x=100, pos_y=200, draw=False)
+
+    config_path = str(tmp_path / 'config.json')
+    drawer1.save_config_to_file(config_path)
+
+    drawer2 = ConfigDrawer('fake_canvas')
+    progress = list(drawer2.iter_load_config_file(config_path, draw=False, batch_size=2))
+
+    assert progress == [2, 4, 6, 7]
+    assert drawer2.config_path == config_path
+    assert not drawer2.unsaved_changes
+    assert drawer2.get_widget_with_label('text3') is not None
+    assert drawer1 == drawer2
+    assert drawer2.saved_img_config == drawer1.saved_img_config
+
+
+def test_saved_config_matches_drawer_after_cached_load(tmp_path):
+    config_path = str(tmp_path / 'config.json')
+    drawer1 = ConfigDrawer('fake_canvas')
+    drawer1.add_image_button(label='button', pos_x=1, pos_y=2, orig_on_release=True, images=['path1'], draw=False)
+    drawer1.save_config_to_file(config_path)
+
+    # The second load is served from the config cache
+    ConfigDrawer('fake_canvas').load_config_file(config_path, draw=False)
+    drawer2 = ConfigDrawer('fake_canvas')
+    drawer2.load_config_file(config_path, draw=False)
+
+    config_copy = copy.deepcopy(drawer2.saved_img_config)
+    assert isinstance(config_copy, dict)
+    assert isinstance(config_copy['Button'], list)
+    config_copy['Button'][0]['images'][2] = 'path2'
+    assert drawer2.saved_img_config == drawer2.calc_config_dict() == drawer1.saved_img_config
+
+
+def test_load_into_drawer_with_widgets_stays_unsaved(tmp_path):
+    config_path = str(tmp_path / 'config.json')
+    drawer1 = ConfigDrawer('fake_canvas')
+    drawer1.add_text(label='loaded', text='text', pos_x=0, pos_y=0, draw=False)
+    drawer1.save_config_to_file(config_path)
+
+    drawer2 = ConfigDrawer('fake_canvas')
+    drawer2.add_text(label='existing', text='text', pos_x=0, pos_y=0, draw=False)
+    drawer2.load_config_file(config_path, draw=False)
+    assert drawer2.unsaved_changes
+
+    # Saving back to the loaded file keeps the widgets that were there first
+    assert drawer2.save_config_to_file(config_path)
+    assert [text['label'] for text in load_json(config_path)['Text']] == ['existing', 'loaded']
+
+
+def test_load_config_file_cached(tmp_path):
+    config_path = str(tmp_path / 'config.json')
+    drawer1 = ConfigDrawer('fake_canvas')
+    drawer1.add_text(label='myText', text='sample_text', pos_x=100, pos_y=200, draw=False)
+    drawer1.save_config_to_file(config_path)
+
+    drawer2 = ConfigDrawer('fake_canvas')
+    drawer2.load_config_file(config_path, draw=False)
+    assert drawer1 == drawer2
+
+    # Saving invalidates the cached config
+    drawer1.get_widget_with_label('myText').move_by(move_x=5, move_y=5)
+    drawer1.save_config_to_file(config_path)
+
+    drawer3 = ConfigDrawer('fake_canvas')
+    drawer3.load_config_file(config_path, draw=False)
+    assert drawer1 == drawer3
+
+
+def test_spatial_queries_follow_widgets():
+    drawer = ConfigDrawer('fake_canvas')
+    drawer.add_text(label='text1', text='abc', pos_x=10, pos_y=10, draw=False)
+    drawer.add_input_box(label='box1', pos_x=15, pos_y=12, width=10, draw=False)
+    drawer.add_text(label='text2', text='far away', pos_x=1000, pos_y=1000, draw=False)
+    text1 = drawer.get_widget_with_label('text1')
+    box1 = drawer.get_widget_with_label('box1')
+    text2 = drawer.get_widget_with_label('text2')
+
+    assert drawer.get_widgets_at(11, 11) == [text1]
+    assert set(drawer.get_widgets_at(16, 13)) == {text1, box1}
+    assert set(drawer.get_widgets_in_rect((0, 0, 500, 500))) == {text1, box1}
+    assert drawer.get_nearest_widgets(900, 900) == [text2]
+    assert set(drawer.find_overlapping_widgets()[0]) == {text1, box1}
+
+    text1.move_by(move_x=500, move_y=0)
+    assert drawer.get_widgets_at(11, 11) == []
+    assert drawer.get_widgets_at(511, 11) == [text1]
+    assert drawer.find_overlapping_widgets() == []
+
+    box1.width = 200
+    assert drawer.get_widgets_at(511, 13) == [text1, box1] or drawer.get_widgets_at(511, 13) == [box1, text1]
+
+    drawer.remove_widget(text2, draw=False)
+    assert drawer.get_widgets_at(1001, 1001) == []
+
+
+def test_viewport_only_draws_visible_widgets():
+    canvas = FakeCanvas(width=200, height=200)
+    drawer = ConfigDrawer(canvas, viewport=True, viewport_margin=0)
+    near = drawer.add_text(label='near', text='near', pos_x=10, pos_y=10)
+    far = drawer.add_text(label='far', text='far', pos_x=1000, pos_y=1000)
+
+    assert drawer.realised_widgets == [near]
+    assert len(canvas.items) == 1
+    assert far.canvas is None
+
+    # Scrolling swaps which widgets are drawn
+    canvas.scroll_x, canvas.scroll_y = 900, 900
+    drawer.schedule_viewport_update()
+    drawer.schedule_viewport_update()
+    assert len(canvas.idle_jobs) == 1
+    canvas.idle_jobs.pop()()
+
+    assert drawer.realised_widgets == [far]
+    assert list(canvas.items.values()) == [(1000, 1000)]
+    assert near.canvas is None
+
+    # Moving a widget into view draws it, moving it out releases it
+    near.move_to(pos_x=950, pos_y=950)
+    assert len(drawer.realised_widgets) == 2
+    far.move_by(move_x=500, move_y=0)
+    assert drawer.realised_widgets == [near]
+
+    drawer.remove_widget(far)
+    drawer.remove_widget(near)
+    assert not canvas.items
+    assert not drawer.realised_widgets
+
+
+def test_lift_survives_viewport_release():
+    canvas = FakeCanvas(width=200, height=200)
+    drawer = ConfigDrawer(canvas, viewport=True, viewport_margin=0)
+    raised = drawer.add_text(text='raised', pos_x=1000, pos_y=1000)
+    other = drawer.add_text(text='other', pos_x=1010, pos_y=1010)
+
+    # Not drawn yet, lifting and removing must not touch the canvas
+    assert raised.canvas is None
+    drawer.lift_widget(raised)
+    assert not canvas.raised
+    raised.destroy()
+
+    # Once scrolled into view the raised widget goes back above the newly drawn ones
+    canvas.scroll_x, canvas.scroll_y = 900, 900
+    drawer.update_viewport()
+    assert canvas.raised == [raised.canvas_widget]
+
+    other.move_by(move_x=1000, move_y=0)
+    other.move_by(move_x=-1000, move_y=0)
+    assert canvas.raised == [raised.canvas_widget, raised.canvas_widget]
+
+    drawer.remove_widget(raised)
+    other.move_by(move_x=1000, move_y=0)
+    other.move_by(move_x=-1000, move_y=0)
+    assert len(canvas.raised) == 2
+
+
+def test_change_listeners_only_on_transitions(tmp_path):
+    changes = []
+
+    def listener(*, drawer, change):
+        changes.append(change)
+
+    drawer = ConfigDrawer('fake_canvas')
+    drawer.add_change_listener(listener)
+
+    drawer.load_background('background.png', draw=False)
+    assert changes == ['unsaved_changes', 'background']
+
+    # Already dirty, further edits stay quiet
+    widget = drawer.add_text(text='myText', pos_x=200, pos_y=300, draw=False)
+    widget.move_by(move_x=10, move_y=0)
+    drawer.load_background('background.png', draw=False)
+    assert changes == ['unsaved_changes', 'background']
+
+    drawer.save_config_to_file(str(tmp_path / 'config.json'))
+    assert changes == ['unsaved_changes', 'background', 'config_path', 'unsaved_changes']
+    assert not drawer.unsaved_changes
+
+    drawer.remove_change_listener(listener)
+    widget.move_by(move_x=10, move_y=0)
+    assert len(changes) == 4
+
+
+def test_undrawn_widgets_indexed_on_first_query(monkeypatch):
+    sized_paths = []
+    monkeypatch.setattr(widgets_module, 'get_image_size', lambda path: sized_paths.append(path) or (10, 10))
+
+    drawer = ConfigDrawer('fake_canvas')
+    button = drawer.add_image_button(pos_x=0, pos_y=0, orig_on_release=False, images=['path1'], draw=False)
+    button.move_by(move_x=100, move_y=50)
+    drawer.translate_widgets([button], move_x=10, move_y=10)
+    assert sized_paths == []
+
+    assert drawer.get_widgets_at(110, 60) == [button]
+    assert drawer.get_widgets_at(0, 0) == []
+    assert sized_paths == ['path1']
+
+    # Indexed widgets follow moves as before
+    button.move_by(move_x=-110, move_y=-60)
+    assert drawer.get_widgets_at(0, 0) == [button]
+    assert sized_paths == ['path1']
+
+
+def test_preloaded_images_outlive_cache_budget(fake_cache, monkeypatch, tmp_path):
+    decoded_paths = []
+    monkeypatch.setattr(image_cache, 'decode_image', lambda path: decoded_paths.append(path) or path)
+    fake_cache.max_bytes = 1
+
+    config_path = str(tmp_path / 'config.json')
+    dump_json(config_path, {'Button': [
+        {'label': None, 'orig_image_on_release': False, 'x': 1, 'y': 2,
+         'current_image': 1, 'images': {'1': 'path1', '2': 'path2'}}]})
+    drawer = ConfigDrawer(FakeCanvas())
+    drawer.load_config_file(config_path, decode_workers=2, use_cache=False)
+
+    # Every image was decoded once, by the preload, and the button holds them now
+    assert sorted(decoded_paths) == ['path1', 'path2']
+    assert fake_cache.stats['misses'] == 0
+    assert len(fake_cache) == 2
+
+
+def test_atlas_images_kept_while_loaded(fake_cache, monkeypatch):
+    atlases = {'atlas1': {'path1': 'image1'}, 'atlas2': {'path2': 'image2'}}
+    monkeypatch.setattr(imgloader, 'load_atlas_images', lambda index_path, disk_cache: atlases[index_path])
+    fake_cache.max_bytes = 1
+
+    drawer = ConfigDrawer(FakeCanvas())
+    drawer.load_atlas('atlas1')
+    assert 'path1' in fake_cache
+
+    drawer.load_atlas('atlas2')
+    assert 'path1' not in fake_cache
+    assert 'path2' in fake_cache
+
+
+class CountingCanvas(FakeCanvas):
+    def __init__(self):
+        super().__init__(width=200, height=200)
+        self.coords_calls = 0
+
+    def coords(self, canvas_id, pos_x, pos_y):
+        self.coords_calls += 1
+        super().coords(canvas_id, pos_x, pos_y)
+
+
+def test_batch_coalesces_redraws():
+    canvas = CountingCanvas()
+    drawer = ConfigDrawer(canvas)
+    widgets = [drawer.add_text(text=F'text{index}', pos_x=index, pos_y=0) for index in range(3)]
+
+    with drawer.batch():
+        for _ in range(10):
+            for widget in widgets:
+                widget.move_by(move_x=1, move_y=1)
+        with drawer.batch():
+            widgets[0].move_by(move_x=5, move_y=0)
+
+    # Model and index are current straight away, the canvas waits for the idle flush
+    assert canvas.coords_calls == 0
+    assert drawer.spatial_index.bounds(widgets[0])[:2] == (15, 10)
+    assert drawer.unsaved_changes
+
+    # Updates before the flush runs are collected too
+    widgets[1].move_by(move_x=1, move_y=0)
+    assert canvas.coords_calls == 0
+    assert len(canvas.idle_jobs) == 1
+
+    canvas.idle_jobs.pop()()
+    assert canvas.coords_calls == 3
+    assert sorted(canvas.items.values()) == [(12, 10), (12, 10), (15, 10)]
+
+    # Outside a batch changes are drawn immediately again
+    widgets[2].move_by(move_x=1, move_y=0)
+    assert canvas.coords_calls == 4
+
+
+def test_flush_updates_keeps_other_idle_jobs():
+    canvas = FakeCanvas()
+    drawer = ConfigDrawer(canvas, viewport=True)
+    widget = drawer.add_text(text='text', pos_x=0, pos_y=0)
+    drawer.schedule_viewport_update()
+    with drawer.batch():
+        widget.move_by(move_x=1, move_y=1)
+    assert len(canvas.idle_jobs) == 2
+
+    # Flushing early cancels its own job, the viewport update still runs
+    drawer.flush_updates()
+    assert canvas.idle_jobs == [drawer.update_viewport]
+
+
+def test_flush_updates_skips_removed_widgets():
+    canvas = CountingCanvas()
+    drawer = ConfigDrawer(canvas)
+    widget1 = drawer.add_text(text='text1', pos_x=0, pos_y=0)
+    widget2 = drawer.add_text(text='text2', pos_x=0, pos_y=0)
+
+    drawer.begin_update()
+    widget1.move_by(move_x=1, move_y=0)
+    widget2.move_by(move_x=1, move_y=0)
+    drawer.remove_widget(widget2)
+    drawer.end_update()
+
+    drawer.flush_updates()
+    assert not canvas.idle_jobs
+    assert canvas.coords_calls == 1
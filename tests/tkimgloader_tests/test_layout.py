@@ -0,0 +1,120 @@
+import pytest
+
+import tkimgloader.widgets as widgets_module
+from tkimgloader.imgloader import GROUP_MOVE_TAG, ConfigDrawer
+from tkimgloader.layout import calc_aligned, calc_distributed, calc_snapped
+from tkimgloader.widgets import CanvasText
+
+from tests.tkimgloader_tests.fakes import FakeCanvas
+
+
+def test_widgets_have_no_instance_dict():
+    widget = CanvasText(text='text', pos_x=1, pos_y=2)
+    assert not hasattr(widget, '__dict__')
+    with pytest.raises(AttributeError):
+        widget.unknown = 1
+
+
+def test_calc_aligned():
+    # Positions differ from the left/top edges, e.g. centred images
+    pos_x, pos_y = [15, 40, 100], [0, 0, 0]
+    bounds = ([10, 30, 90], [0, 0, 0], [10, 20, 20], [5, 5, 5])
+
+    assert calc_aligned(pos_x, pos_y, bounds, edge='left') == ([15, 20, 20], [0, 0, 0])
+    assert calc_aligned(pos_x, pos_y, bounds, edge='right') == ([105, 100, 100], [0, 0, 0])
+    assert calc_aligned(pos_x, pos_y, bounds, edge='centre') == ([60, 60, 60], [0, 0, 0])
+    with pytest.raises(ValueError):
+        calc_aligned(pos_x, pos_y, bounds, edge='diagonal')
+
+
+def test_calc_distributed():
+    pos_x, pos_y = [0, 12, 100], [0, 0, 0]
+    bounds = ([0, 12, 100], [0, 0, 0], [10, 20, 10], [5, 5, 5])
+
+    assert calc_distributed(pos_x, pos_y, bounds, axis='x') == ([0, 45, 100], [0, 0, 0])
+    assert calc_distributed(pos_x[:2], pos_y[:2], bounds, axis='x') == ([0, 12], [0, 0])
+
+
+def test_calc_snapped():
+    assert calc_snapped([4, 6, -6], [11, 14, 0], grid_size=10) == ([0, 10, -10], [10, 10, 0])
+    with pytest.raises(ValueError):
+        calc_snapped([1], [1], grid_size=0)
+
+
+def test_drawer_group_operations():
+    drawer = ConfigDrawer('fake_canvas')
+    widgets = [drawer.add_input_box(pos_x=pos_x, pos_y=pos_y, width=2, draw=False)
+               for pos_x, pos_y in ((0, 7), (45, 3), (200, 21))]
+
+    drawer.translate_widgets(widgets, move_x=5, move_y=-1)
+    assert [(widget.pos_x, widget.pos_y) for widget in widgets] == [(5, 6), (50, 2), (205, 20)]
+
+    drawer.align_widgets(widgets, edge='top')
+    assert [widget.pos_y for widget in widgets] == [2, 2, 2]
+
+    drawer.distribute_widgets(widgets, axis='x')
+    assert [widget.pos_x for widget in widgets] == [5, 105, 205]
+
+    drawer.snap_widgets_to_grid(widgets, grid_size=20)
+    assert [(widget.pos_x, widget.pos_y) for widget in widgets] == [(0, 0), (100, 0), (200, 0)]
+
+    # The index follows and the layout saves as normal
+    assert drawer.get_widgets_at(101, 1) == [widgets[1]]
+    assert [box['x'] for box in drawer.calc_config_dict()['Input Box']] == [0, 100, 200]
+
+
+def test_group_move_is_one_change():
+    canvas = FakeCanvas()
+    drawer = ConfigDrawer(canvas)
+    widgets = [drawer.add_text(text='text', pos_x=pos_x, pos_y=0) for pos_x in (0, 10, 20)]
+    history_size = len(drawer.history)
+    bounds = [drawer.spatial_index.bounds(widget) for widget in widgets]
+
+    drawer.translate_widgets(widgets, move_x=1.5, move_y=2)
+    assert [(widget.pos_x, widget.pos_y) for widget in widgets] == [(1.5, 2), (11.5, 2), (21.5, 2)]
+    assert len(drawer.history) == history_size + 1
+
+    # One canvas call for the whole group
+    assert canvas.moves == [(GROUP_MOVE_TAG, 1.5, 2)]
+    assert list(canvas.items.values()) == [(1.5, 2), (11.5, 2), (21.5, 2)]
+    assert not canvas.idle_jobs
+
+    drawer.undo()
+    assert [(widget.pos_x, widget.pos_y) for widget in widgets] == [(0, 0), (10, 0), (20, 0)]
+    assert [drawer.spatial_index.bounds(widget) for widget in widgets] == bounds
+    assert list(canvas.items.values()) == [(0, 0), (10, 0), (20, 0)]
+    drawer.redo()
+    assert [widget.pos_x for widget in widgets] == [1.5, 11.5, 21.5]
+
+
+def test_group_move_by_offset():
+    canvas = FakeCanvas()
+    drawer = ConfigDrawer(canvas)
+    widgets = [drawer.add_text(text='text', pos_x=0, pos_y=pos_y) for pos_y in (0, 10, 10)]
+
+    drawer.snap_widgets_to_grid(widgets, grid_size=8)
+    assert [widget.pos_y for widget in widgets] == [0, 8, 8]
+    assert canvas.moves == [(GROUP_MOVE_TAG, 0, -2)]
+
+    drawer.move_widgets([(widgets[0], 5, 0)])
+    assert canvas.moves[-1] == (widgets[0].canvas_widget, 5, 0)
+    assert canvas.items[widgets[0].canvas_widget] == (5, 0)
+
+
+def test_group_operations_check_widgets(monkeypatch):
+    sized_paths = []
+    monkeypatch.setattr(widgets_module, 'get_image_size', lambda path: sized_paths.append(path) or (10, 10))
+    drawer = ConfigDrawer('fake_canvas')
+    buttons = [drawer.add_image_button(pos_x=index, pos_y=0, orig_on_release=False, images=[F'path{index}'],
+                                       draw=False) for index in range(3)]
+
+    # Only the widgets in the group are sized
+    drawer.align_widgets(buttons[:2], edge='top')
+    assert sorted(sized_paths) == ['path0', 'path1']
+
+    other = ConfigDrawer('fake_canvas').add_text(text='text', pos_x=0, pos_y=0, draw=False)
+    with pytest.raises(ValueError):
+        drawer.translate_widgets([buttons[0], other], move_x=1, move_y=1)
+    with pytest.raises(ValueError):
+        drawer.align_widgets([buttons[0], other], edge='left')
+    assert (buttons[0].pos_x, other.pos_x) == (0, 0)
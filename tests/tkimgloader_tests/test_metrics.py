@@ -0,0 +1,156 @@
+import logging
+
+import pytest
+
+import tkimgloader.imgloader as imgloader
+from tkimgloader import config_io, metrics
+from tkimgloader.imgloader import ConfigDrawer
+from tkimgloader.metrics import CallbackSink, Histogram, LogSink, Metrics, PrometheusFileSink
+
+from tests.tkimgloader_tests.fakes import FakeCanvas
+
+
+@pytest.fixture
+def shared_metrics(monkeypatch):
+    fresh_metrics = Metrics(enabled=True)
+    monkeypatch.setattr(metrics, '_SHARED_METRICS', fresh_metrics)
+    return fresh_metrics
+
+
+def test_histogram_buckets():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+
+    data = histogram.to_dict()
+    assert data['count'] == 4
+    assert data['sum'] == pytest.approx(2.65)
+    assert data['min'] == 0.05
+    assert data['max'] == 2.0
+    assert data['buckets'] == [(0.1, 2), (1.0, 1), (float('inf'), 1)]
+
+
+def test_disabled_records_nothing():
+    disabled_metrics = Metrics()
+    disabled_metrics.increment('count')
+    with disabled_metrics.phase('phase'):
+        pass
+
+    assert disabled_metrics.snapshot() == {'counters': {}, 'phases': {}}
+
+
+def test_phase_and_counters():
+    enabled_metrics = Metrics(enabled=True)
+    enabled_metrics.increment('count')
+    enabled_metrics.increment('count', 2)
+    with enabled_metrics.phase('phase'):
+        pass
+
+    snapshot = enabled_metrics.snapshot()
+    assert snapshot['counters'] == {'count': 3}
+    assert snapshot['phases']['phase']['count'] == 1
+
+    enabled_metrics.reset()
+    assert enabled_metrics.snapshot() == {'counters': {}, 'phases': {}}
+
+
+def test_timed_follows_shared_metrics(shared_metrics):
+    @metrics.timed('func')
+    def func(value):
+        return value * 2
+
+    assert func(2) == 4
+    shared_metrics.disable()
+    assert func(3) == 6
+    assert shared_metrics.snapshot()['phases']['func']['count'] == 1
+
+
+def test_timed_records_on_error(shared_metrics):
+    @metrics.timed('failing')
+    def failing():
+        raise ValueError('failed')
+
+    with pytest.raises(ValueError):
+        failing()
+    assert shared_metrics.snapshot()['phases']['failing']['count'] == 1
+
+
+def test_drawer_phases(shared_metrics, monkeypatch, tmp_path):
+    monkeypatch.setattr(imgloader, 'dump_json', lambda file_path, config: None)
+
+    config_path = str(tmp_path / 'config.json')
+    config_io.dump_json(config_path, {'background': 'path', 'Button': [
+        {'label': None, 'orig_image_on_release': False, 'x': 1, 'y': 2,
+         'current_image': 1, 'images': {'1': 'path1', '2': 'path2'}}]})
+
+    drawer = ConfigDrawer('fake_canvas')
+    drawer.load_config_file(config_path, draw=False, use_cache=False)
+    button = drawer.get_widgets_of_type(imgloader.WidgetType.BUTTON)[0]
+    button.next_image()
+    button.previous_image()
+    drawer.save_config_to_file('fake_path')
+
+    phases = shared_metrics.snapshot()['phases']
+    assert phases['load_json']['count'] == 1
+    assert phases['load_config']['count'] == 1
+    assert phases['load_background']['count'] == 1
+    assert phases['button_switch_image']['count'] == 2
+    assert phases['save_config']['count'] == 1
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_image_and_canvas_phases(shared_metrics, fake_cache):  # pylint: disable=unused-argument
+    drawer = ConfigDrawer(FakeCanvas())
+    button = drawer.add_image_button(pos_x=10, pos_y=10, orig_on_release=False, images=['path1', 'path2'])
+    drawer.add_text(text='text', pos_x=0, pos_y=0)
+    button.next_image()
+    button.move_by(move_x=1, move_y=1)
+
+    snapshot = shared_metrics.snapshot()
+    assert snapshot['counters'] == {'photo_images': 2}
+    phases = snapshot['phases']
+    assert phases['image_decode']['count'] == 2
+    assert phases['photo_image']['count'] == 2
+    assert phases['button_draw']['count'] == 1
+    assert phases['canvas_create_image']['count'] == 1
+    assert phases['canvas_create_text']['count'] == 1
+    assert phases['canvas_itemconfig']['count'] == 1
+    assert phases['canvas_coords']['count'] == 1
+
+
+def test_publish_to_sinks(shared_metrics, tmp_path):
+    shared_metrics.increment('photo_images', 2)
+    shared_metrics.observe('load_json', 0.002)
+
+    snapshots = []
+    prometheus_path = str(tmp_path / 'metrics.prom')
+    shared_metrics.add_sink(CallbackSink(lambda *, snapshot: snapshots.append(snapshot)))
+    shared_metrics.add_sink(PrometheusFileSink(prometheus_path))
+    shared_metrics.add_sink(LogSink(level=logging.WARNING))
+
+    handler = ListHandler()
+    metrics.logger.addHandler(handler)
+    try:
+        snapshot = shared_metrics.publish()
+    finally:
+        metrics.logger.removeHandler(handler)
+
+    assert snapshots == [snapshot]
+    assert handler.messages[0] == 'Counter photo_images: 2'
+    assert handler.messages[1].startswith('Phase load_json: 1 calls, total 0.0020s')
+
+    with open(prometheus_path) as file_ptr:
+        text = file_ptr.read()
+    assert 'tkimgloader_photo_images_total 2' in text
+    assert 'tkimgloader_phase_seconds_bucket{phase="load_json",le="0.001"} 0' in text
+    assert 'tkimgloader_phase_seconds_bucket{phase="load_json",le="0.005"} 1' in text
+    assert 'tkimgloader_phase_seconds_bucket{phase="load_json",le="+Inf"} 1' in text
+    assert 'tkimgloader_phase_seconds_count{phase="load_json"} 1' in text
@@ -0,0 +1,82 @@
+import os
+import pstats
+
+import pytest
+
+from tkimgloader.scripts import profiler
+from tkimgloader.scripts.profiler import SessionProfiler
+
+
+class FakeProfiler():
+    def __init__(self):
+        self.running = False
+
+    def start(self):
+        self.running = True
+
+    def stop(self):
+        self.running = False
+
+    def output_html(self):  # pylint: disable=no-self-use
+        return '<html></html>'
+
+
+class FakePyinstrument():
+    Profiler = FakeProfiler
+
+
+@pytest.mark.parametrize('value, expected', [
+    (None, None),
+    ('', None),
+    ('0', None),
+    ('1', 'auto'),
+    ('cProfile', 'cprofile'),
+    ('pyinstrument', 'pyinstrument'),
+])
+def test_backend_from_env(value, expected):
+    environ = {} if value is None else {profiler.PROFILE_ENV_VAR: value}
+    assert profiler.backend_from_env(environ) == expected
+
+
+def test_calc_backend_falls_back_to_cprofile(monkeypatch):
+    monkeypatch.setattr(profiler, 'pyinstrument', None)
+    assert profiler.calc_backend('auto') == 'cprofile'
+    assert profiler.calc_backend('pyinstrument') == 'cprofile'
+
+    monkeypatch.setattr(profiler, 'pyinstrument', FakePyinstrument)
+    assert profiler.calc_backend('auto') == 'pyinstrument'
+    assert profiler.calc_backend('cprofile') == 'cprofile'
+
+    with pytest.raises(ValueError):
+        profiler.calc_backend('invalid')
+
+
+def test_cprofile_session(tmp_path):
+    report_dir = str(tmp_path / 'logs')
+    session = SessionProfiler(report_dir, backend='cprofile')
+    assert session.stop() is None
+
+    assert session.toggle() is None
+    assert session.running
+    sorted(range(100))
+    report_path = session.toggle()
+
+    assert not session.running
+    assert report_path.endswith('.pstats')
+    assert os.path.dirname(report_path) == report_dir
+    assert pstats.Stats(report_path).total_calls > 0
+
+
+def test_pyinstrument_sessions_get_own_reports(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiler, 'pyinstrument', FakePyinstrument)
+    session = SessionProfiler(str(tmp_path), backend='pyinstrument')
+
+    session.start()
+    first_path = session.stop()
+    session.start()
+    second_path = session.stop()
+
+    assert first_path != second_path
+    assert session.report_paths == [first_path, second_path]
+    with open(second_path) as file_ptr:
+        assert file_ptr.read() == '<html></html>'
@@ -0,0 +1,54 @@
+import os
+
+from PIL import Image
+
+from tkimgloader import config_io
+from tkimgloader.scripts import render
+
+
+def write_configs(dir_path, count):
+    Image.new('RGB', (20, 10), 'red').save(os.path.join(str(dir_path), 'background.png'))
+    config_dir = os.path.join(str(dir_path), 'configs')
+    os.makedirs(config_dir)
+    for index in range(count):
+        config_io.dump_json(os.path.join(config_dir, F'config{index}.json'), {
+            'background': 'background.png',
+            'Text': [{'label': None, 'text': F'Text {index}', 'x': 1, 'y': 1}]})
+    return config_dir
+
+
+def test_collect_config_paths(tmp_path):
+    config_dir = write_configs(tmp_path, 3)
+
+    paths = render.collect_config_paths([config_dir, os.path.join(config_dir, 'config1.*')])
+    assert [os.path.basename(path) for path in paths] == ['config0.json', 'config1.json', 'config2.json']
+
+
+def test_calc_output_path():
+    assert render.calc_output_path(os.path.join('dir', 'config.json'), None) == os.path.join('dir', 'config.png')
+    assert render.calc_output_path(os.path.join('dir', 'config.json'), 'out') == os.path.join('out', 'config.png')
+
+
+def test_main_renders_all(tmp_path, capsys):
+    config_dir = write_configs(tmp_path, 3)
+    output_dir = str(tmp_path / 'out')
+
+    result = render.main([config_dir, '--output-dir', output_dir, '--base-dir', str(tmp_path), '--workers', '2'])
+
+    assert result == 0
+    assert sorted(os.listdir(output_dir)) == ['config0.png', 'config1.png', 'config2.png']
+    with Image.open(os.path.join(output_dir, 'config0.png')) as image:
+        assert image.size == (20, 10)
+    assert 'Rendered 3 of 3 configs' in capsys.readouterr().out
+
+
+def test_main_reports_failures(tmp_path, capsys):
+    config_dir = write_configs(tmp_path, 1)
+
+    # Images are relative to the working dir, rendering from the wrong base dir fails
+    result = render.main([config_dir, '--base-dir', str(tmp_path / 'missing'), '--workers', '1'])
+
+    assert result == 1
+    output = capsys.readouterr().out
+    assert 'FAILED' in output
+    assert 'Rendered 0 of 1 configs' in output
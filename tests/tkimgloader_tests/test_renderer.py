@@ -0,0 +1,130 @@
+import os
+import subprocess
+import sys
+
+from PIL import Image
+
+from tkimgloader.imgloader import ConfigDrawer
+from tkimgloader.renderer import ConfigRenderer, render_config
+
+WHITE = (255, 255, 255, 255)
+RED = (255, 0, 0, 255)
+BLUE = (0, 0, 255, 255)
+
+
+def write_image(dir_path, name, size, colour):
+    Image.new('RGBA', size, colour).save(os.path.join(str(dir_path), name))
+    return name
+
+
+def test_renderer_does_not_import_tkinter():
+    code = 'import sys, tkimgloader.renderer; assert "tkinter" not in sys.modules'
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+def test_render_background_and_centred_button(tmp_path):
+    write_image(tmp_path, 'background.png', (50, 40), WHITE)
+    write_image(tmp_path, 'red.png', (10, 6), RED)
+    write_image(tmp_path, 'blue.png', (10, 6), BLUE)
+    config = {'background': 'background.png', 'Button': [
+        {'label': None, 'x': 20, 'y': 20, 'orig_image_on_release': True, 'current_image': 2,
+         'images': {'1': 'red.png', '2': 'blue.png'}}]}
+
+    image = render_config(config, base_dir=str(tmp_path))
+
+    assert image.size == (50, 40)
+    assert image.getpixel((15, 17)) == BLUE
+    assert image.getpixel((24, 22)) == BLUE
+    assert image.getpixel((14, 17)) == WHITE
+    assert image.getpixel((25, 23)) == WHITE
+
+
+def test_render_transparent_button_clipped(tmp_path):
+    write_image(tmp_path, 'background.png', (20, 20), WHITE)
+    write_image(tmp_path, 'half.png', (10, 10), (255, 0, 0, 128))
+    config = {'background': 'background.png', 'Button': [
+        {'label': None, 'x': 0, 'y': 0, 'orig_image_on_release': True, 'current_image': 1,
+         'images': {'1': 'half.png'}}]}
+
+    image = render_config(config, base_dir=str(tmp_path))
+
+    red, green, blue, alpha = image.getpixel((0, 0))
+    assert red == 255 and 120 < green < 135 and 120 < blue < 135 and alpha == 255
+    assert image.getpixel((5, 5)) == WHITE
+
+
+def test_render_overlapping_buttons(tmp_path):
+    write_image(tmp_path, 'half.png', (10, 10), (255, 0, 0, 128))
+    write_image(tmp_path, 'blue.png', (10, 10), BLUE)
+    paths = ['half.png', 'half.png', 'blue.png', 'half.png']
+    config = {'Button': [
+        {'label': None, 'x': index * 6, 'y': 5, 'orig_image_on_release': True, 'current_image': 1,
+         'images': {'1': path}} for index, path in enumerate(paths)]}
+
+    image = ConfigRenderer(base_dir=str(tmp_path)).render(config)
+    assert image.mode == 'RGBA'
+
+    # Same as compositing each button in turn, overlaps keep their order
+    expected = Image.new('RGBA', image.size, WHITE)
+    for index, path in enumerate(paths):
+        with Image.open(os.path.join(str(tmp_path), path)) as button_image:
+            expected.alpha_composite(button_image.convert('RGBA'), dest=(max(index * 6 - 5, 0), 0),
+                                     source=(max(5 - index * 6, 0), 0))
+    assert image.tobytes() == expected.tobytes()
+
+    clear_image = ConfigRenderer(base_dir=str(tmp_path), background_colour=(0, 0, 0, 0)).render(config)
+    assert clear_image.getpixel((0, 0)) == (255, 0, 0, 128)
+    assert clear_image.getpixel((12, 0)) == BLUE
+
+
+def test_render_text_and_input_box(tmp_path):
+    write_image(tmp_path, 'background.png', (200, 100), BLUE)
+    config = {
+        'background': 'background.png',
+        'Text': [{'label': None, 'text': 'Hello', 'x': 10, 'y': 10}],
+        'Input Box': [{'label': None, 'x': 100, 'y': 50}],
+    }
+
+    image = render_config(config, base_dir=str(tmp_path))
+
+    text_pixels = image.crop((10, 10, 60, 30)).getcolors(maxcolors=10000)
+    assert any(colour != BLUE for _, colour in text_pixels)
+    assert image.getpixel((110, 60)) == WHITE
+
+
+def test_render_drawer_without_background(tmp_path):
+    write_image(tmp_path, 'red.png', (10, 10), RED)
+    drawer = ConfigDrawer('fake_canvas')
+    drawer.add_image_button(pos_x=30, pos_y=20, orig_on_release=True, images=['red.png'], draw=False)
+
+    renderer = ConfigRenderer(base_dir=str(tmp_path))
+    image = renderer.render(drawer)
+
+    assert image.size == (35, 25)
+    assert image.getpixel((34, 24)) == RED
+
+    # Rendering the same layout again reuses the decoded images
+    os.remove(os.path.join(str(tmp_path), 'red.png'))
+    assert renderer.render(drawer).getpixel((25, 15)) == RED
+
+
+def test_image_cache_stays_within_budget(tmp_path):
+    for name in ('red.png', 'blue.png', 'white.png'):
+        write_image(tmp_path, name, (10, 10), RED)
+    # Opaque images are kept as RGB, 300 bytes each
+    renderer = ConfigRenderer(base_dir=str(tmp_path), max_image_bytes=650)
+
+    renderer.load_image('red.png')
+    renderer.load_image('blue.png')
+    renderer.load_image('red.png')
+    assert renderer.image_bytes == 600
+
+    # Least recently used goes first
+    renderer.load_image('white.png')
+    assert renderer.image_bytes == 600
+    os.remove(os.path.join(str(tmp_path), 'red.png'))
+    renderer.load_image('red.png')
+
+    renderer.clear()
+    assert renderer.image_bytes == 0
+
@@ -0,0 +1,63 @@
+import pytest
+
+from tkimgloader.spatial_index import SpatialIndex, bounds_intersect, normalise_bounds
+
+
+@pytest.fixture
+def index():
+    spatial_index = SpatialIndex(cell_size=10)
+    spatial_index.insert('a', (0, 0, 5, 5))
+    spatial_index.insert('b', (4, 4, 25, 12))
+    spatial_index.insert('c', (100, 100, 110, 110))
+    return spatial_index
+
+
+def test_normalise_empty_bounds():
+    assert normalise_bounds((3, 4, 3, 4)) == (3, 4, 4, 5)
+    assert normalise_bounds((3, 4, 8, 9)) == (3, 4, 8, 9)
+
+
+def test_bounds_intersect_half_open():
+    assert bounds_intersect((0, 0, 5, 5), (4, 4, 6, 6))
+    assert not bounds_intersect((0, 0, 5, 5), (5, 0, 6, 5))
+
+
+def test_query_point(index):
+    assert index.query_point(1, 1) == ['a']
+    assert sorted(index.query_point(4, 4)) == ['a', 'b']
+    assert index.query_point(24, 11) == ['b']
+    assert index.query_point(25, 11) == []
+    assert index.query_point(-50, -50) == []
+
+
+def test_query_rect(index):
+    assert sorted(index.query_rect((0, 0, 30, 30))) == ['a', 'b']
+    assert sorted(index.query_rect((-1000, -1000, 1000, 1000))) == ['a', 'b', 'c']
+    assert index.query_rect((50, 50, 60, 60)) == []
+
+
+def test_update_and_remove(index):
+    index.update('a', (200, 200, 205, 205))
+    assert index.query_point(1, 1) == []
+    assert index.query_point(201, 201) == ['a']
+    assert index.bounds('a') == (200, 200, 205, 205)
+
+    index.remove('a')
+    index.remove('a')
+    assert 'a' not in index
+    assert len(index) == 2
+    assert index.query_point(201, 201) == []
+
+
+def test_nearest(index):
+    assert index.nearest(2, 2) == ['a']
+    assert index.nearest(90, 90) == ['c']
+    assert index.nearest(60, 0, count=2) == ['b', 'a']
+    assert index.nearest(0, 0, count=10) == ['a', 'b', 'c']
+    assert SpatialIndex().nearest(0, 0) == []
+
+
+def test_overlaps(index):
+    assert index.overlaps() == [('a', 'b')] or index.overlaps() == [('b', 'a')]
+    index.update('b', (50, 50, 60, 60))
+    assert index.overlaps() == []
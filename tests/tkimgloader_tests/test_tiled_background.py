@@ -0,0 +1,84 @@
+import os
+
+import pytest
+from PIL import Image
+
+from tkimgloader.imgloader import ConfigDrawer
+from tkimgloader.tiled_background import TILE_INDEX_FILE, TiledBackground, load_tile_index
+
+from tests.tkimgloader_tests.fakes import FakeCanvas
+
+
+@pytest.fixture
+def background_path(tmp_path):
+    path = str(tmp_path / 'background.png')
+    image = Image.new('RGB', (250, 130), (10, 20, 30))
+    image.putpixel((249, 129), (255, 0, 0))
+    image.save(path)
+    return path
+
+
+def test_split_tiles_once(background_path, tmp_path):
+    cache_dir = str(tmp_path / 'tiles')
+    tile_dir, index = load_tile_index(background_path, cache_dir=cache_dir, tile_size=100)
+
+    assert index == {'width': 250, 'height': 130, 'tile_size': 100}
+    assert sorted(os.listdir(tile_dir)) == sorted(
+        [F'{col}_{row}.png' for col in range(3) for row in range(2)] + [TILE_INDEX_FILE])
+    with Image.open(os.path.join(tile_dir, '2_1.png')) as tile:
+        assert tile.size == (50, 30)
+        assert tile.getpixel((49, 29)) == (255, 0, 0)
+
+    # Already split, nothing is written again
+    mtime = os.stat(os.path.join(tile_dir, '0_0.png')).st_mtime_ns
+    assert load_tile_index(background_path, cache_dir=cache_dir, tile_size=100) == (tile_dir, index)
+    assert os.stat(os.path.join(tile_dir, '0_0.png')).st_mtime_ns == mtime
+
+
+def test_split_background_over_pixel_limit(monkeypatch, background_path, tmp_path):
+    # Stands in for a 16384x16384 background, well past the limit PIL allows by default
+    monkeypatch.setattr(Image, 'MAX_IMAGE_PIXELS', 1000)
+    with pytest.raises(Image.DecompressionBombError):
+        Image.open(background_path)
+
+    tile_dir, index = load_tile_index(background_path, cache_dir=str(tmp_path / 'tiles'), tile_size=100)
+    assert index == {'width': 250, 'height': 130, 'tile_size': 100}
+    assert len(os.listdir(tile_dir)) == 7
+    assert Image.MAX_IMAGE_PIXELS == 1000
+
+
+def test_show_only_visible_tiles(fake_cache, background_path, tmp_path):
+    canvas = FakeCanvas()
+    tiles = TiledBackground(canvas, background_path, tile_size=100, cache_dir=str(tmp_path / 'tiles'),
+                            keep_tiles=0)
+    assert tiles.size == (250, 130)
+    assert not tiles
+
+    tiles.show((0, 0, 100, 100))
+    assert tiles.loaded_tiles == [(0, 0)]
+    assert list(canvas.items.values()) == [(0, 0)]
+
+    tiles.show((150, 50, 260, 140))
+    assert tiles.loaded_tiles == [(1, 0), (1, 1), (2, 0), (2, 1)]
+    assert len(canvas.items) == 4
+
+    tiles.destroy()
+    assert not canvas.items
+    assert fake_cache.stats['entries'] == 5
+
+
+def test_drawer_tiled_background(fake_cache, background_path, tmp_path):
+    canvas = FakeCanvas(width=100, height=100)
+    drawer = ConfigDrawer(canvas, viewport=True, viewport_margin=0, tiled_background=True,
+                          tile_cache_dir=str(tmp_path / 'tiles'))
+    drawer.load_background(background_path)
+
+    # Full size is reported even though only the tiles are loaded
+    assert drawer.dimensions == (250, 130)
+    assert len(drawer.background_tiles) == 1
+    assert 'background' not in drawer.images
+
+
+def test_drawer_tiled_background_needs_viewport():
+    with pytest.raises(ValueError):
+        ConfigDrawer(FakeCanvas(), tiled_background=True)
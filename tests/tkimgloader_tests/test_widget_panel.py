@@ -0,0 +1,145 @@
+import pytest
+
+from tkimgloader.scripts import widget_panel
+from tkimgloader.scripts.widget_panel import ROW_HEIGHT, WidgetPanel
+from tkimgloader.widgets import CanvasText
+
+
+class FakeTkWidget():
+    def __init__(self, *args, height=0, **kwargs):
+        self.height = height
+        self.scroll_y = 0
+        self.windows = {}
+        self.idle_jobs = []
+
+    def grid(self, **kwargs):
+        pass
+
+    def grid_columnconfigure(self, *args, **kwargs):
+        pass
+
+    def config(self, **kwargs):
+        pass
+
+    def set(self, *args):
+        pass
+
+    def bind(self, *args):
+        pass
+
+    def winfo_height(self):  # pylint: disable=no-self-use
+        return 1
+
+    def cget(self, option):
+        return str(getattr(self, option))
+
+    def canvasy(self, screen_y):
+        return float(self.scroll_y + screen_y)
+
+    def create_window(self, pos_x, pos_y, *, window, anchor):
+        window_id = len(self.windows) + 1
+        self.windows[window_id] = {'pos': (pos_x, pos_y), 'state': 'normal'}
+        return window_id
+
+    def coords(self, window_id, pos_x, pos_y):
+        self.windows[window_id]['pos'] = (pos_x, pos_y)
+
+    def itemconfigure(self, window_id, *, state):
+        self.windows[window_id]['state'] = state
+
+    def after_idle(self, func):
+        self.idle_jobs.append(func)
+        return 'job_id'
+
+    def after_cancel(self, job_id):
+        self.idle_jobs.clear()
+
+
+class FakeRow():
+    created = 0
+
+    def __init__(self, panel, parent):
+        FakeRow.created += 1
+        self.widget = None
+        self.window = None
+        self.frame = None
+        self.bound = []
+
+    def bind(self, widget):
+        self.widget = widget
+        self.bound.append(str(widget))
+
+
+class FakeEditor():
+    def __init__(self):
+        self.commands = []
+
+    def remove_widget(self, *, widget):
+        self.commands.append(('remove', widget))
+
+
+@pytest.fixture
+def panel(monkeypatch):
+    for name in ('Frame', 'Canvas', 'Scrollbar'):
+        monkeypatch.setattr(widget_panel.tk, name, FakeTkWidget)
+    monkeypatch.setattr(widget_panel, '_Row', FakeRow)
+    FakeRow.created = 0
+    return WidgetPanel('fake_root', FakeEditor(), height=ROW_HEIGHT * 10)
+
+
+def make_widgets(count):
+    return [CanvasText(label=F'text{index}', text=F'Text {index}', pos_x=index, pos_y=index)
+            for index in range(count)]
+
+
+def shown_widgets(panel):
+    return {index: row.widget.label for index, row in panel._rows.items()}
+
+
+def test_only_visible_rows_realised(panel):
+    panel.set_widgets(make_widgets(500))
+
+    assert len(panel) == 500
+    assert panel.realised_rows == 11
+    assert shown_widgets(panel)[0] == 'text0'
+
+    # Scrolling reuses the rows, nothing new is created
+    panel.canvas.scroll_y = 300 * ROW_HEIGHT
+    panel.schedule_update()
+    panel.schedule_update()
+    assert len(panel.canvas.idle_jobs) == 1
+    panel.canvas.idle_jobs.pop()()
+
+    assert panel.realised_rows == 11
+    assert FakeRow.created == 11
+    assert shown_widgets(panel)[300] == 'text300'
+    hidden = [window for window in panel.canvas.windows.values() if window['state'] == 'hidden']
+    assert not hidden
+
+
+def test_add_remove_touch_only_affected_rows(panel):
+    widgets = make_widgets(5)
+    panel.set_widgets(widgets[:4])
+    assert FakeRow.created == 4
+    first_row = panel._rows[0]
+
+    panel.add_widget(widgets[4])
+    assert shown_widgets(panel) == {0: 'text0', 1: 'text1', 2: 'text2', 3: 'text3', 4: 'text4'}
+    assert first_row.bound == ['Text 0 (Text) [text0][0,0]']
+
+    panel.remove_widget(widgets[2])
+    assert shown_widgets(panel) == {0: 'text0', 1: 'text1', 2: 'text3', 3: 'text4'}
+    assert first_row.bound == ['Text 0 (Text) [text0][0,0]']
+    assert FakeRow.created == 5
+
+    widgets[0].label = 'renamed'
+    panel.refresh_widget(widgets[0])
+    assert first_row.bound[-1] == 'Text 0 (Text) [renamed][0,0]'
+
+
+def test_run_command_passes_row_widget(panel):
+    widgets = make_widgets(1)
+    panel.set_widgets(widgets)
+
+    panel.run_command(panel._rows[0], panel.editor.remove_widget)
+    assert panel.editor.commands == [('remove', widgets[0])]
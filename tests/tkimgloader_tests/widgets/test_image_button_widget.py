@@ -7,6 +7,8 @@ from tkimgloader.widgets import (
     ButtonType, CanvasImageButton, WidgetType
 )
 
+from tests.tkimgloader_tests.fakes import FakeCanvas
+
 
 def test_create_widget():
     widget = CanvasImageButton(
@@ -179,3 +181,74 @@ def test_set_callback():
     assert not widget.release_callback
     widget.add_image_callback(button_release_func=callback_func)
     assert widget.release_callback == callback_func
+
+
+def test_draw_eager_loads_all_images(fake_cache):
+    widget = CanvasImageButton(
+        button_type=ButtonType.SWITCH, pos_x=200, pos_y=300,
+        image_list=['path1', 'path2', 'path3', 'path4', 'path5'])
+    widget.canvas = FakeCanvas()
+
+    widget.draw()
+    assert sorted(widget.images) == ['path1', 'path2', 'path3', 'path4', 'path5']
+
+
+def test_draw_lazy_prefetches_neighbours(fake_cache):
+    widget = CanvasImageButton(
+        button_type=ButtonType.SWITCH, pos_x=200, pos_y=300,
+        image_list=['path1', 'path2', 'path3', 'path4', 'path5'], current_image=1, lazy=True)
+    canvas = FakeCanvas()
+    widget.canvas = canvas
+
+    widget.draw()
+    assert list(widget.images) == ['path1']
+    assert canvas.shown_images == ['path1']
+
+    canvas.run_idle_jobs()
+    assert sorted(widget.images) == ['path1', 'path2', 'path5']
+
+    # Switching is served from the prefetched image and moves the window along
+    misses = fake_cache.stats['misses']
+    widget.next_image()
+    assert canvas.shown_images == ['path1', 'path2']
+    assert fake_cache.stats['misses'] == misses
+
+    canvas.run_idle_jobs()
+    assert sorted(widget.images) == ['path1', 'path2', 'path3']
+
+    # Released states stay in the cache until memory is needed
+    assert 'path5' in fake_cache
+
+
+def test_destroy_releases_images(fake_cache):
+    widget = CanvasImageButton(
+        button_type=ButtonType.SWITCH, pos_x=200, pos_y=300,
+        image_list=['path1', 'path2'], lazy=True)
+    widget.canvas = FakeCanvas()
+    widget.draw()
+
+    fake_cache.max_bytes = 0
+    assert 'path1' in fake_cache
+
+    widget.destroy()
+    assert not widget.images
+    assert 'path1' not in fake_cache
+
+
+def test_image_switch_deferred_by_redraw_callback(fake_cache):
+    widget = CanvasImageButton(
+        button_type=ButtonType.SWITCH, pos_x=200, pos_y=300,
+        image_list=['path1', 'path2', 'path3'])
+    canvas = FakeCanvas()
+    widget.canvas = canvas
+    widget.draw()
+
+    requests = []
+    widget.redraw_callback = lambda *, widget, part: requests.append(part)
+    widget.next_image()
+    widget.next_image()
+    assert requests == ['image', 'image']
+    assert canvas.shown_images == ['path1']
+
+    widget.apply_redraw('image')
+    assert canvas.shown_images == ['path1', 'path3']
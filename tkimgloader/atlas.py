@@ -0,0 +1,102 @@
+import json
+import logging
+import os
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+DEFAULT_MAX_ATLAS_SIZE = 2048
+ATLAS_PADDING = 1
+ATLAS_INDEX_SUFFIX = '.atlas.json'
+
+
+def collect_button_images(config):
+    path_list = []
+    for button_dic in config.get('Button', []):
+        path_list.extend(button_dic['images'].values())
+    return list(dict.fromkeys(path_list))
+
+
+def _shelf_pack(sizes, max_size):
+    # Place the tallest images first, left to right in shelves, a new atlas once a shelf does not fit
+    placements = {}
+    atlas_sizes = []
+    atlas_no = -1
+    shelf_x = shelf_y = shelf_height = atlas_width = atlas_height = 0
+
+    for path in sorted(sizes, key=lambda path: (-sizes[path][1], path)):
+        width, height = sizes[path]
+        if shelf_x and shelf_x + width > max_size:
+            shelf_x, shelf_y, shelf_height = 0, shelf_y + shelf_height + ATLAS_PADDING, 0
+        if atlas_no < 0 or shelf_y + height > max(max_size, height):
+            if atlas_no >= 0:
+                atlas_sizes.append((atlas_width, atlas_height))
+            atlas_no += 1
+            shelf_x = shelf_y = shelf_height = atlas_width = atlas_height = 0
+
+        placements[path] = (atlas_no, shelf_x, shelf_y, width, height)
+        shelf_x += width + ATLAS_PADDING
+        shelf_height = max(shelf_height, height)
+        atlas_width = max(atlas_width, shelf_x - ATLAS_PADDING)
+        atlas_height = max(atlas_height, shelf_y + height)
+
+    if atlas_no >= 0:
+        atlas_sizes.append((atlas_width, atlas_height))
+
+    return placements, atlas_sizes
+
+
+def pack_atlas(image_paths, output_dir, *, name='atlas', base_dir='.', max_size=DEFAULT_MAX_ATLAS_SIZE):
+    images = {}
+    for path in image_paths:
+        with Image.open(os.path.join(base_dir, path)) as image:
+            images[path] = image.convert('RGBA')
+
+    placements, atlas_sizes = _shelf_pack({path: image.size for path, image in images.items()}, max_size)
+
+    atlases = [Image.new('RGBA', size, (0, 0, 0, 0)) for size in atlas_sizes]
+    for path, (atlas_no, pos_x, pos_y, _, _) in placements.items():
+        atlases[atlas_no].paste(images[path], (pos_x, pos_y))
+
+    os.makedirs(output_dir, exist_ok=True)
+    atlas_files = []
+    for atlas_no, atlas in enumerate(atlases):
+        atlas_file = F'{name}_{atlas_no}.png'
+        atlas.save(os.path.join(output_dir, atlas_file))
+        atlas_files.append(atlas_file)
+
+    index = {'atlases': atlas_files, 'images': {path: list(placement) for path, placement in placements.items()}}
+    index_path = os.path.join(output_dir, name + ATLAS_INDEX_SUFFIX)
+    with open(index_path, 'w') as file_ptr:
+        json.dump(index, file_ptr, indent=4)
+
+    logger.debug(F'Packed {len(images)} images into {len(atlases)} atlases, index "{index_path}"')
+    return index_path
+
+
+def pack_config_atlas(config, output_dir, *, name='atlas', base_dir='.', max_size=DEFAULT_MAX_ATLAS_SIZE):
+    return pack_atlas(collect_button_images(config), output_dir, name=name, base_dir=base_dir, max_size=max_size)
+
+
+def load_atlas_images(index_path, *, disk_cache=None):
+    with open(index_path) as file_ptr:
+        index = json.load(file_ptr)
+
+    # Every atlas is decoded once, the images are then cut out of it in memory
+    atlas_dir = os.path.dirname(index_path)
+    atlases = []
+    for atlas_file in index['atlases']:
+        atlas_path = os.path.join(atlas_dir, atlas_file)
+        if disk_cache:
+            atlases.append(disk_cache.load(atlas_path))
+            continue
+        with Image.open(atlas_path) as atlas:
+            atlas.load()
+            atlases.append(atlas)
+
+    images = {}
+    for path, (atlas_no, pos_x, pos_y, width, height) in index['images'].items():
+        images[path] = atlases[atlas_no].crop((pos_x, pos_y, pos_x + width, pos_y + height))
+
+    return images
@@ -0,0 +1,119 @@
+import collections
+import logging
+import os
+import types
+
+from tkimgloader.config_io import load_config
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+DEFAULT_MAX_ENTRIES = 64
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_WIDGET_KEYS = {
+    'Text': ('label', 'text', 'x', 'y'),
+    'Button': ('label', 'x', 'y', 'orig_image_on_release', 'current_image', 'images'),
+    'Input Box': ('label', 'x', 'y'),
+}
+
+
+def validate_config(config):
+    if not isinstance(config, dict):
+        raise ValueError('Config must be a dictionary')
+
+    background = config.get('background')
+    if background is not None and not isinstance(background, str):
+        raise ValueError(F'Invalid background "{background}"')
+
+    for widget_type, required_keys in _WIDGET_KEYS.items():
+        widget_list = config.get(widget_type, [])
+        if not isinstance(widget_list, list):
+            raise ValueError(F'"{widget_type}" must be a list')
+
+        for widget_dict in widget_list:
+            missing_keys = [key for key in required_keys if key not in widget_dict]
+            if missing_keys:
+                raise ValueError(F'"{widget_type}" entry {widget_dict} is missing {missing_keys}')
+
+            if widget_type == 'Button':
+                if not widget_dict['images']:
+                    raise ValueError(F'Button entry {widget_dict} has no images')
+                if not 1 <= widget_dict['current_image'] <= len(widget_dict['images']):
+                    raise ValueError(F'Button entry {widget_dict} has an invalid current image')
+
+
+def freeze_config(value):
+    if isinstance(value, dict):
+        return types.MappingProxyType({key: freeze_config(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze_config(item) for item in value)
+    return value
+
+
+class ConfigCache():
+    def __init__(self, *, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = collections.OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self._entries),
+            'bytes': self.total_bytes,
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def load(self, file_path):
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        identity = (stat.st_mtime_ns, stat.st_size)
+
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == identity:
+            self.hits += 1
+            self._entries.move_to_end(path)
+            return entry[1]
+
+        self.misses += 1
+        self.invalidate(path)
+
+        config = load_config(path)
+        validate_config(config)
+        config = freeze_config(config)
+
+        self._entries[path] = (identity, config)
+        self.total_bytes += stat.st_size
+        self._evict()
+
+        return config
+
+    def invalidate(self, file_path=None):
+        if file_path is None:
+            self._entries.clear()
+            self.total_bytes = 0
+            return
+
+        entry = self._entries.pop(os.path.abspath(file_path), None)
+        if entry is not None:
+            self.total_bytes -= entry[0][1]
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            path, entry = self._entries.popitem(last=False)
+            self.total_bytes -= entry[0][1]
+            logger.debug(F'Evicting config "{path}" from cache')
+
+
+_SHARED_CACHE = ConfigCache()
+
+
+def get_config_cache():
+    return _SHARED_CACHE
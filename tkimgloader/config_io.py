@@ -0,0 +1,281 @@
+import json
+import logging
+import os
+import shutil
+import struct
+import threading
+import uuid
+
+from tkimgloader.metrics import timed
+
+BINARY_MAGIC = b'TKIMGCFG'
+BINARY_VERSION = 1
+
+_HEADER = struct.Struct('<8sB')
+_COUNT = struct.Struct('<I')
+_INDEX = struct.Struct('<i')
+_TEXT_RECORD = struct.Struct('<iiii')
+_BUTTON_RECORD = struct.Struct('<iiiBII')
+_INPUT_BOX_RECORD = struct.Struct('<iiii')
+
+_NO_VALUE = -1
+_FLAG_ORIG_ON_RELEASE = 0x01
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+
+@timed('load_json')
+def load_json(file_path):
+    with open(file_path) as file_ptr:
+        return json.load(file_ptr)
+
+
+def dump_json(file_path, config):
+    _atomic_write(file_path, json.dumps(config, indent=4).encode('utf-8'))
+
+
+def _atomic_write(file_path, data):
+    # Write next to the target and rename over it so a crash never leaves a half written file
+    temp_path = F'{file_path}.{uuid.uuid4().hex}.tmp'
+    file_descriptor = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        with os.fdopen(file_descriptor, 'wb') as file_ptr:
+            file_ptr.write(data)
+            file_ptr.flush()
+            os.fsync(file_ptr.fileno())
+        if os.path.exists(file_path):
+            shutil.copymode(file_path, temp_path)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def is_binary_config(file_path):
+    try:
+        with open(file_path, 'rb') as file_ptr:
+            return file_ptr.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+    except OSError:
+        return False
+
+
+@timed('load_binary')
+def load_binary(file_path):
+    with open(file_path, 'rb') as file_ptr:
+        return decode_binary_config(file_ptr.read())
+
+
+def dump_binary(file_path, config):
+    _atomic_write(file_path, encode_binary_config(config))
+
+
+def load_config(file_path):
+    if is_binary_config(file_path):
+        return load_binary(file_path)
+    return load_json(file_path)
+
+
+def convert_config_file(source_path, dest_path, *, binary=None):
+    # Without an explicit target format convert to the other one
+    if binary is None:
+        binary = not is_binary_config(source_path)
+
+    dump_config(dest_path, load_config(source_path), binary=binary)
+
+
+def dump_config(file_path, config, *, binary):
+    if binary:
+        dump_binary(file_path, config)
+    else:
+        dump_json(file_path, config)
+
+
+class BackgroundConfigWriter():
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._pending = {}
+        self._writing = False
+        self._thread = None
+
+    def submit(self, file_path, config, *, binary, callback=None):
+        with self._condition:
+            # A save still waiting for the same file is replaced, only the latest config gets written
+            callbacks = []
+            if file_path in self._pending:
+                logger.debug(F'Coalescing pending save of "{file_path}"')
+                callbacks = self._pending.pop(file_path)[2]
+            if callback:
+                callbacks.append(callback)
+            self._pending[file_path] = (config, binary, callbacks)
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='ConfigWriter', daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def wait(self, timeout=None):
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._writing, timeout=timeout)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending)
+                file_path = next(iter(self._pending))
+                config, binary, callbacks = self._pending.pop(file_path)
+                self._writing = True
+
+            error = None
+            try:
+                dump_config(file_path, config, binary=binary)
+            except Exception as write_error:  # pylint: disable=broad-except
+                logger.error(F'Failed to save config "{file_path}": {write_error}')
+                error = write_error
+
+            # Callbacks run on this writer thread, anything touching Tk has to hand over to the Tk thread
+            for callback in callbacks:
+                callback(file_path=file_path, error=error)
+
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+_BACKGROUND_WRITER = BackgroundConfigWriter()
+
+
+def get_background_writer():
+    return _BACKGROUND_WRITER
+
+
+class _StringTable():
+    def __init__(self):
+        self.strings = []
+        self._indexes = {}
+
+    def index(self, string):
+        if string is None:
+            return _NO_VALUE
+
+        index = self._indexes.get(string)
+        if index is None:
+            index = len(self.strings)
+            self.strings.append(string)
+            self._indexes[string] = index
+        return index
+
+
+def _int_value(value):
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(F'Binary configs only support integer values, got "{value}"')
+    return value
+
+
+def encode_binary_config(config):
+    strings = _StringTable()
+    sections = []
+
+    sections.append(_INDEX.pack(strings.index(config.get('background'))))
+
+    text_list = config.get('Text', [])
+    sections.append(_COUNT.pack(len(text_list)))
+    for text_item in text_list:
+        sections.append(_TEXT_RECORD.pack(
+            strings.index(text_item['label']), strings.index(text_item['text']),
+            _int_value(text_item['x']), _int_value(text_item['y'])))
+
+    button_list = config.get('Button', [])
+    sections.append(_COUNT.pack(len(button_list)))
+    for button_dic in button_list:
+        flags = _FLAG_ORIG_ON_RELEASE if button_dic['orig_image_on_release'] else 0
+        images = list(button_dic['images'].values())
+        sections.append(_BUTTON_RECORD.pack(
+            strings.index(button_dic['label']), _int_value(button_dic['x']), _int_value(button_dic['y']),
+            flags, _int_value(button_dic['current_image']), len(images)))
+        sections.append(struct.pack(F'<{len(images)}i', *[strings.index(path) for path in images]))
+
+    input_box_list = config.get('Input Box', [])
+    sections.append(_COUNT.pack(len(input_box_list)))
+    for input_box in input_box_list:
+        width = input_box.get('width')
+        sections.append(_INPUT_BOX_RECORD.pack(
+            strings.index(input_box['label']), _int_value(input_box['x']), _int_value(input_box['y']),
+            _NO_VALUE if width is None else _int_value(width)))
+
+    # The string table goes first so the loader can resolve indexes while reading
+    encoded_strings = [string.encode('utf-8') for string in strings.strings]
+    header = [
+        _HEADER.pack(BINARY_MAGIC, BINARY_VERSION),
+        _COUNT.pack(len(encoded_strings)),
+        struct.pack(F'<{len(encoded_strings)}I', *[len(string) for string in encoded_strings]),
+    ]
+
+    return b''.join(header + encoded_strings + sections)
+
+
+def decode_binary_config(data):  # pylint: disable=too-many-locals
+    magic, version = _HEADER.unpack_from(data, 0)
+    if magic != BINARY_MAGIC:
+        raise ValueError('Not a binary config')
+    if version != BINARY_VERSION:
+        raise ValueError(F'Unsupported binary config version "{version}"')
+    offset = _HEADER.size
+    view = memoryview(data)
+
+    # String table
+    string_count, = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    string_lengths = struct.unpack_from(F'<{string_count}I', data, offset)
+    offset += 4 * string_count
+
+    strings = []
+    for length in string_lengths:
+        strings.append(data[offset:offset + length].decode('utf-8'))
+        offset += length
+
+    def string_at(index):
+        return None if index == _NO_VALUE else strings[index]
+
+    config = {}
+
+    background, = _INDEX.unpack_from(data, offset)
+    offset += _INDEX.size
+    config['background'] = string_at(background)
+
+    count, = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    if count:
+        config['Text'] = [
+            {'label': string_at(label), 'text': string_at(text), 'x': pos_x, 'y': pos_y}
+            for label, text, pos_x, pos_y in _TEXT_RECORD.iter_unpack(
+                view[offset:offset + count * _TEXT_RECORD.size])]
+        offset += count * _TEXT_RECORD.size
+
+    count, = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    if count:
+        config['Button'] = []
+        for _ in range(count):
+            label, pos_x, pos_y, flags, current_image, image_count = _BUTTON_RECORD.unpack_from(data, offset)
+            offset += _BUTTON_RECORD.size
+            images = struct.unpack_from(F'<{image_count}i', data, offset)
+            offset += 4 * image_count
+
+            config['Button'].append({
+                'label': string_at(label), 'x': pos_x, 'y': pos_y,
+                'orig_image_on_release': bool(flags & _FLAG_ORIG_ON_RELEASE),
+                'current_image': current_image,
+                'images': {index: strings[image] for index, image in enumerate(images, start=1)}})
+
+    count, = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    if count:
+        config['Input Box'] = []
+        for label, pos_x, pos_y, width in _INPUT_BOX_RECORD.iter_unpack(
+                view[offset:offset + count * _INPUT_BOX_RECORD.size]):
+            input_box = {'label': string_at(label), 'x': pos_x, 'y': pos_y}
+            if width != _NO_VALUE:
+                input_box['width'] = width
+            config['Input Box'].append(input_box)
+
+    return config
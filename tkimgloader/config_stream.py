@@ -0,0 +1,116 @@
+import json
+
+from tkimgloader.config_io import is_binary_config, load_binary
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+
+class _StreamReader():
+    def __init__(self, file_ptr, chunk_size):
+        self.file_ptr = file_ptr
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        if self.eof:
+            return False
+
+        data = self.file_ptr.read(self.chunk_size)
+        if not data:
+            self.eof = True
+            return False
+
+        # Drop what has been consumed so the buffer stays bounded
+        self.buffer = self.buffer[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def next_char(self):
+        char = self.peek()
+        if not char:
+            raise ValueError('Unexpected end of config file')
+        self.pos += 1
+        return char
+
+    def expect(self, expected):
+        char = self.next_char()
+        if char != expected:
+            raise ValueError(F'Expected "{expected}" but found "{char}" in config file')
+
+    def decode_value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+
+            # A number at the end of the buffer might continue in the next chunk
+            if end == len(self.buffer) and self._fill():
+                continue
+
+            self.pos = end
+            return value
+
+
+def iter_config_items(file_path, *, chunk_size=DEFAULT_CHUNK_SIZE):
+    # Top level arrays are yielded element by element as (key, element), everything else as (key, value)
+    if is_binary_config(file_path):
+        # Binary configs are compact enough to decode in one go
+        for key, value in load_binary(file_path).items():
+            if isinstance(value, list):
+                for element in value:
+                    yield key, element
+            else:
+                yield key, value
+        return
+
+    with open(file_path) as file_ptr:
+        reader = _StreamReader(file_ptr, chunk_size)
+
+        reader.expect('{')
+        if reader.peek() == '}':
+            return
+
+        while True:
+            key = reader.decode_value()
+            if not isinstance(key, str):
+                raise ValueError(F'Invalid config key "{key}"')
+            reader.expect(':')
+
+            if reader.peek() == '[':
+                reader.expect('[')
+                if reader.peek() == ']':
+                    reader.expect(']')
+                else:
+                    while True:
+                        yield key, reader.decode_value()
+                        separator = reader.next_char()
+                        if separator == ']':
+                            break
+                        if separator != ',':
+                            raise ValueError(F'Expected "," or "]" but found "{separator}" in config file')
+            else:
+                yield key, reader.decode_value()
+
+            separator = reader.next_char()
+            if separator == '}':
+                break
+            if separator != ',':
+                raise ValueError(F'Expected "," or "}}" but found "{separator}" in config file')
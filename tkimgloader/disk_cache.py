@@ -0,0 +1,165 @@
+import collections
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+import uuid
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+ENTRY_SUFFIX = '.raw'
+MAX_HASHES = 16384
+
+_MAGIC = b'TKIMGRAW'
+_HEADER = struct.Struct('<8s8sII')
+_STORED_MODES = ('RGB', 'RGBA', 'L')
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as file_ptr:
+        for chunk in iter(lambda: file_ptr.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DiskImageCache():
+    def __init__(self, cache_dir, *, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._hashes = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.total_bytes = sum(size for _, size, _ in self._scan_entries())
+
+    @property
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+        }
+
+    def __getstate__(self):
+        # Process pool workers get their own copy, the lock cannot go with it
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def load(self, path):
+        entry_path = os.path.join(self.cache_dir, self._content_hash(path) + ENTRY_SUFFIX)
+
+        image = self._read_entry(entry_path)
+        if image is not None:
+            try:
+                # Keep recently used entries from being evicted
+                os.utime(entry_path)
+            except FileNotFoundError:
+                # Evicted by another process since it was read, store it again
+                image = None
+            else:
+                with self._lock:
+                    self.hits += 1
+                return image
+
+        with self._lock:
+            self.misses += 1
+        with Image.open(path) as image:
+            image.load()
+            if image.mode not in _STORED_MODES:
+                image = image.convert('RGBA')
+            self._write_entry(entry_path, image)
+            return image
+
+    def _content_hash(self, path):
+        # A changed source gets a new hash, so its old entry is never used again and ages out
+        stat = os.stat(path)
+        identity = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            content_hash = self._hashes.get(identity)
+            if content_hash is not None:
+                self._hashes.move_to_end(identity)
+                return content_hash
+
+        content_hash = hash_file(path)
+        with self._lock:
+            self._hashes[identity] = content_hash
+            if len(self._hashes) > MAX_HASHES:
+                self._hashes.popitem(last=False)
+        return content_hash
+
+    @staticmethod
+    def _read_entry(entry_path):
+        try:
+            with open(entry_path, 'rb') as file_ptr:
+                mapped = mmap.mmap(file_ptr.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            magic, mode, width, height = _HEADER.unpack_from(mapped, 0)
+            mode = mode.rstrip(b'\0').decode('ascii')
+            if magic != _MAGIC or mode not in _STORED_MODES:
+                raise ValueError('Invalid cache entry')
+            return Image.frombuffer(mode, (width, height), memoryview(mapped)[_HEADER.size:], 'raw', mode, 0, 1)
+        except (struct.error, ValueError) as error:
+            logger.warning(F'Ignoring invalid image cache entry "{entry_path}": {error}')
+            return None
+
+    def _write_entry(self, entry_path, image):
+        data = image.tobytes()
+        temp_path = F'{entry_path}.{uuid.uuid4().hex}.tmp'
+        try:
+            with open(temp_path, 'wb') as file_ptr:
+                file_ptr.write(_HEADER.pack(_MAGIC, image.mode.encode('ascii'), image.width, image.height))
+                file_ptr.write(data)
+            os.replace(temp_path, entry_path)
+        except OSError as error:
+            logger.warning(F'Failed to write image cache entry "{entry_path}": {error}')
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+
+        with self._lock:
+            self.total_bytes += _HEADER.size + len(data)
+        self._evict()
+
+    def _scan_entries(self):
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(ENTRY_SUFFIX):
+                stat = entry.stat()
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self):
+        if self.total_bytes <= self.max_bytes:
+            return
+
+        # Other processes may share the directory, so work from what is actually there
+        entries = self._scan_entries()
+        self.total_bytes = sum(size for _, size, _ in entries)
+
+        for entry_path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            if self.total_bytes <= self.max_bytes:
+                break
+            logger.debug(F'Evicting image cache entry "{entry_path}"')
+            try:
+                os.remove(entry_path)
+            except OSError:
+                continue
+            self.total_bytes -= size
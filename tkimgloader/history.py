@@ -0,0 +1,137 @@
+import collections
+import logging
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+DEFAULT_MAX_ENTRIES = 1000
+
+
+class UndoHistory():
+    # Entries are small tuples referencing the widgets, never copies of the config:
+    #   ('move', widget, move_x, move_y)       ('moves', ((widget, move_x, move_y), ...))
+    #   ('add', widgets, draw)                 ('remove', widget, draw)
+    #   ('label', widget, old, new)            ('width', widget, old, new)
+    #   ('current_image', widget, old, new)    ('images', widget, old_paths, new_paths)
+    #   ('group', entries)
+    def __init__(self, drawer, *, max_entries=DEFAULT_MAX_ENTRIES):
+        self.drawer = drawer
+        self._undo_entries = collections.deque(maxlen=max_entries)
+        self._redo_entries = collections.deque(maxlen=max_entries)
+        self._group = []
+        self._group_depth = 0
+        self._applying = False
+
+    def __len__(self):
+        return len(self._undo_entries)
+
+    @property
+    def can_undo(self):
+        return bool(self._undo_entries)
+
+    @property
+    def can_redo(self):
+        return bool(self._redo_entries)
+
+    def clear(self):
+        self._undo_entries.clear()
+        self._redo_entries.clear()
+        self._group = []
+
+    def begin_group(self):
+        self._group_depth += 1
+
+    def end_group(self):
+        self._group_depth -= 1
+        if self._group_depth == 0 and self._group:
+            group, self._group = self._group, []
+            if len(group) == 1:
+                self._push(group[0], self._undo_entries)
+            else:
+                self._undo_entries.append(('group', tuple(group)))
+
+    def record(self, entry):
+        if self._applying:
+            return
+
+        self._redo_entries.clear()
+        if self._group_depth:
+            self._push(entry, self._group)
+        else:
+            self._push(entry, self._undo_entries)
+
+    def record_change(self, widget, attribute, old_value):
+        if attribute == 'position':
+            self.record(('move', widget, widget.pos_x - old_value[0], widget.pos_y - old_value[1]))
+        elif attribute == 'label':
+            self.record(('label', widget, old_value, widget.label))
+        elif attribute == 'width':
+            self.record(('width', widget, old_value, widget.width))
+        elif attribute == 'current_image':
+            self.record(('current_image', widget, old_value, widget.current_image))
+        elif attribute == 'images':
+            self.record(('images', widget, tuple(old_value), tuple(widget.image_path_dic.values())))
+
+    @staticmethod
+    def _push(entry, entries):
+        # A run of moves of the same widget is undone in one go
+        if entry[0] == 'move' and entries:
+            last = entries[-1]
+            if last[0] == 'move' and last[1] is entry[1]:
+                entries[-1] = ('move', entry[1], last[2] + entry[2], last[3] + entry[3])
+                return
+        entries.append(entry)
+
+    def undo(self):
+        return self._step(self._undo_entries, self._redo_entries, undo=True)
+
+    def redo(self):
+        return self._step(self._redo_entries, self._undo_entries, undo=False)
+
+    def _step(self, source, target, *, undo):
+        if not source:
+            return False
+
+        entry = source.pop()
+        self._applying = True
+        try:
+            with self.drawer.batch():
+                self._apply(entry, undo=undo)
+        except ValueError:
+            source.append(entry)
+            raise
+        finally:
+            self._applying = False
+
+        target.append(entry)
+        logger.debug(F'{"Undo" if undo else "Redo"} {entry[0]}')
+        return True
+
+    def _apply(self, entry, *, undo):
+        kind = entry[0]
+        if kind == 'group':
+            for sub_entry in (reversed(entry[1]) if undo else entry[1]):
+                self._apply(sub_entry, undo=undo)
+        elif kind == 'move':
+            sign = -1 if undo else 1
+            entry[1].move_by(move_x=sign * entry[2], move_y=sign * entry[3])
+        elif kind == 'moves':
+            sign = -1 if undo else 1
+            self.drawer.move_widgets((widget, sign * move_x, sign * move_y) for widget, move_x, move_y in entry[1])
+        elif (kind == 'add' and undo) or (kind == 'remove' and not undo):
+            widgets = entry[1] if kind == 'add' else (entry[1],)
+            for widget in reversed(widgets):
+                self.drawer.remove_widget(widget, draw=entry[2])
+        elif kind in ('add', 'remove'):
+            widgets = entry[1] if kind == 'add' else (entry[1],)
+            self.drawer.add_widgets(widgets, draw=entry[2])
+        else:
+            widget, old_value, new_value = entry[1:]
+            value = old_value if undo else new_value
+            if kind == 'label':
+                widget.label = value
+            elif kind == 'width':
+                widget.width = value
+            elif kind == 'current_image':
+                widget.set_current_image(value)
+            elif kind == 'images':
+                widget.set_images(list(value), current_image=min(widget.current_image, len(value)))
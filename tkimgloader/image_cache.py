@@ -0,0 +1,234 @@
+import collections
+import concurrent.futures
+import logging
+import os
+
+from PIL import Image, ImageTk
+
+from tkimgloader.metrics import get_metrics
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+BYTES_PER_PIXEL = 4
+MAX_IMAGE_SIZES = 16384
+
+_IMAGE_SIZES = collections.OrderedDict()
+
+
+class _CacheEntry():
+    def __init__(self, *, path, photo, size_bytes):
+        self.path = path
+        self.photo = photo
+        self.size_bytes = size_bytes
+        self.ref_count = 0
+
+
+class ImageCache():
+    def __init__(self, *, max_bytes=DEFAULT_MAX_BYTES, disk_cache=None):
+        self._max_bytes = max_bytes
+        self.disk_cache = disk_cache
+        self._entries = collections.OrderedDict()
+        self._path_keys = {}
+        self._photo_keys = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_bytes(self):
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes):
+        self._max_bytes = max_bytes
+        self._evict()
+
+    @property
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, path):
+        return _calc_file_key(path) in self._entries
+
+    def acquire(self, path):
+        entry = self._get_entry(path)
+        if entry is None:
+            self.misses += 1
+            metrics = get_metrics()
+            metrics.increment('photo_images')
+            with metrics.phase('image_decode'):
+                if self.disk_cache:
+                    image = self.disk_cache.load(path)
+                else:
+                    image = decode_image(path)
+            with metrics.phase('photo_image'):
+                photo = ImageTk.PhotoImage(image)
+            entry = self._add_entry(path, photo)
+        else:
+            self.hits += 1
+
+        entry.ref_count += 1
+        self._evict()
+        return entry.photo
+
+    def add_decoded(self, path, image):
+        # Held like acquire() so it survives eviction until whoever added it releases it
+        entry = self._get_entry(path)
+        if entry is None:
+            metrics = get_metrics()
+            metrics.increment('photo_images')
+            with metrics.phase('photo_image'):
+                photo = ImageTk.PhotoImage(image)
+            entry = self._add_entry(path, photo)
+
+        entry.ref_count += 1
+        self._evict()
+        return entry.photo
+
+    def release(self, photo):
+        key = self._photo_keys.get(id(photo))
+        if key is None:
+            return
+
+        entry = self._entries[key]
+        entry.ref_count -= 1
+        if entry.ref_count <= 0:
+            entry.ref_count = 0
+            if self._path_keys.get(entry.path) != key:
+                # Source file changed since this was loaded, no one can get it again
+                self._remove_entry(key)
+            else:
+                self._evict()
+
+    def clear(self):
+        for key in [key for key, entry in self._entries.items() if entry.ref_count == 0]:
+            self._remove_entry(key)
+        _IMAGE_SIZES.clear()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _get_entry(self, path):
+        key = _calc_file_key(path)
+
+        old_key = self._path_keys.get(path)
+        if old_key is not None and old_key != key:
+            logger.debug(F'Image "{path}" changed on disk, reloading')
+            if self._entries[old_key].ref_count == 0:
+                self._remove_entry(old_key)
+            del self._path_keys[path]
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _add_entry(self, path, photo):
+        key = _calc_file_key(path)
+        entry = _CacheEntry(path=path, photo=photo, size_bytes=_calc_photo_bytes(photo))
+
+        self._entries[key] = entry
+        self._path_keys[path] = key
+        self._photo_keys[id(photo)] = key
+        self.total_bytes += entry.size_bytes
+
+        return entry
+
+    def _remove_entry(self, key):
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry.size_bytes
+        self._photo_keys.pop(id(entry.photo), None)
+        if self._path_keys.get(entry.path) == key:
+            del self._path_keys[entry.path]
+
+    def _evict(self):
+        if self.total_bytes <= self.max_bytes:
+            return
+
+        for key in [key for key, entry in self._entries.items() if entry.ref_count == 0]:
+            if self.total_bytes <= self.max_bytes:
+                break
+            logger.debug(F'Evicting image "{self._entries[key].path}" from cache')
+            self._remove_entry(key)
+            self.evictions += 1
+
+
+def _calc_file_key(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return (path, None, None)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _calc_photo_bytes(photo):
+    return photo.width() * photo.height() * BYTES_PER_PIXEL
+
+
+def get_image_size(path):
+    # Only reads the image header, not the pixels
+    key = _calc_file_key(path)
+    size = _IMAGE_SIZES.get(key)
+    if size is not None:
+        _IMAGE_SIZES.move_to_end(key)
+        return size
+
+    try:
+        with Image.open(path) as image:
+            size = image.size
+    except OSError:
+        size = (0, 0)
+    _IMAGE_SIZES[key] = size
+    if len(_IMAGE_SIZES) > MAX_IMAGE_SIZES:
+        _IMAGE_SIZES.popitem(last=False)
+    return size
+
+
+def decode_image(path):
+    with Image.open(path) as image:
+        image.load()
+        return image
+
+
+def decode_images(path_list, *, workers, use_processes=False, disk_cache=None):
+    if use_processes:
+        executor_class = concurrent.futures.ProcessPoolExecutor
+    else:
+        executor_class = concurrent.futures.ThreadPoolExecutor
+
+    # Decodes in other processes still share the cache directory, only their hit counts are lost
+    decode_func = disk_cache.load if disk_cache else decode_image
+
+    decoded = {}
+    with executor_class(max_workers=workers) as executor:
+        future_to_path = {executor.submit(decode_func, path): path for path in path_list}
+        for future in concurrent.futures.as_completed(future_to_path):
+            path = future_to_path[future]
+            try:
+                decoded[path] = future.result()
+            except (OSError, ValueError) as error:
+                # Leave it to the normal loading to report the problem
+                logger.warning(F'Failed to decode image "{path}": {error}')
+
+    return decoded
+
+
+_SHARED_CACHE = ImageCache()
+
+
+def get_shared_cache():
+    return _SHARED_CACHE
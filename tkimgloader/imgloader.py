@@ -1,77 +1,572 @@
 
-import copy
-import json
+import collections
+import contextlib
 import logging
+import os
+import queue
 
 import tkinter as tk
 
-from PIL import ImageTk
-
-from tkimgloader.widgets import ButtonType, CanvasImageButton, CanvasText, InputBox
+from tkimgloader.atlas import load_atlas_images
+from tkimgloader.config_cache import get_config_cache
+from tkimgloader.config_io import dump_binary, dump_json, get_background_writer, is_binary_config, load_config
+from tkimgloader.config_stream import iter_config_items
+from tkimgloader.history import DEFAULT_MAX_ENTRIES as DEFAULT_HISTORY_SIZE, UndoHistory
+from tkimgloader.image_cache import decode_images, get_shared_cache
+from tkimgloader.layout import calc_aligned, calc_distributed, calc_snapped, gather_widgets
+from tkimgloader.metrics import timed, timed_call
+from tkimgloader.spatial_index import SpatialIndex, bounds_intersect
+from tkimgloader.tiled_background import DEFAULT_TILE_CACHE_DIR, TiledBackground
+from tkimgloader.widgets import ButtonType, CanvasImageButton, CanvasText, FloatingWidget, InputBox, WidgetType
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
+DEFAULT_STREAM_BATCH_SIZE = 200
+DEFAULT_VIEWPORT_MARGIN = 64
+BACKGROUND_SAVE_POLL_MS = 50
+GROUP_MOVE_TAG = 'group_move'
+
 
 class ConfigDrawer():  # pylint: disable=too-many-public-methods
-    def __init__(self, canvas):
+    def __init__(self, canvas, *, lazy_images=False, viewport=False, viewport_margin=DEFAULT_VIEWPORT_MARGIN,
+                 tiled_background=False, tile_cache_dir=DEFAULT_TILE_CACHE_DIR,
+                 history_size=DEFAULT_HISTORY_SIZE):
+        if tiled_background and not viewport:
+            # Without a viewport the whole background is in view, so every tile would be decoded
+            raise ValueError('A tiled background needs viewport mode')
+
         self.canvas = canvas
-        self.config_path = None
+        self.history = UndoHistory(self, max_entries=history_size)
+        self.lazy_images = lazy_images
+        self.tiled_background = tiled_background
+        self.tile_cache_dir = tile_cache_dir
+        self.background_tiles = None
+        self.viewport = viewport
+        self.viewport_margin = viewport_margin
+        self._viewport_rect = None
+        self._viewport_job = None
+        self._realised = {}
+        self._raised = {}
+        self._atlas_photos = []
+        self._change_listeners = []
+        self._update_depth = 0
+        self._pending_redraws = {}
+        self._flush_job = None
+        self._save_results = queue.Queue()
+        self._save_poll_job = None
+        self._pending_saves = 0
+        self._config_path = None
         self.background_path = None
         self.widgets = {}
+        self._label_index = {}
+        self._type_index = {widget_type: {} for widget_type in WidgetType}
+        self._spatial_index = SpatialIndex()
+        self._unindexed = {}
         self.images = {}
         self.saved_img_config = self.calc_config_dict()
+        self._change_count = 0
+        self._saved_change_count = 0
+
+        if viewport:
+            self.canvas.bind('<Configure>', self._viewport_resized, add='+')
 
     @property
     def unsaved_changes(self):
-        return self.calc_config_dict() != self.saved_img_config
+        return self._change_count != self._saved_change_count
+
+    @property
+    def config_path(self):
+        return self._config_path
+
+    @config_path.setter
+    def config_path(self, config_path):
+        if config_path != self._config_path:
+            self._config_path = config_path
+            self._notify_change('config_path')
 
     @property
     def dimensions(self):
+        if self.background_tiles is not None:
+            return self.background_tiles.size
         if 'background' in self.images:
             return (self.images['background'].width(), self.images['background'].height())
         return (0, 0)
 
     def __eq__(self, other):
+        if self is other:
+            return True
+
+        # Cheap checks first, only build the configs if those match
+        if (self.background_path != other.background_path) or (len(self.widgets) != len(other.widgets)):
+            return False
+
         if self.calc_config_dict() != other.calc_config_dict():
             return False
 
         return True
 
-    def get_widget_with_label(self, label):
-        for widget in self.widgets.values():
-            if label == widget.label:
-                return widget
-        return None
+    def add_change_listener(self, listener):
+        self._change_listeners.append(listener)
 
-    def _add_widget(self, widget, draw=True):
-        if widget.label and self.get_widget_with_label(widget.label) is not None:
+    def remove_change_listener(self, listener):
+        self._change_listeners.remove(listener)
+
+    def _notify_change(self, change):
+        for listener in list(self._change_listeners):
+            listener(drawer=self, change=change)
+
+    def _mark_changed(self):
+        was_saved = not self.unsaved_changes
+        self._change_count += 1
+        if was_saved:
+            self._notify_change('unsaved_changes')
+
+    @property
+    def is_empty(self):
+        return not self.widgets and not self.background_path
+
+    def _loaded(self, was_empty):
+        # Loading into a drawer that already held a layout leaves it to be saved with the new widgets
+        if was_empty:
+            self.saved_img_config = self.calc_config_dict()
+            self._mark_saved()
+        self.history.clear()
+
+    def _mark_saved(self, change_count=None):
+        had_changes = self.unsaved_changes
+        self._saved_change_count = self._change_count if change_count is None else change_count
+        if had_changes != self.unsaved_changes:
+            self._notify_change('unsaved_changes')
+
+    def _widget_changed(self, *, widget, attribute, old_value):
+        if attribute == 'label':
+            self._update_label_index(widget, old_value)
+        elif id(widget) in self._unindexed:
+            # Indexed from its latest state on the first query
+            pass
+        elif attribute == 'position':
+            # The size stays the same, just shift the known bounds
+            pos_x1, pos_y1, pos_x2, pos_y2 = self._spatial_index.bounds(widget)
+            move_x, move_y = widget.pos_x - old_value[0], widget.pos_y - old_value[1]
+            self._spatial_index.update(widget, (pos_x1 + move_x, pos_y1 + move_y, pos_x2 + move_x, pos_y2 + move_y))
+        elif attribute in ('current_image', 'images', 'width'):
+            self._update_bounds(widget)
+        self.history.record_change(widget, attribute, old_value)
+
+        if self._viewport_rect is not None and attribute != 'label':
+            if self._update_visibility(widget) and self._raised:
+                self._restack_raised()
+        self._mark_changed()
+
+    def _update_label_index(self, widget, old_label):
+        if widget.label and self._label_index.get(widget.label, widget) is not widget:
             raise ValueError('Cannot have 2 Widgets with Identical Labels')
 
+        if old_label and self._label_index.get(old_label) is widget:
+            del self._label_index[old_label]
+        if widget.label:
+            self._label_index[widget.label] = widget
+
+    def begin_update(self):
+        self._update_depth += 1
+        self.history.begin_group()
+
+    def end_update(self):
+        self._update_depth -= 1
+        self.history.end_group()
+        if self._update_depth == 0 and self._pending_redraws and self._flush_job is None:
+            # Everything changed until the event loop is idle again goes out together
+            self._flush_job = self.canvas.after_idle(self.flush_updates)
+
+    @contextlib.contextmanager
+    def batch(self):
+        self.begin_update()
+        try:
+            yield self
+        finally:
+            self.end_update()
+
+    def flush_updates(self):
+        if self._flush_job is not None:
+            self.canvas.after_cancel(self._flush_job)
+            self._flush_job = None
+
+        pending = self._pending_redraws
+        self._pending_redraws = {}
+        for widget, parts in pending.values():
+            for part in parts:
+                widget.apply_redraw(part)
+
+    def undo(self):
+        return self.history.undo()
+
+    def redo(self):
+        return self.history.redo()
+
+    def _widget_redraw(self, *, widget, part):
+        if widget.canvas is None:
+            return
+        if self._update_depth == 0 and self._flush_job is None:
+            widget.apply_redraw(part)
+            return
+
+        # Only the latest state is drawn, however often it changed
+        self._pending_redraws.setdefault(id(widget), (widget, set()))[1].add(part)
+
+    @property
+    def spatial_index(self):
+        self._index_widgets()
+        return self._spatial_index
+
+    def _index_widgets(self):
+        # Undrawn widgets only get their bounds when something asks for them, sizing buttons reads their images
+        if self._unindexed:
+            unindexed, self._unindexed = self._unindexed, {}
+            for widget in unindexed.values():
+                self._spatial_index.update(widget, widget.calc_bounds())
+
+    def _update_bounds(self, widget):
+        self._unindexed.pop(id(widget), None)
+        self._spatial_index.update(widget, widget.calc_bounds())
+
+    def lift_widget(self, widget):
+        # Remembered in order, so widgets drawn again in a viewport get the same stacking
         widget_id = id(widget)
+        self._raised.pop(widget_id, None)
+        self._raised[widget_id] = widget
+        widget.lift()
+
+    def _restack_raised(self):
+        for widget_id, widget in self._raised.items():
+            if widget_id in self._realised:
+                widget.lift()
+
+    def get_widget_with_label(self, label):
+        return self._label_index.get(label)
+
+    def get_widgets_with_labels(self, labels):
+        return [self._label_index.get(label) for label in labels]
+
+    def get_widgets_of_type(self, widget_type):
+        return list(self._type_index[widget_type].values())
+
+    def get_widgets_at(self, pos_x, pos_y):
+        return self.spatial_index.query_point(pos_x, pos_y)
+
+    def get_widgets_in_rect(self, rect):
+        return self.spatial_index.query_rect(rect)
+
+    def get_nearest_widgets(self, pos_x, pos_y, *, count=1):
+        return self.spatial_index.nearest(pos_x, pos_y, count=count)
+
+    def find_overlapping_widgets(self):
+        return self.spatial_index.overlaps()
+
+    def _add_widget(self, widget, draw=True):
+        self.add_widgets([widget], draw=draw)
 
-        self.widgets[widget_id] = widget
+    def add_widgets(self, widgets, *, draw=True):
+        widgets = list(widgets)
+
+        # Validate all labels first so nothing is added if any clash
+        labels = [widget.label for widget in widgets if widget.label]
+        if (len(set(labels)) != len(labels)) or any(label in self._label_index for label in labels):
+            raise ValueError('Cannot have 2 Widgets with Identical Labels')
+
+        # Every attribute access creates a new bound method, share one between all widgets
+        change_callback = self._widget_changed
+        redraw_callback = self._widget_redraw
+        for widget in widgets:
+            widget_id = id(widget)
+            self.widgets[widget_id] = widget
+            self._type_index[widget.widget_type][widget_id] = widget
+            if widget.label:
+                self._label_index[widget.label] = widget
+            widget.change_callback = change_callback
+            widget.redraw_callback = redraw_callback
+        self._mark_changed()
+        self.history.record(('add', tuple(widgets), draw))
+
+        # Draw everything in one pass once all are inserted
+        if draw and not self.viewport:
+            for widget in widgets:
+                widget.canvas = self.canvas
+                widget.draw()
+
+        # Drawn widgets know their real size
         if draw:
-            widget.canvas = self.canvas
-            self.widgets[widget_id].draw()
+            for widget in widgets:
+                self._update_bounds(widget)
+        else:
+            self._unindexed.update((id(widget), widget) for widget in widgets)
+
+        # In viewport mode only what can be seen is drawn
+        if draw and self.viewport:
+            self._viewport_rect = self._calc_viewport_rect()
+            for widget in widgets:
+                self._update_visibility(widget)
+
+        return widgets
+
+    def _check_owned(self, widgets):
+        for widget in widgets:
+            if self.widgets.get(id(widget)) is not widget:
+                raise ValueError(F'Widget "{widget}" does not belong to this drawer')
+
+    def _gather_widgets(self, widgets):
+        # Only the group is indexed, not everything else waiting in the drawer
+        self._check_owned(widgets)
+        for widget in widgets:
+            if id(widget) in self._unindexed:
+                self._update_bounds(widget)
+        return gather_widgets(widgets, self._spatial_index)
+
+    def move_widgets(self, moves):
+        # (widget, move_x, move_y) for each widget, applied as one change with one undo entry
+        moves = tuple((widget, move_x, move_y) for widget, move_x, move_y in moves if move_x or move_y)
+        self._check_owned(widget for widget, _, _ in moves)
+        if not moves:
+            return
+
+        unindexed = self._unindexed
+        bounds = self._spatial_index.bounds
+        update = self._spatial_index.update
+        for widget, move_x, move_y in moves:
+            widget.pos_x += move_x
+            widget.pos_y += move_y
+            if id(widget) in unindexed:
+                continue
+            pos_x1, pos_y1, pos_x2, pos_y2 = bounds(widget)
+            update(widget, (pos_x1 + move_x, pos_y1 + move_y, pos_x2 + move_x, pos_y2 + move_y))
+        self.history.record(('moves', moves))
+
+        # Widgets that just came into view are already drawn in their new place
+        realised = set()
+        if self._viewport_rect is not None:
+            realised = {id(widget) for widget, _, _ in moves if self._update_visibility(widget)}
+            if realised and self._raised:
+                self._restack_raised()
+
+        # Canvas items moved by the same amount go in one canvas call, entries are placed one by one
+        tagged = collections.defaultdict(list)
+        pending = self._pending_redraws
+        for widget, move_x, move_y in moves:
+            widget_id = id(widget)
+            if widget.canvas is None or widget_id in realised:
+                continue
+            if isinstance(widget, FloatingWidget) or widget_id in pending:
+                pending.setdefault(widget_id, (widget, set()))[1].add('position')
+            else:
+                tagged[(move_x, move_y)].append(widget.canvas_widget)
+        for (move_x, move_y), canvas_items in tagged.items():
+            self._move_canvas_items(canvas_items, move_x, move_y)
+
+        if pending and self._update_depth == 0 and self._flush_job is None:
+            self._flush_job = self.canvas.after_idle(self.flush_updates)
+        self._mark_changed()
+
+    def _move_canvas_items(self, canvas_items, move_x, move_y):
+        if len(canvas_items) == 1:
+            timed_call('canvas_move', self.canvas.move, canvas_items[0], move_x, move_y)
+            return
+
+        for canvas_item in canvas_items:
+            self.canvas.addtag_withtag(GROUP_MOVE_TAG, canvas_item)
+        timed_call('canvas_move', self.canvas.move, GROUP_MOVE_TAG, move_x, move_y)
+        self.canvas.dtag(GROUP_MOVE_TAG, GROUP_MOVE_TAG)
+
+    def _move_widgets(self, widgets, new_pos_x, new_pos_y):
+        self.move_widgets((widget, pos_x - widget.pos_x, pos_y - widget.pos_y)
+                          for widget, pos_x, pos_y in zip(widgets, new_pos_x, new_pos_y))
+
+    def translate_widgets(self, widgets, *, move_x, move_y):
+        self.move_widgets((widget, move_x, move_y) for widget in widgets)
+
+    def align_widgets(self, widgets, *, edge):
+        widgets = list(widgets)
+        if widgets:
+            pos_x, pos_y, bounds = self._gather_widgets(widgets)
+            self._move_widgets(widgets, *calc_aligned(pos_x, pos_y, bounds, edge=edge))
+
+    def distribute_widgets(self, widgets, *, axis):
+        widgets = list(widgets)
+        pos_x, pos_y, bounds = self._gather_widgets(widgets)
+        self._move_widgets(widgets, *calc_distributed(pos_x, pos_y, bounds, axis=axis))
+
+    def snap_widgets_to_grid(self, widgets, *, grid_size):
+        widgets = list(widgets)
+        pos_x, pos_y, _ = self._gather_widgets(widgets)
+        self._move_widgets(widgets, *calc_snapped(pos_x, pos_y, grid_size=grid_size))
+
+    def create_widget(self, widget_type, widget_dict):
+        if widget_type == WidgetType.TEXT:
+            return CanvasText(label=widget_dict['label'], text=widget_dict['text'],
+                              pos_x=widget_dict['x'], pos_y=widget_dict['y'])
+        if widget_type == WidgetType.BUTTON:
+            return self._create_image_button(
+                label=widget_dict['label'], pos_x=widget_dict['x'], pos_y=widget_dict['y'],
+                orig_on_release=widget_dict['orig_image_on_release'], current_image=widget_dict['current_image'],
+                images=list(widget_dict['images'].values()))
+        if widget_type == WidgetType.INPUT_BOX:
+            return InputBox(label=widget_dict['label'], pos_x=widget_dict['x'], pos_y=widget_dict['y'],
+                            width=widget_dict.get('width'))
+        raise ValueError(F'Unsupported Widget Type "{widget_type}"')
 
     def remove_widget(self, widget, draw=True):
         widget_id = id(widget)
 
-        if draw:
-            self.widgets[widget_id].destroy()
+        if draw and (not self.viewport or widget_id in self._realised):
+            # Same as a release, nothing may use the destroyed canvas items if the widget comes back
+            widget.destroy()
+            widget.canvas = None
+            widget.canvas_widget = None
+        self._realised.pop(widget_id, None)
+        self._raised.pop(widget_id, None)
         del self.widgets[widget_id]
-
+        del self._type_index[widget.widget_type][widget_id]
+        self._unindexed.pop(widget_id, None)
+        self._spatial_index.remove(widget)
+        if widget.label and self._label_index.get(widget.label) is widget:
+            del self._label_index[widget.label]
+        widget.change_callback = None
+        widget.redraw_callback = None
+        self._pending_redraws.pop(widget_id, None)
+        self._mark_changed()
+        self.history.record(('remove', widget, draw))
+
+    @timed('load_background')
     def load_background(self, path, draw=True):
-        self.background_path = path
+        path_changed = path != self.background_path
+        if path_changed:
+            self.background_path = path
+            self._mark_changed()
 
         if draw:
             logger.debug(F'Drawing Background file "{path}"')
 
-            background = ImageTk.PhotoImage(file=path)
-            self.images['background'] = background
+            if self.background_tiles is not None:
+                self.background_tiles.destroy()
+                self.background_tiles = None
+            if 'background' in self.images:
+                get_shared_cache().release(self.images.pop('background'))
+
+            if self.tiled_background:
+                self.background_tiles = TiledBackground(self.canvas, path, cache_dir=self.tile_cache_dir)
+            else:
+                self.images['background'] = get_shared_cache().acquire(path)
+            width, height = self.dimensions
+
+            if self.viewport:
+                # The canvas keeps its size and scrolls over the background instead
+                self.canvas.config(scrollregion=(0, 0, width, height))
+            else:
+                self.canvas.config(width=width, height=height)
+
+            if self.background_tiles is not None:
+                self.background_tiles.show(self._calc_viewport_rect())
+            else:
+                timed_call('canvas_create_image', self.canvas.create_image,
+                           0, 0, image=self.images['background'], anchor=tk.NW)
+
+        # Drawing can change the dimensions even for the same path
+        if path_changed or draw:
+            self._notify_change('background')
 
-            self.canvas.config(width=background.width(), height=background.height())
-            self.canvas.create_image(0, 0, image=background, anchor=tk.NW)
+    @property
+    def realised_widgets(self):
+        if not self.viewport:
+            return [widget for widget in self.widgets.values() if widget.canvas]
+        return list(self._realised.values())
+
+    def xview(self, *args):
+        self.canvas.xview(*args)
+        self.schedule_viewport_update()
+
+    def yview(self, *args):
+        self.canvas.yview(*args)
+        self.schedule_viewport_update()
+
+    def scroll_to(self, *, pos_x, pos_y):
+        self.canvas.xview_moveto(pos_x / max(self.dimensions[0], 1))
+        self.canvas.yview_moveto(pos_y / max(self.dimensions[1], 1))
+        self.update_viewport()
+
+    def schedule_viewport_update(self):
+        # Scrolling fires many events, only the last position matters
+        if self.viewport and self._viewport_job is None:
+            self._viewport_job = self.canvas.after_idle(self.update_viewport)
+
+    def _viewport_resized(self, event):  # pylint: disable=unused-argument
+        self.schedule_viewport_update()
+
+    def update_viewport(self):
+        if self._viewport_job is not None:
+            self.canvas.after_cancel(self._viewport_job)
+            self._viewport_job = None
+
+        rect = self._calc_viewport_rect()
+        if rect == self._viewport_rect:
+            return
+        self._viewport_rect = rect
+
+        if self.background_tiles is not None:
+            self.background_tiles.show(rect)
+
+        visible = {id(widget): widget for widget in self.spatial_index.query_rect(rect)}
+        for widget_id, widget in list(self._realised.items()):
+            if widget_id not in visible:
+                self._release_widget(widget)
+        realised_count = len(self._realised)
+        for widget_id, widget in visible.items():
+            if widget_id not in self._realised:
+                self._realise_widget(widget)
+
+        # Newly drawn items land on top, put the raised ones back above them
+        if self._raised and len(self._realised) != realised_count:
+            self._restack_raised()
+
+        # Floating widgets are placed in window coordinates, so follow the scroll
+        for widget in self._realised.values():
+            if isinstance(widget, FloatingWidget):
+                widget.redraw_widget()
+
+        logger.debug(F'Viewport {rect}: {len(self._realised)} of {len(self.widgets)} Widgets drawn')
+
+    def _calc_viewport_rect(self):
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            # Not mapped yet, go by the requested size
+            width, height = int(self.canvas.cget('width')), int(self.canvas.cget('height'))
+
+        pos_x = int(self.canvas.canvasx(0))
+        pos_y = int(self.canvas.canvasy(0))
+        return (pos_x - self.viewport_margin, pos_y - self.viewport_margin,
+                pos_x + width + self.viewport_margin, pos_y + height + self.viewport_margin)
+
+    def _update_visibility(self, widget):
+        if id(widget) in self._unindexed:
+            self._update_bounds(widget)
+        visible = bounds_intersect(self._spatial_index.bounds(widget), self._viewport_rect)
+        realised = id(widget) in self._realised
+        if visible and not realised:
+            self._realise_widget(widget)
+            return True
+        if realised and not visible:
+            self._release_widget(widget)
+        return False
+
+    def _realise_widget(self, widget):
+        widget.canvas = self.canvas
+        widget.draw()
+        self._realised[id(widget)] = widget
+        self._update_bounds(widget)
+
+    def _release_widget(self, widget):
+        widget.destroy()
+        widget.canvas = None
+        widget.canvas_widget = None
+        del self._realised[id(widget)]
 
     def calc_config_dict(self):
         config = {}
@@ -86,45 +581,206 @@ class ConfigDrawer():  # pylint: disable=too-many-public-methods
 
         return config
 
-    def _load_config(self, config, *, config_path, draw=True):
+    @timed('load_config')
+    def _load_config(self, config, *, config_path, draw=True, decode_workers=0, use_processes=False):
+        was_empty = self.is_empty
+
         # Set config vars
         self.config_path = config_path
 
-        # Load the background
-        if 'background' in config:
-            self.load_background(config['background'], draw=draw)
-
-        # Load the Text Items
-        if 'Text' in config:
-            for text_item in config['Text']:
-                self.add_text(label=text_item['label'], text=text_item['text'],
-                              pos_x=text_item['x'], pos_y=text_item['y'], draw=draw)
-
-        # Load the image button items
-        if 'Button' in config:
-            for button_dic in config['Button']:
-                self.add_image_button(label=button_dic['label'], pos_x=button_dic['x'], pos_y=button_dic['y'],
-                                      orig_on_release=button_dic['orig_image_on_release'],
-                                      current_image=button_dic['current_image'],
-                                      images=list(button_dic['images'].values()), draw=draw)
-
-        # Load Input Boxes
-        if 'Input Box' in config:
-            for text_item in config['Input Box']:
-                self.add_input_box(label=text_item['label'], pos_x=text_item['x'], pos_y=text_item['y'], draw=draw)
+        # Decode all images up front in parallel, widgets then only create the PhotoImages
+        preloaded = []
+        if draw and decode_workers:
+            preloaded = self._preload_images(config, workers=decode_workers, use_processes=use_processes)
+
+        try:
+            # Load the background
+            if 'background' in config:
+                self.load_background(config['background'], draw=draw)
+
+            # Load the Text, Image Button and Input Box Items
+            widgets = []
+            for widget_type in (WidgetType.TEXT, WidgetType.BUTTON, WidgetType.INPUT_BOX):
+                for widget_dict in config.get(widget_type.value, []):
+                    widgets.append(self.create_widget(widget_type, widget_dict))
+            self.add_widgets(widgets, draw=draw)
+        finally:
+            # The widgets hold their own references now, anything unused is left to the cache budget
+            image_cache = get_shared_cache()
+            for photo in preloaded:
+                image_cache.release(photo)
+
+        self._loaded(was_empty)
+
+    def load_atlas(self, index_path):
+        # Kept for as long as the atlas is loaded, evicted entries would be reloaded from the original files
+        image_cache = get_shared_cache()
+        images = load_atlas_images(index_path, disk_cache=image_cache.disk_cache)
+        photos = [image_cache.add_decoded(path, image) for path, image in images.items()]
+        for photo in self._atlas_photos:
+            image_cache.release(photo)
+        self._atlas_photos = photos
+
+    def load_config_file(self, config_path, *, draw=True, decode_workers=0, use_processes=False, use_cache=True,
+                         atlas_path=None):
+        # Button images come out of the atlas rather than their own files
+        if draw and atlas_path:
+            self.load_atlas(atlas_path)
+
+        if use_cache:
+            config = get_config_cache().load(config_path)
+        else:
+            config = load_config(config_path)
+        logger.debug(F'Load Config: "{config_path}"')
+        self._load_config(config, config_path=config_path, draw=draw,
+                          decode_workers=decode_workers, use_processes=use_processes)
+
+    def iter_load_config_file(self, config_path, *, draw=True, batch_size=DEFAULT_STREAM_BATCH_SIZE):
+        # Widgets are created as the entries are parsed, yields the number loaded after each batch
+        was_empty = self.is_empty
+        self.config_path = config_path
 
-        self.saved_img_config = self.calc_config_dict()
+        widget_count = 0
+        batch = []
+        for key, value in iter_config_items(config_path):
+            if key == 'background':
+                self.load_background(value, draw=draw)
+            elif key in (WidgetType.TEXT.value, WidgetType.BUTTON.value, WidgetType.INPUT_BOX.value):
+                batch.append(self.create_widget(WidgetType(key), value))
+                if len(batch) >= batch_size:
+                    self.add_widgets(batch, draw=draw)
+                    widget_count += len(batch)
+                    batch = []
+                    yield widget_count
+
+        if batch:
+            self.add_widgets(batch, draw=draw)
+            widget_count += len(batch)
+
+        logger.debug(F'Streamed {widget_count} Widgets from Config "{config_path}"')
+
+        self._loaded(was_empty)
+        yield widget_count
+
+    def load_config_file_incremental(self, config_path, *, batch_size=DEFAULT_STREAM_BATCH_SIZE,
+                                     progress_callback=None, complete_callback=None):
+        loader = self.iter_load_config_file(config_path, batch_size=batch_size)
+
+        def load_next_batch():
+            try:
+                widget_count = next(loader)
+            except StopIteration:
+                if complete_callback:
+                    complete_callback(drawer=self)
+                return
+
+            if progress_callback:
+                progress_callback(drawer=self, widget_count=widget_count)
+
+            # Give the event loop a turn before the next batch
+            self.canvas.after_idle(load_next_batch)
+
+        load_next_batch()
+
+    def _preload_images(self, config, *, workers, use_processes):
+        image_cache = get_shared_cache()
+
+        path_list = []
+        if config.get('background'):
+            path_list.append(config['background'])
+        for button_dic in config.get('Button', []):
+            if self.lazy_images:
+                # Lazy buttons only need their current image up front
+                images = list(button_dic['images'].values())
+                path_list.append(images[button_dic['current_image'] - 1])
+            else:
+                path_list.extend(button_dic['images'].values())
+        path_list = [path for path in dict.fromkeys(path_list) if path not in image_cache]
+
+        logger.debug(F'Decoding {len(path_list)} images with {workers} workers')
+        decoded = decode_images(path_list, workers=workers, use_processes=use_processes,
+                                disk_cache=image_cache.disk_cache)
+        return [image_cache.add_decoded(path, image) for path, image in decoded.items()]
+
+    @timed('save_config')
+    def save_config_to_file(self, config_path, *, binary=None, background=False, complete_callback=None,
+                            force=False):
+        if not force and not self._needs_save(config_path, binary):
+            logger.debug(F'No changes to save to "{config_path}"')
+            if complete_callback:
+                complete_callback(config_path=config_path, error=None)
+            return False
 
-    def load_config_file(self, config_path, *, draw=True):
-        config = load_json(config_path)
-        logger.debug(F'Load Config: {config}')
-        self._load_config(config, config_path=config_path, draw=draw)
+        # Keep the format of the file being overwritten unless told otherwise
+        if binary is None:
+            binary = is_binary_config(config_path)
 
-    def save_config_to_file(self, config_path):
         config = self.calc_config_dict()
-        dump_json(config_path, config)
+
+        if background:
+            # Only count as saved once written, later saves of the same file may replace this one
+            change_count = self._change_count
+
+            def write_complete(*, file_path, error):
+                # Called on the writer thread, the drawer and Tk are only touched from the Tk thread
+                self._save_results.put((file_path, config, error, change_count, complete_callback))
+
+            get_background_writer().submit(config_path, config, binary=binary, callback=write_complete)
+            self._pending_saves += 1
+            self._schedule_save_poll()
+        else:
+            if binary:
+                dump_binary(config_path, config)
+            else:
+                dump_json(config_path, config)
+            get_config_cache().invalidate(config_path)
+            self._saved(config_path, config)
+            if complete_callback:
+                complete_callback(config_path=config_path, error=None)
+
+        return True
+
+    def _saved(self, config_path, config, change_count=None):
         self.config_path = config_path
-        self.saved_img_config = copy.deepcopy(config)
+        self.saved_img_config = config
+        self._mark_saved(change_count)
+
+    def _needs_save(self, config_path, binary):
+        if self.unsaved_changes or (config_path != self.config_path) or not os.path.exists(config_path):
+            return True
+        return (binary is not None) and (binary != is_binary_config(config_path))
+
+    def _schedule_save_poll(self):
+        if self._save_poll_job is None:
+            self._save_poll_job = self.canvas.after(BACKGROUND_SAVE_POLL_MS, self.process_background_saves)
+
+    def process_background_saves(self):
+        # Runs on the Tk thread, complete_callback of background saves is only ever called from here
+        if self._save_poll_job is not None:
+            self.canvas.after_cancel(self._save_poll_job)
+            self._save_poll_job = None
+
+        while True:
+            try:
+                file_path, config, error, change_count, complete_callback = self._save_results.get_nowait()
+            except queue.Empty:
+                break
+
+            self._pending_saves -= 1
+            get_config_cache().invalidate(file_path)
+            # A save that finishes after a newer one must not take the drawer back to its older state
+            if error is None and change_count >= self._saved_change_count:
+                self._saved(file_path, config, change_count)
+            if complete_callback:
+                complete_callback(config_path=file_path, error=error)
+
+        if self._pending_saves:
+            self._schedule_save_poll()
+
+    def wait_for_background_saves(self, timeout=None):
+        finished = get_background_writer().wait(timeout=timeout)
+        self.process_background_saves()
+        return finished
 
     def add_text(self, *, label=None, text, pos_x, pos_y, draw=True):
         text_widget = CanvasText(label=label, text=text, pos_x=pos_x, pos_y=pos_y)
@@ -132,29 +788,27 @@ class ConfigDrawer():  # pylint: disable=too-many-public-methods
 
         return text_widget
 
-    def add_image_button(self, *, label=None, pos_x, pos_y, orig_on_release, images, current_image=1, draw=True):
+    def add_image_button(self, *, label=None, pos_x, pos_y, orig_on_release, images, current_image=1, lazy=None,
+                         draw=True):
+        button_widget = self._create_image_button(label=label, pos_x=pos_x, pos_y=pos_y,
+                                                  orig_on_release=orig_on_release, images=images,
+                                                  current_image=current_image, lazy=lazy)
+        self._add_widget(button_widget, draw)
+
+        return button_widget
+
+    def _create_image_button(self, *, label, pos_x, pos_y, orig_on_release, images, current_image, lazy=None):
         if orig_on_release:
             button_type = ButtonType.RELEASE
         else:
             button_type = ButtonType.SWITCH
-        button_widget = CanvasImageButton(label=label, button_type=button_type, pos_x=pos_x, pos_y=pos_y,
-                                          image_list=images, current_image=current_image)
-        self._add_widget(button_widget, draw)
-
-        return button_widget
+        if lazy is None:
+            lazy = self.lazy_images
+        return CanvasImageButton(label=label, button_type=button_type, pos_x=pos_x, pos_y=pos_y,
+                                 image_list=images, current_image=current_image, lazy=lazy)
 
     def add_input_box(self, *, label=None, pos_x, pos_y, width=None, draw=True):
         widget = InputBox(label=label, pos_x=pos_x, pos_y=pos_y, width=width)
         self._add_widget(widget, draw)
 
         return widget
-
-
-def load_json(file_path):
-    with open(file_path) as file_ptr:
-        return json.load(file_ptr)
-
-
-def dump_json(file_path, config):
-    with open(file_path, 'w') as file_ptr:
-        json.dump(config, file_ptr, indent=4)
@@ -0,0 +1,69 @@
+ALIGN_EDGES = ('left', 'right', 'centre', 'top', 'bottom', 'middle')
+
+
+def gather_widgets(widgets, spatial_index):
+    # Positions and bounds as columns, so the calculations below work on a whole group at once
+    pos_x = [widget.pos_x for widget in widgets]
+    pos_y = [widget.pos_y for widget in widgets]
+    bounds = [spatial_index.bounds(widget) for widget in widgets]
+    left = [bound[0] for bound in bounds]
+    top = [bound[1] for bound in bounds]
+    width = [bound[2] - bound[0] for bound in bounds]
+    height = [bound[3] - bound[1] for bound in bounds]
+    return pos_x, pos_y, (left, top, width, height)
+
+
+def calc_aligned(pos_x, pos_y, bounds, *, edge):
+    left, top, width, height = bounds
+    if edge == 'left':
+        target = min(left)
+        return ([pos + target - start for pos, start in zip(pos_x, left)], list(pos_y))
+    if edge == 'right':
+        target = max(start + size for start, size in zip(left, width))
+        return ([pos + target - start - size for pos, start, size in zip(pos_x, left, width)], list(pos_y))
+    if edge == 'centre':
+        target = (min(left) + max(start + size for start, size in zip(left, width))) // 2
+        return ([pos + target - start - size // 2 for pos, start, size in zip(pos_x, left, width)], list(pos_y))
+    if edge == 'top':
+        target = min(top)
+        return (list(pos_x), [pos + target - start for pos, start in zip(pos_y, top)])
+    if edge == 'bottom':
+        target = max(start + size for start, size in zip(top, height))
+        return (list(pos_x), [pos + target - start - size for pos, start, size in zip(pos_y, top, height)])
+    if edge == 'middle':
+        target = (min(top) + max(start + size for start, size in zip(top, height))) // 2
+        return (list(pos_x), [pos + target - start - size // 2 for pos, start, size in zip(pos_y, top, height)])
+    raise ValueError(F'Invalid edge "{edge}", must be one of {ALIGN_EDGES}')
+
+
+def _calc_distributed_axis(positions, starts, sizes):
+    # First and last stay put, the gaps between all others are made equal
+    order = sorted(range(len(positions)), key=lambda index: starts[index])
+    span_start = starts[order[0]]
+    span_end = max(start + size for start, size in zip(starts, sizes))
+    gap = (span_end - span_start - sum(sizes)) / (len(order) - 1)
+
+    new_positions = list(positions)
+    next_start = span_start
+    for index in order:
+        new_positions[index] = positions[index] + round(next_start) - starts[index]
+        next_start += sizes[index] + gap
+    return new_positions
+
+
+def calc_distributed(pos_x, pos_y, bounds, *, axis):
+    left, top, width, height = bounds
+    if len(pos_x) < 3:
+        return (list(pos_x), list(pos_y))
+    if axis == 'x':
+        return (_calc_distributed_axis(pos_x, left, width), list(pos_y))
+    if axis == 'y':
+        return (list(pos_x), _calc_distributed_axis(pos_y, top, height))
+    raise ValueError(F'Invalid axis "{axis}", must be "x" or "y"')
+
+
+def calc_snapped(pos_x, pos_y, *, grid_size):
+    if grid_size <= 0:
+        raise ValueError('Grid size must be positive')
+    return ([round(value / grid_size) * grid_size for value in pos_x],
+            [round(value / grid_size) * grid_size for value in pos_y])
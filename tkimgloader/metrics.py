@@ -0,0 +1,207 @@
+import bisect
+import contextlib
+import functools
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+# Upper bounds in seconds, anything slower lands in the last (infinite) bucket
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+PROMETHEUS_PREFIX = 'tkimgloader'
+
+
+class Histogram():
+    def __init__(self, *, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'min': self.min,
+            'max': self.max,
+            'buckets': list(zip(self.buckets + (float('inf'),), self.counts)),
+        }
+
+
+class Metrics():
+    def __init__(self, *, enabled=False, buckets=DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self.sinks = []
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._counters = {}
+            self._histograms = {}
+
+    def increment(self, name, value=1):
+        if self.enabled:
+            with self._lock:
+                self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, phase, seconds):
+        with self._lock:
+            histogram = self._histograms.get(phase)
+            if histogram is None:
+                histogram = self._histograms[phase] = Histogram(buckets=self.buckets)
+            histogram.observe(seconds)
+
+    @contextlib.contextmanager
+    def _timed_phase(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.perf_counter() - start)
+
+    def phase(self, phase):
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._timed_phase(phase)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'phases': {phase: histogram.to_dict() for phase, histogram in self._histograms.items()},
+            }
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+
+    def remove_sink(self, sink):
+        self.sinks.remove(sink)
+
+    def publish(self):
+        snapshot = self.snapshot()
+        for sink in self.sinks:
+            sink.publish(snapshot)
+        return snapshot
+
+
+class LogSink():
+    def __init__(self, *, level=logging.INFO):
+        self.level = level
+
+    def publish(self, snapshot):
+        for name, value in sorted(snapshot['counters'].items()):
+            logger.log(self.level, F'Counter {name}: {value}')
+        for phase, histogram in sorted(snapshot['phases'].items()):
+            mean = histogram['sum'] / histogram['count']
+            logger.log(self.level, F'Phase {phase}: {histogram["count"]} calls, total {histogram["sum"]:.4f}s, '
+                                   F'mean {mean:.6f}s, max {histogram["max"]:.6f}s')
+
+
+class CallbackSink():
+    def __init__(self, callback):
+        self.callback = callback
+
+    def publish(self, snapshot):
+        self.callback(snapshot=snapshot)
+
+
+class PrometheusFileSink():
+    # Text exposition format, for the node exporter textfile collector or similar
+    def __init__(self, file_path, *, prefix=PROMETHEUS_PREFIX):
+        self.file_path = file_path
+        self.prefix = prefix
+
+    def publish(self, snapshot):
+        temp_path = F'{self.file_path}.{uuid.uuid4().hex}.tmp'
+        with open(temp_path, 'w') as file_ptr:
+            file_ptr.write(format_prometheus(snapshot, prefix=self.prefix))
+        os.replace(temp_path, self.file_path)
+
+
+def _calc_metric_name(*parts):
+    return re.sub(r'[^a-zA-Z0-9_]', '_', '_'.join(parts))
+
+
+def _format_bound(bound):
+    return '+Inf' if bound == float('inf') else repr(bound)
+
+
+def format_prometheus(snapshot, *, prefix=PROMETHEUS_PREFIX):
+    lines = []
+    for name, value in sorted(snapshot['counters'].items()):
+        metric_name = _calc_metric_name(prefix, name, 'total')
+        lines.append(F'# TYPE {metric_name} counter')
+        lines.append(F'{metric_name} {value}')
+
+    if snapshot['phases']:
+        metric_name = _calc_metric_name(prefix, 'phase_seconds')
+        lines.append(F'# TYPE {metric_name} histogram')
+        for phase, histogram in sorted(snapshot['phases'].items()):
+            cumulative = 0
+            for bound, count in histogram['buckets']:
+                cumulative += count
+                lines.append(F'{metric_name}_bucket{{phase="{phase}",le="{_format_bound(bound)}"}} {cumulative}')
+            lines.append(F'{metric_name}_sum{{phase="{phase}"}} {histogram["sum"]!r}')
+            lines.append(F'{metric_name}_count{{phase="{phase}"}} {histogram["count"]}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def timed_call(phase, func, *args, **kwargs):
+    # For single calls such as canvas operations, same cost as timed() when disabled
+    metrics = _SHARED_METRICS
+    if not metrics.enabled:
+        return func(*args, **kwargs)
+
+    start = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        metrics.observe(phase, time.perf_counter() - start)
+
+
+def timed(phase):
+    # Disabled metrics cost one attribute check per call
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            metrics = _SHARED_METRICS
+            if not metrics.enabled:
+                return func(*args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metrics.observe(phase, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+_SHARED_METRICS = Metrics()
+
+
+def get_metrics():
+    return _SHARED_METRICS
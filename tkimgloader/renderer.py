@@ -0,0 +1,156 @@
+import collections
+import logging
+import os
+
+from PIL import Image, ImageDraw, ImageFont
+
+from tkimgloader.config_io import load_config
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+# Approximations of what the Tk canvas shows, 'Times 10 italic bold' for text and a default Entry
+TEXT_FONT_FILES = ('timesbi.ttf', 'Times New Roman Bold Italic.ttf', 'DejaVuSerif-BoldItalic.ttf')
+TEXT_FONT_SIZE = 13
+TEXT_COLOUR = (0, 0, 0, 255)
+INPUT_BOX_CHAR_WIDTH = 7
+INPUT_BOX_HEIGHT = 20
+INPUT_BOX_DEFAULT_WIDTH = 15
+EMPTY_SIZE = (1, 1)
+DEFAULT_MAX_IMAGE_BYTES = 256 * 1024 * 1024
+
+
+def _load_text_font():
+    for font_file in TEXT_FONT_FILES:
+        try:
+            return ImageFont.truetype(font_file, TEXT_FONT_SIZE)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+class ConfigRenderer():
+    def __init__(self, *, base_dir=os.curdir, background_colour=(255, 255, 255, 255),
+                 max_image_bytes=DEFAULT_MAX_IMAGE_BYTES):
+        self.base_dir = base_dir
+        self.background_colour = background_colour
+        self.max_image_bytes = max_image_bytes
+        self.image_bytes = 0
+        self._images = collections.OrderedDict()
+        self._font = None
+
+    @property
+    def font(self):
+        if self._font is None:
+            self._font = _load_text_font()
+        return self._font
+
+    def load_image(self, path):
+        # Decoded and prepared once, every layer using the image afterwards is a plain paste
+        image = self._images.get(path)
+        if image is not None:
+            self._images.move_to_end(path)
+            return image
+
+        with Image.open(os.path.join(self.base_dir, path)) as source:
+            image = source.convert('RGBA')
+        if image.getextrema()[3][0] == 255:
+            image = image.convert('RGB')
+        self._images[path] = image
+        self.image_bytes += _calc_image_bytes(image)
+
+        # Long running workers render many configs, keep the least recently used within the budget
+        while self.image_bytes > self.max_image_bytes and len(self._images) > 1:
+            _, old_image = self._images.popitem(last=False)
+            self.image_bytes -= _calc_image_bytes(old_image)
+        return image
+
+    def clear(self):
+        self._images.clear()
+        self.image_bytes = 0
+
+    def render(self, config, *, size=None):
+        if hasattr(config, 'calc_config_dict'):
+            config = config.calc_config_dict()
+
+        background = None
+        if config.get('background'):
+            background = self.load_image(config['background'])
+        if size is None:
+            size = background.size if background else _calc_extent(config, self)
+
+        # Over an opaque result the alpha is never needed, images then go on with a single masked paste
+        opaque = len(self.background_colour) == 3 or self.background_colour[3] == 255
+        result = Image.new('RGB' if opaque else 'RGBA', size, self.background_colour)
+        if background:
+            _paste(result, background, 0, 0)
+
+        # Same stacking as the canvas, items in load order and input boxes floating on top
+        draw = ImageDraw.Draw(result)
+        for text_item in config.get('Text', []):
+            draw.text((text_item['x'], text_item['y']), text_item['text'], fill=TEXT_COLOUR, font=self.font)
+
+        for button_dic in config.get('Button', []):
+            image = self.load_image(_current_image_path(button_dic))
+            _paste(result, image, button_dic['x'] - image.width // 2, button_dic['y'] - image.height // 2)
+
+        for input_box in config.get('Input Box', []):
+            draw.rectangle(_input_box_rect(input_box), fill=(255, 255, 255, 255), outline=(128, 128, 128, 255))
+
+        return result if result.mode == 'RGBA' else result.convert('RGBA')
+
+    def render_file(self, config_path, output_path, *, size=None):
+        image = self.render(load_config(config_path), size=size)
+        image.save(output_path)
+        return image
+
+
+def _calc_image_bytes(image):
+    return image.width * image.height * len(image.getbands())
+
+
+def _current_image_path(button_dic):
+    return list(button_dic['images'].values())[button_dic['current_image'] - 1]
+
+
+def _input_box_rect(input_box):
+    width = input_box.get('width') or INPUT_BOX_DEFAULT_WIDTH
+    return (input_box['x'], input_box['y'],
+            input_box['x'] + width * INPUT_BOX_CHAR_WIDTH + 4, input_box['y'] + INPUT_BOX_HEIGHT)
+
+
+def _calc_extent(config, renderer):
+    max_x, max_y = EMPTY_SIZE
+    for text_item in config.get('Text', []):
+        max_x, max_y = max(max_x, text_item['x'] + 1), max(max_y, text_item['y'] + 1)
+    for button_dic in config.get('Button', []):
+        image = renderer.load_image(_current_image_path(button_dic))
+        max_x = max(max_x, button_dic['x'] + image.width - image.width // 2)
+        max_y = max(max_y, button_dic['y'] + image.height - image.height // 2)
+    for input_box in config.get('Input Box', []):
+        rect = _input_box_rect(input_box)
+        max_x, max_y = max(max_x, rect[2] + 1), max(max_y, rect[3] + 1)
+    return (max_x, max_y)
+
+
+def _paste(result, image, pos_x, pos_y):
+    if image.mode == 'RGB':
+        # Opaque, paste clips to the result by itself
+        result.paste(image, (pos_x, pos_y))
+    elif result.mode == 'RGB':
+        # Blending by the image's own alpha is the same as compositing onto an opaque result
+        result.paste(image, (pos_x, pos_y), image)
+    else:
+        _composite(result, image, pos_x, pos_y)
+
+
+def _composite(result, image, pos_x, pos_y):
+    # alpha_composite needs the destination inside the result, so clip the source
+    left, top = max(0, -pos_x), max(0, -pos_y)
+    right = min(image.width, result.width - pos_x)
+    bottom = min(image.height, result.height - pos_y)
+    if left < right and top < bottom:
+        result.alpha_composite(image, dest=(pos_x + left, pos_y + top), source=(left, top, right, bottom))
+
+
+def render_config(config, *, base_dir=os.curdir, size=None):
+    return ConfigRenderer(base_dir=base_dir).render(config, size=size)
@@ -0,0 +1,24 @@
+import argparse
+
+from tkimgloader.config_io import convert_config_file, is_binary_config
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Convert a config between the JSON and binary formats')
+    parser.add_argument('source', help='Config file to convert')
+    parser.add_argument('dest', help='File to write the converted config to')
+    format_group = parser.add_mutually_exclusive_group()
+    format_group.add_argument('--binary', dest='binary', action='store_const', const=True,
+                              help='Write the binary format')
+    format_group.add_argument('--json', dest='binary', action='store_const', const=False,
+                              help='Write the JSON format')
+    args = parser.parse_args(argv)
+
+    convert_config_file(args.source, args.dest, binary=args.binary)
+
+    dest_format = 'binary' if is_binary_config(args.dest) else 'JSON'
+    print(F'Converted "{args.source}" to {dest_format} config "{args.dest}"')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,25 +1,22 @@
 
+import argparse
 import logging
 import os
 
-from functools import partial
-
 import tkinter as tk
-import tkinter.ttk as ttk
 from tkinter import filedialog, messagebox
 import tkinter.simpledialog as simpledialog
 
 from tkimgloader import project_logger
 from tkimgloader.imgloader import ConfigDrawer
+from tkimgloader.scripts.profiler import BACKENDS as PROFILE_BACKENDS, SessionProfiler, backend_from_env
+from tkimgloader.scripts.widget_panel import WidgetPanel
 from tkimgloader.widgets import WidgetType
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
 
-NAV_DIRECTIONS = [
-    ('▲', 0, -1),
-    ('▼', 0, 1),
-    ('◀', -1, 0),
-    ('▶', 1, 0)]
+VIEWPORT_WIDTH = 1024
+VIEWPORT_HEIGHT = 768
 
 
 class ChangeDir():
@@ -37,31 +34,60 @@ class ChangeDir():
 
 
 class ImgEditor():
-    def __init__(self, root, working_dir):
+    def __init__(self, root, working_dir, *, viewport=False, tiled_background=False, profiler=None):
         logger.debug(F'Working Dir: {working_dir}')
         self.root_window = root
         self.working_dir = working_dir
+        self.viewport = viewport
+        self.profiler = profiler
         self.canvas = None
+        self.widget_panel = None
         self.columnspan = 20
-
-        self.menu_widgets = []
+        self._title_job = None
 
         # Init the Canvas
         self._init_canvas()
 
         # Init the Config Drawer
-        self.img_loader = ConfigDrawer(self.canvas)
+        self.img_loader = ConfigDrawer(self.canvas, viewport=viewport, tiled_background=tiled_background)
+        self.img_loader.add_change_listener(self._drawer_changed)
 
         # Draw the Menu Bar
         self._draw_menu()
 
-        # draw the text options
-        self._draw_navigation_options()
-
     def _init_canvas(self):
         self.root_window.title(F'Config: N/A')
-        self.canvas = tk.Canvas(self.root_window)
-        self.canvas.grid(row=0, columnspan=self.columnspan)
+
+        # Only the rows in view of the widget list are drawn
+        self.widget_panel = WidgetPanel(self.root_window, self)
+        self.widget_panel.frame.grid(row=1, columnspan=self.columnspan, sticky=tk.NSEW)
+
+        if not self.viewport:
+            self.canvas = tk.Canvas(self.root_window)
+            self.canvas.grid(row=0, columnspan=self.columnspan)
+            return
+
+        # Fixed size canvas scrolling over the layout, the drawer only draws what is in view
+        frame = tk.Frame(self.root_window)
+        frame.grid(row=0, columnspan=self.columnspan)
+
+        self.canvas = tk.Canvas(frame, width=VIEWPORT_WIDTH, height=VIEWPORT_HEIGHT)
+        x_scrollbar = tk.Scrollbar(frame, orient=tk.HORIZONTAL, command=lambda *args: self.img_loader.xview(*args))
+        y_scrollbar = tk.Scrollbar(frame, orient=tk.VERTICAL, command=lambda *args: self.img_loader.yview(*args))
+        self.canvas.config(xscrollcommand=x_scrollbar.set, yscrollcommand=y_scrollbar.set)
+
+        self.canvas.grid(row=0, column=0)
+        y_scrollbar.grid(row=0, column=1, sticky=tk.NS)
+        x_scrollbar.grid(row=1, column=0, sticky=tk.EW)
+
+        self.canvas.bind('<MouseWheel>', self._scroll_vertical)
+        self.canvas.bind('<Shift-MouseWheel>', self._scroll_horizontal)
+
+    def _scroll_vertical(self, event):
+        self.img_loader.yview('scroll', -event.delta // 120, 'units')
+
+    def _scroll_horizontal(self, event):
+        self.img_loader.xview('scroll', -event.delta // 120, 'units')
 
     def _draw_menu(self):
         logger.debug(F'Drawing Menu')
@@ -81,6 +107,22 @@ class ImgEditor():
         # Exit
         file_menu.add_command(label='Exit', command=self.exit)
         menubar.add_cascade(label='File', menu=file_menu)
+
+        # Undo and Redo
+        edit_menu = tk.Menu(menubar, tearoff=0)
+        edit_menu.add_command(label='Undo', accelerator='Ctrl+Z', command=self.undo)
+        edit_menu.add_command(label='Redo', accelerator='Ctrl+Y', command=self.redo)
+        menubar.add_cascade(label='Edit', menu=edit_menu)
+        self.root_window.bind('<Control-z>', lambda event: self.undo())
+        self.root_window.bind('<Control-y>', lambda event: self.redo())
+
+        # Profile a slow interaction on demand
+        if self.profiler is not None:
+            profile_menu = tk.Menu(menubar, tearoff=0)
+            profile_menu.add_command(label='Stop Profiling' if self.profiler.running else 'Start Profiling',
+                                     command=self.toggle_profiling)
+            menubar.add_cascade(label='Profile', menu=profile_menu)
+
         menubar.add_command(label='+ Text', command=self.add_text)
         menubar.add_command(label='+ Image Button', command=self.add_image_button)
         menubar.add_command(label='+ Input Box', command=self.add_input_box)
@@ -92,110 +134,6 @@ class ImgEditor():
 
         self.root_window.config(menu=menubar)
 
-        # Set our job to refresh screen data
-        self.root_window.after(1000, self._refresh_screen_data)
-
-    def _draw_navigation_options(self):  # pylint: disable=too-many-locals
-        # Remove existing frames to redraw
-        for menu_widget in self.menu_widgets:
-            menu_widget.destroy()
-
-        row = 0
-        for widget in self.img_loader.widgets.values():
-            row += 1
-            col = 0
-
-            frame = tk.Frame(self.root_window, width=self.root_window.winfo_width(),
-                             bg="SystemButtonFace", colormap="new")
-            frame.grid(row=row, columnspan=self.columnspan, sticky=tk.NSEW)
-
-            # Widget Description
-            text_col_span = 4
-            main_text = tk.Label(frame, text=str(widget), anchor=tk.W)
-            main_text.grid(row=row, column=col, columnspan=text_col_span, sticky=tk.W)
-            frame.grid_columnconfigure(col, weight=2)
-            col += text_col_span
-
-            # Image Button Specific Menus
-            if widget.widget_type == WidgetType.BUTTON:
-                button = tk.Button(
-                    frame, borderwidth=1, text='+ Img',
-                    command=partial(self.add_image_to_button, widget))
-                button.grid(row=row, column=col, sticky=tk.NSEW)
-                col += 1
-
-                button = tk.Button(
-                    frame, borderwidth=1, text='- Img',
-                    command=partial(self.remove_current_image, widget))
-                button.grid(row=row, column=col, sticky=tk.NSEW)
-                col += 1
-
-            # Input box Specific
-            if widget.widget_type == WidgetType.INPUT_BOX:
-                def test_inputbox_callback(*, widget, text):
-                    logger.info(F'Callback called for Input Box "{widget}" with value "{text}"')
-                widget.add_callback(input_confirm_callback=test_inputbox_callback)
-
-                button = tk.Button(
-                    frame, borderwidth=1, text='Width',
-                    command=partial(self.set_input_box_width, widget))
-                button.grid(row=row, column=col, sticky=tk.NSEW)
-                col += 1
-
-            # Raise the Widget
-            button = tk.Button(frame, borderwidth=1, text='Raise', command=widget.lift)
-            button.grid(row=row, column=col, sticky=tk.NSEW)
-            col += 1
-
-            # Adding/Removing Labels
-            if not widget.label:
-                button = tk.Button(
-                    frame, borderwidth=1, text='+ Label',
-                    command=partial(self.add_widget_label, widget))
-            else:
-                button = tk.Button(
-                    frame, borderwidth=1, text=F'- Label',
-                    command=partial(self.remove_widget_label, widget))
-
-            button.grid(row=row, column=col, sticky=tk.NSEW)
-            col += 1
-
-            # Text Moving Navigation
-            nav_intervals = [50, 10, 1]
-            for interval in nav_intervals:
-                # Large Nav Text
-                label = tk.Label(frame, text=F'Move {interval}')
-                label.grid(row=row, column=col, sticky=tk.NSEW)
-                col += 1
-
-                # Large Nav Buttons
-                for direction in NAV_DIRECTIONS:
-                    button = tk.Button(
-                        frame, borderwidth=1, text=direction[0],
-                        command=partial(
-                            self.move_widget_by,
-                            direction[1] * interval,
-                            direction[2] * interval,
-                            widget=widget,
-                            main_text_label=main_text))
-                    button.grid(row=row, column=col, sticky=tk.NSEW)
-                    col += 1
-
-            # Remove Button
-            remove_button = tk.Button(
-                frame, borderwidth=1, text='Del',
-                command=partial(self.remove_widget, widget))
-            remove_button.grid(row=row, column=col, sticky=tk.NSEW)
-            row += 1
-
-            self.menu_widgets.append(frame)
-
-            # Draw the separatpr
-            sep = ttk.Separator(self.root_window, orient=tk.HORIZONTAL)
-            sep.grid(column=0, row=row, columnspan=self.columnspan, sticky='ew')
-
-            self.menu_widgets.append(sep)
-
     def _open_background_image(self):
         file_path = ask_image_filepath('Select the Background Image', self.working_dir)
         if file_path:
@@ -217,10 +155,12 @@ class ImgEditor():
                 filetypes=(('Save Config', '.json'),))
             if config_path:
                 self.img_loader.load_config_file(config_path)
+                for widget in self.img_loader.widgets.values():
+                    self._init_widget(widget)
 
                 # Draw Editor Parts
                 self._draw_menu()  # To enable Insert Box
-                self._draw_navigation_options()
+                self.widget_panel.set_widgets(self.img_loader.widgets.values())
 
     def _save_config(self):
         config_path = self.img_loader.config_path
@@ -234,6 +174,12 @@ class ImgEditor():
                 config_path += '.json'
             self.img_loader.save_config_to_file(config_path)
 
+    def toggle_profiling(self):
+        report_path = self.profiler.toggle()
+        self._draw_menu()
+        if report_path:
+            messagebox.showinfo('Profile Saved', F'Profile written to "{report_path}"')
+
     def _get_rel_path(self, path):
         return os.path.relpath(path, self.working_dir)
 
@@ -248,37 +194,62 @@ class ImgEditor():
             logger.debug('Exit Application')
             self.root_window.quit()
 
-    def move_widget_by(self, move_x, move_y, *, widget, main_text_label):  # pylint: disable=no-self-use
-        widget.move_by(move_x=move_x, move_y=move_y)
-        main_text_label.config(text=str(widget))
+    def _init_widget(self, widget):  # pylint: disable=no-self-use
+        if widget.widget_type == WidgetType.INPUT_BOX:
+            def test_inputbox_callback(*, widget, text):
+                logger.info(F'Callback called for Input Box "{widget}" with value "{text}"')
+            widget.add_callback(input_confirm_callback=test_inputbox_callback)
+
+    def _widget_added(self, widget):
+        self._init_widget(widget)
+        self.widget_panel.add_widget(widget)
+
+    def move_widget_by(self, move_x, move_y, *, widget):
+        # Repeated clicks before the next idle only move the canvas item once
+        with self.img_loader.batch():
+            widget.move_by(move_x=move_x, move_y=move_y)
+        self.widget_panel.refresh_widget(widget)
+
+    def lift_widget(self, widget):
+        self.img_loader.lift_widget(widget)
 
     def remove_widget(self, widget):
         self.img_loader.remove_widget(widget)
-        self._draw_navigation_options()
+        self.widget_panel.remove_widget(widget)
+
+    def toggle_widget_label(self, widget):
+        if widget.label:
+            self.remove_widget_label(widget)
+        else:
+            self.add_widget_label(widget)
 
     def add_widget_label(self, widget):
         answer = simpledialog.askstring("Input", "Enter Widget Label",
                                         parent=self.root_window)
 
         if answer:
-            widget.label = answer
+            try:
+                widget.label = answer
+            except ValueError as error:
+                messagebox.showerror('Error', error)
+                return
 
             # Draw Editor Parts
-            self._draw_navigation_options()
+            self.widget_panel.refresh_widget(widget)
 
     def remove_widget_label(self, widget):
         widget.label = None
-        self._draw_navigation_options()
+        self.widget_panel.refresh_widget(widget)
 
     # Text Related Options
     def add_text(self):
         answer = simpledialog.askstring("Input", "Enter the text to add",
                                         parent=self.root_window)
         if answer:
-            self.img_loader.add_text(text=answer, pos_x=100, pos_y=100)
+            widget = self.img_loader.add_text(text=answer, pos_x=100, pos_y=100)
 
             # Draw Editor Parts
-            self._draw_navigation_options()
+            self._widget_added(widget)
 
     # Button Related Data
     def add_image_button(self):
@@ -299,7 +270,7 @@ class ImgEditor():
             button.add_image_callback(button_release_func=test_release_callback)
 
             # Draw Editor Parts
-            self._draw_navigation_options()
+            self._widget_added(button)
 
         else:
             messagebox.showerror('Error', F'At least 1 image needs to be selected')
@@ -308,26 +279,44 @@ class ImgEditor():
         file_path_tuple = ask_multi_image_filepath('Select the Button Images', self.working_dir)
         if file_path_tuple:
             img_list = [self._get_rel_path(file_path) for file_path in file_path_tuple]
-            widget.add_new_images(img_list)
+            # One undo step for the new images and switching to them
+            with self.img_loader.batch():
+                widget.add_new_images(img_list)
 
     def remove_current_image(self, widget):
         try:
-            deleted = widget.remove_current_image()
-            if deleted:
-                self._draw_navigation_options()
+            with self.img_loader.batch():
+                widget.remove_current_image()
         except ValueError as error:
             messagebox.showerror('Warning', error)
 
+    def undo(self):
+        self._apply_history(self.img_loader.undo)
+
+    def redo(self):
+        self._apply_history(self.img_loader.redo)
+
+    def _apply_history(self, step):
+        try:
+            applied = step()
+        except ValueError as error:
+            messagebox.showerror('Error', error)
+            return
+
+        if applied:
+            # Widgets may have come and gone, the panel only rebinds the rows in view
+            self.widget_panel.set_widgets(self.img_loader.widgets.values())
+
     # Input Box Related Options
     def add_input_box(self):
         width = simpledialog.askinteger(
             'Input', 'Input Box Width?', parent=self.root_window, minvalue=0)
 
         if width:
-            self.img_loader.add_input_box(pos_x=100, pos_y=100, width=width)
+            widget = self.img_loader.add_input_box(pos_x=100, pos_y=100, width=width)
 
             # Draw Editor Parts
-            self._draw_navigation_options()
+            self._widget_added(widget)
 
     def set_input_box_width(self, widget):
         width = simpledialog.askinteger(
@@ -336,15 +325,19 @@ class ImgEditor():
         if width:
             widget.width = width
 
+    def _drawer_changed(self, *, drawer, change):  # pylint: disable=unused-argument
+        # Several changes usually come together, refresh once they are done
+        if self._title_job is None:
+            self._title_job = self.root_window.after_idle(self._refresh_screen_data)
+
     def _refresh_screen_data(self):
-        # https://riptutorial.com/tkinter/example/22870/-after--
+        self._title_job = None
 
         dims = self.img_loader.dimensions
         resolution = F'{dims[0]} x {dims[1]}'
+        unsaved = '*' if self.img_loader.unsaved_changes else ''
 
-        self.root_window.title(F'Resolution: {resolution}, Config: "{self.img_loader.config_path}"')
-
-        self.root_window.after(1000, self._refresh_screen_data)
+        self.root_window.title(F'{unsaved}Resolution: {resolution}, Config: "{self.img_loader.config_path}"')
 
 
 def ask_directory(title):
@@ -363,7 +356,23 @@ def ask_multi_image_filepath(title, initial_dir):
         filetypes=(('Image files', '.bmp .gif .jpg .jpeg .png'),))
 
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Edit tkimgloader configs')
+    parser.add_argument('--viewport', action='store_true',
+                        help='Scroll over the layout, only drawing the widgets in view')
+    parser.add_argument('--tiled-background', action='store_true',
+                        help='Split the background into tiles, only decoding the ones in view, needs --viewport')
+    parser.add_argument('--profile', nargs='?', const='auto', choices=PROFILE_BACKENDS, default=backend_from_env(),
+                        help='Profile the whole session, also enabled by the TKIMGLOADER_PROFILE environment variable')
+    args = parser.parse_args(argv)
+    if args.tiled_background and not args.viewport:
+        parser.error('--tiled-background needs --viewport')
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
     log_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs')
     if not os.path.exists(log_dir):
         os.makedirs(log_dir)
@@ -378,10 +387,19 @@ def main():
     logger.debug('Working Dir Selected: "{working_dir}"')
     if working_dir:
 
+        # Reports go next to the debug log, profiling can also be started from the menu later
+        profiler = SessionProfiler(log_dir, backend=args.profile or 'auto')
+
         with ChangeDir(working_dir):
             root.deiconify()
-            ImgEditor(root, working_dir)
-            root.mainloop()
+            ImgEditor(root, working_dir, viewport=args.viewport, tiled_background=args.tiled_background,
+                      profiler=profiler)
+            if args.profile:
+                profiler.start()
+            try:
+                root.mainloop()
+            finally:
+                profiler.stop()
     else:
         root.quit()
 
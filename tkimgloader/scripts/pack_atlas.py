@@ -0,0 +1,23 @@
+import argparse
+import os
+
+from tkimgloader.atlas import DEFAULT_MAX_ATLAS_SIZE, pack_config_atlas
+from tkimgloader.config_io import load_config
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pack the button images of a config into atlas images')
+    parser.add_argument('config', help='Config file whose button images are packed')
+    parser.add_argument('output_dir', help='Directory to write the atlases and their index to')
+    parser.add_argument('--name', default='atlas', help='Base name of the atlas files')
+    parser.add_argument('--base-dir', default=os.curdir, help='Directory the image paths are relative to')
+    parser.add_argument('--max-size', type=int, default=DEFAULT_MAX_ATLAS_SIZE, help='Maximum atlas width/height')
+    args = parser.parse_args(argv)
+
+    index_path = pack_config_atlas(load_config(args.config), args.output_dir, name=args.name,
+                                   base_dir=args.base_dir, max_size=args.max_size)
+    print(F'Atlas index written to "{index_path}"')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+import cProfile
+import logging
+import os
+import time
+
+try:
+    import pyinstrument
+except ImportError:
+    pyinstrument = None  # pylint: disable=invalid-name
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+PROFILE_ENV_VAR = 'TKIMGLOADER_PROFILE'
+BACKENDS = ('auto', 'pyinstrument', 'cprofile')
+
+
+def calc_backend(backend='auto'):
+    if backend not in BACKENDS:
+        raise ValueError(F'Invalid profiler "{backend}", must be one of {BACKENDS}')
+    if backend == 'auto':
+        return 'pyinstrument' if pyinstrument is not None else 'cprofile'
+    if backend == 'pyinstrument' and pyinstrument is None:
+        logger.warning('pyinstrument is not installed, falling back to cProfile')
+        return 'cprofile'
+    return backend
+
+
+def backend_from_env(environ=None):
+    # Any value other than empty or "0" turns profiling on, a backend name also picks the profiler
+    value = (os.environ if environ is None else environ).get(PROFILE_ENV_VAR, '').strip().lower()
+    if value in ('', '0'):
+        return None
+    return value if value in BACKENDS else 'auto'
+
+
+class SessionProfiler():
+    def __init__(self, report_dir, *, backend='auto'):
+        self.report_dir = report_dir
+        self.backend = calc_backend(backend)
+        self.report_paths = []
+        self._profiler = None
+        self._session = 0
+
+    @property
+    def running(self):
+        return self._profiler is not None
+
+    def start(self):
+        if self.running:
+            return
+
+        if self.backend == 'pyinstrument':
+            self._profiler = pyinstrument.Profiler()
+            self._profiler.start()
+        else:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        logger.info(F'Started profiling with {self.backend}')
+
+    def stop(self):
+        if not self.running:
+            return None
+
+        profiler, self._profiler = self._profiler, None
+        self._session += 1
+        if not os.path.exists(self.report_dir):
+            os.makedirs(self.report_dir)
+        base_path = os.path.join(self.report_dir, F'profile_{time.strftime("%Y.%m.%d_%H-%M-%S")}_{self._session}')
+
+        if self.backend == 'pyinstrument':
+            profiler.stop()
+            report_path = base_path + '.html'
+            with open(report_path, 'w', encoding='utf-8') as file_ptr:
+                file_ptr.write(profiler.output_html())
+        else:
+            profiler.disable()
+            report_path = base_path + '.pstats'
+            profiler.dump_stats(report_path)
+
+        self.report_paths.append(report_path)
+        logger.info(F'Profile written to "{report_path}"')
+        return report_path
+
+    def toggle(self):
+        if self.running:
+            return self.stop()
+        self.start()
+        return None
@@ -0,0 +1,96 @@
+import argparse
+import concurrent.futures
+import glob
+import os
+import time
+
+from tkimgloader.renderer import DEFAULT_MAX_IMAGE_BYTES, ConfigRenderer
+
+DEFAULT_PATTERN = '*.json'
+
+_RENDERER = None
+
+
+def collect_config_paths(inputs, *, pattern=DEFAULT_PATTERN):
+    config_paths = []
+    for input_path in inputs:
+        if os.path.isdir(input_path):
+            config_paths.extend(sorted(glob.glob(os.path.join(input_path, pattern))))
+        else:
+            config_paths.extend(sorted(glob.glob(input_path)))
+    return list(dict.fromkeys(config_paths))
+
+
+def calc_output_path(config_path, output_dir):
+    base_name = os.path.splitext(os.path.basename(config_path))[0] + '.png'
+    if output_dir:
+        return os.path.join(output_dir, base_name)
+    return os.path.join(os.path.dirname(config_path), base_name)
+
+
+def _init_worker(base_dir, max_image_bytes):
+    # One renderer per worker so shared assets are only decoded once per process
+    global _RENDERER  # pylint: disable=global-statement
+    _RENDERER = ConfigRenderer(base_dir=base_dir, max_image_bytes=max_image_bytes)
+
+
+def _render_file(config_path, output_path):
+    start = time.perf_counter()
+    try:
+        _RENDERER.render_file(config_path, output_path)
+    except Exception as error:  # pylint: disable=broad-except
+        return config_path, output_path, time.perf_counter() - start, F'{type(error).__name__}: {error}'
+    return config_path, output_path, time.perf_counter() - start, None
+
+
+def render_files(config_paths, *, output_dir=None, base_dir=os.curdir, workers=None,
+                 max_image_bytes=DEFAULT_MAX_IMAGE_BYTES):
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    results = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                                initargs=(base_dir, max_image_bytes)) as executor:
+        futures = [executor.submit(_render_file, config_path, calc_output_path(config_path, output_dir))
+                   for config_path in config_paths]
+        for future in concurrent.futures.as_completed(futures):
+            config_path, output_path, seconds, error = future.result()
+            if error:
+                print(F'{seconds * 1000:>9.1f} ms  FAILED {config_path}: {error}')
+            else:
+                print(F'{seconds * 1000:>9.1f} ms  {config_path} -> {output_path}')
+            results.append((config_path, output_path, seconds, error))
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render config files to PNG previews')
+    parser.add_argument('inputs', nargs='+', help='Config files, directories or glob patterns')
+    parser.add_argument('--pattern', default=DEFAULT_PATTERN, help='Config file pattern used in directories')
+    parser.add_argument('--output-dir', help='Directory for the PNGs, defaults to next to each config')
+    parser.add_argument('--base-dir', default=os.curdir, help='Directory the image paths are relative to')
+    parser.add_argument('--workers', type=int, help='Number of worker processes, defaults to the CPU count')
+    parser.add_argument('--image-cache-mb', type=int, default=DEFAULT_MAX_IMAGE_BYTES // (1024 * 1024),
+                        help='Decoded images each worker keeps between configs, in MB')
+    args = parser.parse_args(argv)
+
+    config_paths = collect_config_paths(args.inputs, pattern=args.pattern)
+    if not config_paths:
+        print('No config files found')
+        return 1
+
+    start = time.perf_counter()
+    results = render_files(config_paths, output_dir=args.output_dir, base_dir=args.base_dir,
+                           workers=args.workers, max_image_bytes=args.image_cache_mb * 1024 * 1024)
+    elapsed = time.perf_counter() - start
+
+    failed = [result for result in results if result[3]]
+    print(F'Rendered {len(results) - len(failed)} of {len(results)} configs in {elapsed:.2f} s '
+          F'({len(results) / elapsed:.1f} configs/s)')
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,216 @@
+import logging
+
+from functools import partial
+
+import tkinter as tk
+
+from tkimgloader.widgets import WidgetType
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+ROW_HEIGHT = 30
+PANEL_HEIGHT = 300
+NAV_INTERVALS = [50, 10, 1]
+NAV_DIRECTIONS = [
+    ('▲', 0, -1),
+    ('▼', 0, 1),
+    ('◀', -1, 0),
+    ('▶', 1, 0)]
+
+
+class _Row():
+    def __init__(self, panel, parent):
+        self.widget = None
+        self.window = None
+        self.frame = tk.Frame(parent)
+        editor = panel.editor
+        col = 0
+
+        # Widget Description
+        self.main_text = tk.Label(self.frame, anchor=tk.W, width=40)
+        self.main_text.grid(row=0, column=col, sticky=tk.W)
+        col += 1
+
+        # Image Button Specific
+        self.button_controls = []
+        for text, command in (('+ Img', editor.add_image_to_button), ('- Img', editor.remove_current_image)):
+            button = tk.Button(self.frame, borderwidth=1, text=text, command=partial(panel.run_command, self, command))
+            button.grid(row=0, column=col, sticky=tk.NSEW)
+            self.button_controls.append(button)
+            col += 1
+
+        # Input box Specific
+        button = tk.Button(self.frame, borderwidth=1, text='Width',
+                           command=partial(panel.run_command, self, editor.set_input_box_width))
+        button.grid(row=0, column=col, sticky=tk.NSEW)
+        self.input_box_controls = [button]
+        col += 1
+
+        # Raise the Widget
+        button = tk.Button(self.frame, borderwidth=1, text='Raise',
+                           command=partial(panel.run_command, self, editor.lift_widget))
+        button.grid(row=0, column=col, sticky=tk.NSEW)
+        col += 1
+
+        # Adding/Removing Labels
+        self.label_button = tk.Button(self.frame, borderwidth=1,
+                                      command=partial(panel.run_command, self, editor.toggle_widget_label))
+        self.label_button.grid(row=0, column=col, sticky=tk.NSEW)
+        col += 1
+
+        # Moving Navigation
+        for interval in NAV_INTERVALS:
+            label = tk.Label(self.frame, text=F'Move {interval}')
+            label.grid(row=0, column=col, sticky=tk.NSEW)
+            col += 1
+
+            for text, move_x, move_y in NAV_DIRECTIONS:
+                command = partial(editor.move_widget_by, move_x * interval, move_y * interval)
+                button = tk.Button(self.frame, borderwidth=1, text=text,
+                                   command=partial(panel.run_command, self, command))
+                button.grid(row=0, column=col, sticky=tk.NSEW)
+                col += 1
+
+        # Remove Button
+        button = tk.Button(self.frame, borderwidth=1, text='Del',
+                           command=partial(panel.run_command, self, editor.remove_widget))
+        button.grid(row=0, column=col, sticky=tk.NSEW)
+
+    def bind(self, widget):
+        self.widget = widget
+        self.main_text.config(text=str(widget))
+        self.label_button.config(text='- Label' if widget.label else '+ Label')
+
+        for control in self.button_controls:
+            if widget.widget_type == WidgetType.BUTTON:
+                control.grid()
+            else:
+                control.grid_remove()
+        for control in self.input_box_controls:
+            if widget.widget_type == WidgetType.INPUT_BOX:
+                control.grid()
+            else:
+                control.grid_remove()
+
+
+class WidgetPanel():
+    def __init__(self, parent, editor, *, height=PANEL_HEIGHT):
+        self.editor = editor
+        self.frame = tk.Frame(parent)
+        self.canvas = tk.Canvas(self.frame, height=height, highlightthickness=0, yscrollincrement=ROW_HEIGHT)
+        scrollbar = tk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.yview)
+        self.canvas.config(yscrollcommand=scrollbar.set)
+
+        self.canvas.grid(row=0, column=0, sticky=tk.NSEW)
+        scrollbar.grid(row=0, column=1, sticky=tk.NS)
+        self.frame.grid_columnconfigure(0, weight=1)
+
+        self.canvas.bind('<Configure>', self._resized)
+        self.canvas.bind('<MouseWheel>', self._scroll)
+
+        self._widgets = []
+        self._indexes = {}
+        self._rows = {}
+        self._spare_rows = []
+        self._update_job = None
+
+    def __len__(self):
+        return len(self._widgets)
+
+    @property
+    def realised_rows(self):
+        return len(self._rows)
+
+    def set_widgets(self, widgets):
+        for index in list(self._rows):
+            self._hide_row(index)
+
+        self._widgets = list(widgets)
+        self._indexes = {id(widget): index for index, widget in enumerate(self._widgets)}
+        self._update_scrollregion()
+        self.update_rows()
+
+    def add_widget(self, widget):
+        self._indexes[id(widget)] = len(self._widgets)
+        self._widgets.append(widget)
+        self._update_scrollregion()
+        self.update_rows()
+
+    def remove_widget(self, widget):
+        index = self._indexes.pop(id(widget))
+        del self._widgets[index]
+        for later_index in range(index, len(self._widgets)):
+            self._indexes[id(self._widgets[later_index])] = later_index
+
+        # Rows from here on show a different widget now, rebind them
+        for row_index in [row_index for row_index in self._rows if row_index >= index]:
+            self._hide_row(row_index)
+        self._update_scrollregion()
+        self.update_rows()
+
+    def refresh_widget(self, widget):
+        row = self._rows.get(self._indexes.get(id(widget)))
+        if row is not None:
+            row.bind(widget)
+
+    def run_command(self, row, command):
+        if row.widget is not None:
+            command(widget=row.widget)
+
+    def yview(self, *args):
+        self.canvas.yview(*args)
+        self.schedule_update()
+
+    def schedule_update(self):
+        if self._update_job is None:
+            self._update_job = self.canvas.after_idle(self.update_rows)
+
+    def update_rows(self):
+        if self._update_job is not None:
+            self.canvas.after_cancel(self._update_job)
+            self._update_job = None
+
+        first, last = self._calc_visible_range()
+        for index in [index for index in self._rows if not first <= index < last]:
+            self._hide_row(index)
+        for index in range(first, last):
+            if index not in self._rows:
+                self._show_row(index)
+
+    def _calc_visible_range(self):
+        height = self.canvas.winfo_height()
+        if height <= 1:
+            height = int(self.canvas.cget('height'))
+
+        top = int(self.canvas.canvasy(0))
+        first = max(top // ROW_HEIGHT, 0)
+        last = min((top + height) // ROW_HEIGHT + 1, len(self._widgets))
+        return first, last
+
+    def _show_row(self, index):
+        # Rows scrolled away are reused, scrolling never creates Tk widgets once the panel is filled
+        if self._spare_rows:
+            row = self._spare_rows.pop()
+        else:
+            row = _Row(self, self.canvas)
+            row.window = self.canvas.create_window(0, 0, window=row.frame, anchor=tk.NW)
+
+        row.bind(self._widgets[index])
+        self.canvas.coords(row.window, 0, index * ROW_HEIGHT)
+        self.canvas.itemconfigure(row.window, state=tk.NORMAL)
+        self._rows[index] = row
+
+    def _hide_row(self, index):
+        row = self._rows.pop(index)
+        row.widget = None
+        self.canvas.itemconfigure(row.window, state=tk.HIDDEN)
+        self._spare_rows.append(row)
+
+    def _update_scrollregion(self):
+        self.canvas.config(scrollregion=(0, 0, 0, len(self._widgets) * ROW_HEIGHT))
+
+    def _resized(self, event):  # pylint: disable=unused-argument
+        self.schedule_update()
+
+    def _scroll(self, event):
+        self.yview('scroll', -event.delta // 120, 'units')
@@ -0,0 +1,146 @@
+import collections
+import heapq
+import itertools
+import math
+
+DEFAULT_CELL_SIZE = 128
+
+
+def normalise_bounds(bounds):
+    # Bounds are half open (x1, y1, x2, y2), anything empty still covers a single pixel
+    pos_x1, pos_y1, pos_x2, pos_y2 = bounds
+    return (pos_x1, pos_y1, max(pos_x2, pos_x1 + 1), max(pos_y2, pos_y1 + 1))
+
+
+def bounds_intersect(bounds1, bounds2):
+    return (bounds1[0] < bounds2[2] and bounds2[0] < bounds1[2] and
+            bounds1[1] < bounds2[3] and bounds2[1] < bounds1[3])
+
+
+def _distance_to_bounds(pos_x, pos_y, bounds):
+    delta_x = max(bounds[0] - pos_x, 0, pos_x - (bounds[2] - 1))
+    delta_y = max(bounds[1] - pos_y, 0, pos_y - (bounds[3] - 1))
+    return math.hypot(delta_x, delta_y)
+
+
+class SpatialIndex():
+    def __init__(self, *, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells = collections.defaultdict(dict)
+        self._bounds = {}
+        self._items = {}
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item):
+        return id(item) in self._items
+
+    def bounds(self, item):
+        return self._bounds.get(id(item))
+
+    def _cell_range(self, bounds):
+        return (range(math.floor(bounds[0] / self.cell_size), math.floor((bounds[2] - 1) / self.cell_size) + 1),
+                range(math.floor(bounds[1] / self.cell_size), math.floor((bounds[3] - 1) / self.cell_size) + 1))
+
+    def insert(self, item, bounds):
+        item_id = id(item)
+        if item_id in self._items:
+            self.remove(item)
+
+        bounds = normalise_bounds(bounds)
+        self._items[item_id] = item
+        self._bounds[item_id] = bounds
+
+        cols, rows = self._cell_range(bounds)
+        for cell in itertools.product(cols, rows):
+            self._cells[cell][item_id] = item
+
+    def update(self, item, bounds):
+        if normalise_bounds(bounds) != self._bounds.get(id(item)):
+            self.insert(item, bounds)
+
+    def remove(self, item):
+        item_id = id(item)
+        if item_id not in self._items:
+            return
+
+        cols, rows = self._cell_range(self._bounds[item_id])
+        for cell in itertools.product(cols, rows):
+            del self._cells[cell][item_id]
+            if not self._cells[cell]:
+                del self._cells[cell]
+
+        del self._items[item_id]
+        del self._bounds[item_id]
+
+    def query_point(self, pos_x, pos_y):
+        cell = (math.floor(pos_x / self.cell_size), math.floor(pos_y / self.cell_size))
+        return [item for item_id, item in self._cells.get(cell, {}).items()
+                if self._bounds[item_id][0] <= pos_x < self._bounds[item_id][2] and
+                self._bounds[item_id][1] <= pos_y < self._bounds[item_id][3]]
+
+    def query_rect(self, rect):
+        rect = normalise_bounds(rect)
+        found = {}
+        cols, rows = self._cell_range(rect)
+        if len(cols) * len(rows) > len(self._cells):
+            # Bigger than the populated area, cheaper to check the occupied cells only
+            cells = [items for cell, items in self._cells.items() if cell[0] in cols and cell[1] in rows]
+        else:
+            cells = [self._cells[cell] for cell in itertools.product(cols, rows) if cell in self._cells]
+
+        for items in cells:
+            for item_id, item in items.items():
+                if item_id not in found and bounds_intersect(self._bounds[item_id], rect):
+                    found[item_id] = item
+        return list(found.values())
+
+    def nearest(self, pos_x, pos_y, *, count=1):
+        if not self._items:
+            return []
+
+        centre_col = math.floor(pos_x / self.cell_size)
+        centre_row = math.floor(pos_y / self.cell_size)
+        max_ring = max(max(abs(col - centre_col), abs(row - centre_row)) for col, row in self._cells)
+
+        # Search rings of cells outwards until nothing unvisited can be closer than what was found
+        best = []
+        seen = set()
+        for ring in range(max_ring + 1):
+            for cell in _ring_cells(centre_col, centre_row, ring):
+                for item_id, item in self._cells.get(cell, {}).items():
+                    if item_id not in seen:
+                        seen.add(item_id)
+                        distance = _distance_to_bounds(pos_x, pos_y, self._bounds[item_id])
+                        heapq.heappush(best, (distance, len(seen), item))
+
+            if len(best) >= count:
+                nearest = heapq.nsmallest(count, best)
+                if nearest[-1][0] <= ring * self.cell_size:
+                    break
+
+        return [item for _, _, item in heapq.nsmallest(count, best)]
+
+    def overlaps(self):
+        pairs = {}
+        for items in self._cells.values():
+            item_ids = sorted(items)
+            for item_id1, item_id2 in itertools.combinations(item_ids, 2):
+                if (item_id1, item_id2) not in pairs and \
+                        bounds_intersect(self._bounds[item_id1], self._bounds[item_id2]):
+                    pairs[(item_id1, item_id2)] = (self._items[item_id1], self._items[item_id2])
+        return list(pairs.values())
+
+
+def _ring_cells(centre_col, centre_row, ring):
+    if ring == 0:
+        yield (centre_col, centre_row)
+        return
+
+    for col in range(centre_col - ring, centre_col + ring + 1):
+        yield (col, centre_row - ring)
+        yield (col, centre_row + ring)
+    for row in range(centre_row - ring + 1, centre_row + ring):
+        yield (centre_col - ring, row)
+        yield (centre_col + ring, row)
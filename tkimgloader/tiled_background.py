@@ -0,0 +1,159 @@
+import contextlib
+import itertools
+import logging
+import math
+import os
+import shutil
+import tempfile
+import uuid
+
+import tkinter as tk
+
+from PIL import Image
+
+from tkimgloader.config_io import dump_json, load_json
+from tkimgloader.disk_cache import hash_file
+from tkimgloader.image_cache import get_shared_cache
+from tkimgloader.metrics import timed_call
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+DEFAULT_TILE_SIZE = 512
+DEFAULT_TILE_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'tkimgloader_tiles')
+DEFAULT_KEEP_TILES = 1
+TILE_INDEX_FILE = 'tiles.json'
+BACKGROUND_TAG = 'background'
+
+_TILE_DIRS = {}
+
+
+def _tile_name(col, row):
+    return F'{col}_{row}.png'
+
+
+def calc_tile_dir(image_path, *, cache_dir=DEFAULT_TILE_CACHE_DIR, tile_size=DEFAULT_TILE_SIZE):
+    # Keyed by content, a changed background is split again into a new directory
+    stat = os.stat(image_path)
+    identity = (os.path.abspath(image_path), stat.st_mtime_ns, stat.st_size)
+    content_hash = _TILE_DIRS.get(identity)
+    if content_hash is None:
+        content_hash = hash_file(image_path)
+        _TILE_DIRS[identity] = content_hash
+    return os.path.join(cache_dir, F'{content_hash}_{tile_size}')
+
+
+@contextlib.contextmanager
+def _trusted_image_size():
+    # Backgrounds are local files picked by the user, big enough ones are why tiles exist at all
+    max_pixels = Image.MAX_IMAGE_PIXELS
+    Image.MAX_IMAGE_PIXELS = None
+    try:
+        yield
+    finally:
+        Image.MAX_IMAGE_PIXELS = max_pixels
+
+
+def split_tiles(image_path, tile_dir, *, tile_size=DEFAULT_TILE_SIZE):
+    logger.debug(F'Splitting "{image_path}" into {tile_size}px tiles in "{tile_dir}"')
+
+    # Split next to the target and rename, so a half split directory is never used
+    temp_dir = F'{tile_dir}.{uuid.uuid4().hex}.tmp'
+    os.makedirs(temp_dir)
+    try:
+        with _trusted_image_size(), Image.open(image_path) as image:
+            # PNG is one compressed stream and PIL has no region decode for it, the pixels are
+            # decoded once and only converted tile by tile so there is never a second full copy
+            image.load()
+            width, height = image.size
+            for col, row in itertools.product(range(math.ceil(width / tile_size)),
+                                              range(math.ceil(height / tile_size))):
+                box = (col * tile_size, row * tile_size,
+                       min((col + 1) * tile_size, width), min((row + 1) * tile_size, height))
+                tile = image.crop(box)
+                if tile.mode not in ('RGB', 'RGBA'):
+                    tile = tile.convert('RGBA')
+                tile.save(os.path.join(temp_dir, _tile_name(col, row)), compress_level=1)
+
+        index = {'width': width, 'height': height, 'tile_size': tile_size}
+        dump_json(os.path.join(temp_dir, TILE_INDEX_FILE), index)
+
+        try:
+            os.rename(temp_dir, tile_dir)
+        except OSError:
+            # Someone else split the same image first
+            logger.debug(F'Tiles "{tile_dir}" already exist')
+    finally:
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return index
+
+
+def load_tile_index(image_path, *, cache_dir=DEFAULT_TILE_CACHE_DIR, tile_size=DEFAULT_TILE_SIZE):
+    tile_dir = calc_tile_dir(image_path, cache_dir=cache_dir, tile_size=tile_size)
+    try:
+        index = load_json(os.path.join(tile_dir, TILE_INDEX_FILE))
+    except (OSError, ValueError):
+        os.makedirs(cache_dir, exist_ok=True)
+        index = split_tiles(image_path, tile_dir, tile_size=tile_size)
+    return tile_dir, index
+
+
+class TiledBackground():
+    def __init__(self, canvas, path, *, tile_size=DEFAULT_TILE_SIZE, cache_dir=DEFAULT_TILE_CACHE_DIR,
+                 keep_tiles=DEFAULT_KEEP_TILES):
+        self.canvas = canvas
+        self.path = path
+        self.keep_tiles = keep_tiles
+        self.tile_dir, index = load_tile_index(path, cache_dir=cache_dir, tile_size=tile_size)
+        self.width = index['width']
+        self.height = index['height']
+        self.tile_size = index['tile_size']
+        self.cols = math.ceil(self.width / self.tile_size)
+        self.rows = math.ceil(self.height / self.tile_size)
+        self._tiles = {}
+
+    @property
+    def size(self):
+        return (self.width, self.height)
+
+    @property
+    def loaded_tiles(self):
+        return sorted(self._tiles)
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def _tile_range(self, rect, extra=0):
+        return (range(max(math.floor(rect[0] / self.tile_size) - extra, 0),
+                      min(math.floor((rect[2] - 1) / self.tile_size) + 1 + extra, self.cols)),
+                range(max(math.floor(rect[1] / self.tile_size) - extra, 0),
+                      min(math.floor((rect[3] - 1) / self.tile_size) + 1 + extra, self.rows)))
+
+    def show(self, rect):
+        for tile in itertools.product(*self._tile_range(rect)):
+            if tile not in self._tiles:
+                self._load_tile(tile)
+
+        # Tiles just off screen stay around for small scrolls, anything further goes back to the cache
+        keep = set(itertools.product(*self._tile_range(rect, extra=self.keep_tiles)))
+        for tile in [tile for tile in self._tiles if tile not in keep]:
+            self._unload_tile(tile)
+
+    def destroy(self):
+        for tile in list(self._tiles):
+            self._unload_tile(tile)
+
+    def _load_tile(self, tile):
+        col, row = tile
+        photo = get_shared_cache().acquire(os.path.join(self.tile_dir, _tile_name(col, row)))
+        canvas_item = timed_call('canvas_create_image', self.canvas.create_image, col * self.tile_size,
+                                 row * self.tile_size, image=photo, anchor=tk.NW, tags=BACKGROUND_TAG)
+        # Tiles come in while scrolling, keep them under the widgets
+        self.canvas.tag_lower(canvas_item)
+        self._tiles[tile] = (canvas_item, photo)
+
+    def _unload_tile(self, tile):
+        canvas_item, photo = self._tiles.pop(tile)
+        self.canvas.delete(canvas_item)
+        get_shared_cache().release(photo)
@@ -2,7 +2,16 @@
 import enum
 import tkinter as tk
 
-from PIL import ImageTk
+from tkimgloader.image_cache import get_image_size, get_shared_cache
+from tkimgloader.metrics import timed, timed_call
+
+# Size estimates for widgets not drawn yet, roughly what Tk shows by default
+TEXT_CHAR_WIDTH = 7
+TEXT_HEIGHT = 15
+INPUT_BOX_CHAR_WIDTH = 7
+INPUT_BOX_DEFAULT_WIDTH = 15
+INPUT_BOX_PADDING = 4
+INPUT_BOX_HEIGHT = 20
 
 
 @enum.unique
@@ -21,15 +30,36 @@ class ButtonType(enum.Enum):
 
 
 class Widget():
+    __slots__ = ('canvas', 'change_callback', 'redraw_callback', '_label', '_widget_type', 'pos_x', 'pos_y',
+                 'canvas_widget')
+
     def __init__(self, *, label=None, widget_type, pos_x, pos_y):
         # Set Attributes
         self.canvas = None
-        self.label = label
+        self.change_callback = None
+        self.redraw_callback = None
+        self._label = label
         self.widget_type = widget_type
         self.pos_x = pos_x
         self.pos_y = pos_y
         self.canvas_widget = None
 
+    @property
+    def label(self):
+        return self._label
+
+    @label.setter
+    def label(self, label):
+        old_label = self._label
+        if label != old_label:
+            self._label = label
+            try:
+                self._changed('label', old_label)
+            except ValueError:
+                # Rejected by the owner, e.g. a duplicate label
+                self._label = old_label
+                raise
+
     @property
     def widget_type(self):
         return self._widget_type
@@ -59,10 +89,20 @@ class Widget():
     def lift(self):
         raise NotImplementedError
 
+    def calc_size(self):
+        raise NotImplementedError
+
+    def calc_bounds(self):
+        width, height = self.calc_size()
+        return (self.pos_x, self.pos_y, self.pos_x + width, self.pos_y + height)
+
     def move_to(self, *, pos_x, pos_y):
+        old_pos = (self.pos_x, self.pos_y)
         self.pos_x = pos_x
         self.pos_y = pos_y
-        self.redraw_widget()
+        self._redraw('position')
+        if old_pos != (pos_x, pos_y):
+            self._changed('position', old_pos)
 
     def move_by(self, *, move_x, move_y):
         self.move_to(pos_x=self.pos_x + move_x, pos_y=self.pos_y + move_y)
@@ -70,32 +110,60 @@ class Widget():
     def redraw_widget(self):
         raise NotImplementedError
 
+    def apply_redraw(self, part):
+        if part == 'position':
+            self.redraw_widget()
+
+    def _redraw(self, part):
+        # The owner may hold the redraw back to batch it with others
+        if self.redraw_callback:
+            self.redraw_callback(widget=self, part=part)
+        else:
+            self.apply_redraw(part)
+
+    def _changed(self, attribute, old_value):
+        if self.change_callback:
+            self.change_callback(widget=self, attribute=attribute, old_value=old_value)
+
 
 class CanvasWidget(Widget):  # pylint: disable=abstract-method
+    __slots__ = ()
+
     def destroy(self):
-        self.canvas.delete(self.canvas_widget)
+        # Widgets scrolled out of a viewport have nothing drawn
+        if self.canvas and self.canvas_widget is not None:
+            self.canvas.delete(self.canvas_widget)
 
     def redraw_widget(self):
         if self.canvas:
-            self.canvas.coords(self.canvas_widget, self.pos_x, self.pos_y)
+            timed_call('canvas_coords', self.canvas.coords, self.canvas_widget, self.pos_x, self.pos_y)
 
     def lift(self):
-        self.canvas.tag_raise(self.canvas_widget)
+        if self.canvas and self.canvas_widget is not None:
+            self.canvas.tag_raise(self.canvas_widget)
 
 
 class FloatingWidget(Widget):  # pylint: disable=abstract-method
+    __slots__ = ()
+
     def destroy(self):
-        self.canvas_widget.destroy()
+        if self.canvas_widget is not None:
+            self.canvas_widget.destroy()
 
     def redraw_widget(self):
         if self.canvas:
-            self.canvas_widget.place(x=self.pos_x, y=self.pos_y)
+            # Placed relative to the window, so take off how far the canvas is scrolled
+            self.canvas_widget.place(x=self.pos_x - int(self.canvas.canvasx(0)),
+                                     y=self.pos_y - int(self.canvas.canvasy(0)))
 
     def lift(self):
-        self.canvas_widget.lift()
+        if self.canvas_widget is not None:
+            self.canvas_widget.lift()
 
 
 class CanvasText(CanvasWidget):
+    __slots__ = ('text',)
+
     def __init__(self, *, label=None, text, pos_x, pos_y):
         self.text = text
         super().__init__(label=label, pos_x=pos_x, pos_y=pos_y, widget_type=WidgetType.TEXT)
@@ -108,14 +176,26 @@ class CanvasText(CanvasWidget):
         data_dict['text'] = self.text
         return data_dict
 
+    def calc_size(self):
+        if self.canvas and self.canvas_widget:
+            bbox = self.canvas.bbox(self.canvas_widget)
+            if bbox:
+                return (bbox[2] - bbox[0], bbox[3] - bbox[1])
+
+        lines = self.text.splitlines() or ['']
+        return (max(len(line) for line in lines) * TEXT_CHAR_WIDTH, len(lines) * TEXT_HEIGHT)
+
     def draw(self):
         if self.canvas:
-            self.canvas_widget = self.canvas.create_text(self.pos_x, self.pos_y, text=self.text, anchor=tk.NW,
-                                                         font='Times 10 italic bold')
+            self.canvas_widget = timed_call('canvas_create_text', self.canvas.create_text, self.pos_x, self.pos_y,
+                                            text=self.text, anchor=tk.NW, font='Times 10 italic bold')
 
 
 class CanvasImageButton(CanvasWidget):
-    def __init__(self, *, label=None, button_type, pos_x, pos_y, image_list, current_image=1):
+    __slots__ = ('_button_type', 'image_path_dic', 'current_image', 'images', 'release_callback', 'lazy',
+                 '_prefetch_job')
+
+    def __init__(self, *, label=None, button_type, pos_x, pos_y, image_list, current_image=1, lazy=False):
         if not image_list:
             raise ValueError('Image list cannot be empty')
 
@@ -125,6 +205,8 @@ class CanvasImageButton(CanvasWidget):
         self.current_image = current_image
         self.images = {}
         self.release_callback = None
+        self.lazy = lazy
+        self._prefetch_job = None
 
     @property
     def button_type(self):
@@ -143,21 +225,25 @@ class CanvasImageButton(CanvasWidget):
         data_dict = super().to_dict()
         data_dict['orig_image_on_release'] = self.button_type == ButtonType.RELEASE
         data_dict['current_image'] = self.current_image
-        data_dict['images'] = self.image_path_dic
+        data_dict['images'] = dict(self.image_path_dic)
         return data_dict
 
+    @timed('button_draw')
     def draw(self):
         if self.canvas:
-            # Setup all images
-            for img_path in self.image_path_dic.values():
-                if img_path not in self.images:
-                    self.images[img_path] = ImageTk.PhotoImage(file=img_path)
+            # Setup all images, in lazy mode only the one shown
+            if self.lazy:
+                self._load_image(self.image_path_dic[self.current_image])
+            else:
+                for img_path in self.image_path_dic.values():
+                    self._load_image(img_path)
 
             # Draw the current image
             current_img_path = self.image_path_dic[self.current_image]
             current_img = self.images[current_img_path]
 
-            self.canvas_widget = self.canvas.create_image(self.pos_x, self.pos_y, image=current_img)
+            self.canvas_widget = timed_call('canvas_create_image', self.canvas.create_image,
+                                            self.pos_x, self.pos_y, image=current_img)
 
             self.canvas.tag_bind(self.canvas_widget, '<Button-1>', self.button_pressed)
             self.canvas.tag_bind(self.canvas_widget, '<ButtonRelease-1>', self.button_released)
@@ -165,6 +251,76 @@ class CanvasImageButton(CanvasWidget):
             self.canvas.tag_bind(self.canvas_widget, '<Button-3>', self.button_pressed)
             self.canvas.tag_bind(self.canvas_widget, '<ButtonRelease-3>', self.button_released)
 
+            self._schedule_prefetch()
+
+    def calc_size(self):
+        img_path = self.image_path_dic[self.current_image]
+        photo = self.images.get(img_path)
+        if photo is not None:
+            return (photo.width(), photo.height())
+        return get_image_size(img_path)
+
+    def calc_bounds(self):
+        # Images are drawn centred on the position
+        width, height = self.calc_size()
+        pos_x1 = self.pos_x - width // 2
+        pos_y1 = self.pos_y - height // 2
+        return (pos_x1, pos_y1, pos_x1 + width, pos_y1 + height)
+
+    def destroy(self):
+        if self._prefetch_job is not None:
+            self.canvas.after_cancel(self._prefetch_job)
+            self._prefetch_job = None
+        super().destroy()
+        self._release_images(list(self.images))
+
+    def _load_image(self, img_path):
+        if img_path not in self.images:
+            self.images[img_path] = get_shared_cache().acquire(img_path)
+
+    def _release_images(self, path_list):
+        for img_path in path_list:
+            photo = self.images.pop(img_path, None)
+            if photo is not None:
+                get_shared_cache().release(photo)
+
+    def _neighbour_paths(self):
+        image_count = len(self.image_path_dic)
+        next_image = self.current_image % image_count + 1
+        previous_image = (self.current_image - 2) % image_count + 1
+
+        return {self.image_path_dic[self.current_image],
+                self.image_path_dic[next_image],
+                self.image_path_dic[previous_image]}
+
+    def _schedule_prefetch(self):
+        if self.lazy and self.canvas and self._prefetch_job is None:
+            self._prefetch_job = self.canvas.after_idle(self._prefetch_neighbours)
+
+    def _prefetch_neighbours(self):
+        self._prefetch_job = None
+
+        # Load the states next_image/previous_image reach so pressing never waits on a decode
+        neighbour_paths = self._neighbour_paths()
+        for img_path in neighbour_paths:
+            self._load_image(img_path)
+
+        # Everything further away goes back to the cache, which can evict it under memory pressure
+        self._release_images([path for path in self.images if path not in neighbour_paths])
+
+    def apply_redraw(self, part):
+        if part == 'image':
+            self._show_current_image()
+        else:
+            super().apply_redraw(part)
+
+    def _show_current_image(self):
+        if self.canvas:
+            img_path = self.image_path_dic[self.current_image]
+            self._load_image(img_path)
+            timed_call('canvas_itemconfig', self.canvas.itemconfig, self.canvas_widget, image=self.images[img_path])
+            self._schedule_prefetch()
+
     def button_pressed(self, event):
         if (event.num == 1) and (self.button_type == ButtonType.RELEASE):
             self.next_image()
@@ -181,6 +337,7 @@ class CanvasImageButton(CanvasWidget):
         if self.release_callback:
             self.release_callback(widget=self)
 
+    @timed('button_switch_image')
     def next_image(self):
         previous_image = self.current_image
         if len(self.image_path_dic) > self.current_image:
@@ -189,10 +346,10 @@ class CanvasImageButton(CanvasWidget):
             self.current_image = 1
 
         if previous_image != self.current_image:
-            img_path = self.image_path_dic[self.current_image]
-            if self.canvas:
-                self.canvas.itemconfig(self.canvas_widget, image=self.images[img_path])
+            self._redraw('image')
+            self._changed('current_image', previous_image)
 
+    @timed('button_switch_image')
     def previous_image(self):
         previous_image = self.current_image
         if self.current_image > 1:
@@ -201,20 +358,45 @@ class CanvasImageButton(CanvasWidget):
             self.current_image = len(self.image_path_dic)
 
         if previous_image != self.current_image:
-            img_path = self.image_path_dic[self.current_image]
-            if self.canvas:
-                self.canvas.itemconfig(self.canvas_widget, image=self.images[img_path])
+            self._redraw('image')
+            self._changed('current_image', previous_image)
+
+    def set_current_image(self, current_image):
+        if current_image not in self.image_path_dic:
+            raise ValueError(F'Invalid image number {current_image}')
+
+        previous_image = self.current_image
+        self.current_image = current_image
+        if previous_image != current_image:
+            self._redraw('image')
+            self._changed('current_image', previous_image)
+
+    def set_images(self, path_list, *, current_image):
+        if not path_list:
+            raise ValueError('Image list cannot be empty')
+
+        old_path_list = list(self.image_path_dic.values())
+        self.image_path_dic = dict(enumerate(path_list, start=1))
+        self.current_image = current_image
+        self._release_images([path for path in self.images if path not in path_list])
+        if self.canvas and not self.lazy:
+            for image_path in path_list:
+                self._load_image(image_path)
+
+        self._redraw('image')
+        self._changed('images', old_path_list)
 
     def add_new_images(self, path_list):
-        for image_path in path_list:
-            if image_path not in self.images:
-                self.images[image_path] = ImageTk.PhotoImage(file=image_path)
+        if self.canvas and not self.lazy:
+            for image_path in path_list:
+                self._load_image(image_path)
 
-        new_path_list = list(self.image_path_dic.values())
-        new_path_list = (new_path_list[:self.current_image] +
-                         path_list + new_path_list[self.current_image:])
+        old_path_list = list(self.image_path_dic.values())
+        new_path_list = (old_path_list[:self.current_image] +
+                         path_list + old_path_list[self.current_image:])
 
         self.image_path_dic = dict(enumerate(new_path_list, start=1))
+        self._changed('images', old_path_list)
         self.next_image()
 
     def remove_current_image(self):
@@ -222,6 +404,7 @@ class CanvasImageButton(CanvasWidget):
             raise ValueError('Cannot delete the last image')
 
         image_to_delete = self.current_image
+        old_path_list = list(self.image_path_dic.values())
 
         # Set the previous image as the current one
         self.previous_image()
@@ -232,17 +415,24 @@ class CanvasImageButton(CanvasWidget):
         # Reindex the remaining images
         self.image_path_dic = dict(enumerate(self.image_path_dic.values(), start=1))
 
+        # Give the image back to the cache if no other state is using it
+        self._release_images([path for path in self.images if path not in self.image_path_dic.values()])
+
         # Set the new Current Image, deleted after gone to previous so might be out of step
         if image_to_delete > 1:
             self.current_image = image_to_delete - 1
         else:
             self.current_image = len(self.image_path_dic)
 
+        self._changed('images', old_path_list)
+
     def add_image_callback(self, *, button_release_func):
         self.release_callback = button_release_func
 
 
 class InputBox(FloatingWidget):
+    __slots__ = ('input_confirm_callback', '_width')
+
     def __init__(self, *, label=None, pos_x, pos_y, width=15):
         super().__init__(label=label, pos_x=pos_x, pos_y=pos_y, widget_type=WidgetType.INPUT_BOX)
         self.input_confirm_callback = None
@@ -254,9 +444,17 @@ class InputBox(FloatingWidget):
 
     @width.setter
     def width(self, width):
+        old_width = self._width
         self._width = width
         if self.canvas:
             self.canvas_widget.configure(width=self.width)
+        if width != old_width:
+            self._changed('width', old_width)
+
+    def calc_size(self):
+        if self.canvas and self.canvas_widget:
+            return (self.canvas_widget.winfo_reqwidth(), self.canvas_widget.winfo_reqheight())
+        return ((self.width or INPUT_BOX_DEFAULT_WIDTH) * INPUT_BOX_CHAR_WIDTH + INPUT_BOX_PADDING, INPUT_BOX_HEIGHT)
 
     def add_callback(self, *, input_confirm_callback):
         self.input_confirm_callback = input_confirm_callback